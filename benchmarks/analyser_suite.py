@@ -0,0 +1,167 @@
+"""
+Times the stages of LogAnalyser on synthetic logs and compares the results against a stored baseline.
+
+Usage: python -m benchmarks.analyser_suite [--sizes 10K 100K 1M 10M 100M] [--repeat 3] [--no-memory]
+                                           [--save-baseline FILE] [--baseline FILE] [--threshold 0.2]
+
+Exits with status 1 if a stage is slower or uses more memory than the baseline by more than the threshold.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import Callable
+
+from benchmarks.log_generator import LogParameters, generate_log
+from robocop_ng.helpers.ryujinx_log_analyser import (
+    LogAnalyser,
+    LogValueChanges,
+    ParsedLog,
+)
+from robocop_ng.helpers.ryujinx_log_tokenizer import tokenize_log
+
+size_units = {"K": 1000, "M": 1000 * 1000}
+
+
+def parse_size(value: str) -> int:
+    unit = value[-1].upper()
+    if unit in size_units:
+        return int(float(value[:-1]) * size_units[unit])
+    return int(value)
+
+
+def format_size(size: int) -> str:
+    if size >= size_units["M"]:
+        return f"{size / size_units['M']:g}MB"
+    return f"{size / size_units['K']:g}KB"
+
+
+def tokenize(log_text: str):
+    for _ in tokenize_log(log_text):
+        pass
+
+
+def parse_app_info(log_text: str):
+    parsed_log = ParsedLog(log_text)
+    return parsed_log.app_info, parsed_log.filepaths, parsed_log.is_homebrew
+
+
+stages: dict[str, Callable[[str], object]] = {
+    "tokenize": tokenize,
+    "log_values": LogValueChanges.from_log,
+    "app_info": parse_app_info,
+    "analyser": LogAnalyser,
+    "analyse": lambda log_text: LogAnalyser(log_text).analyse(),
+    "analyse_discord": lambda log_text: LogAnalyser(log_text).analyse_discord(True, 0),
+}
+
+
+def measure_peak_memory(stage: Callable[[str], object], log_text: str) -> int:
+    tracemalloc.start()
+    try:
+        stage(log_text)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(
+    sizes: list[int], repeat: int, measure_memory: bool
+) -> dict[str, dict[str, dict[str, float]]]:
+    results = {}
+    for size in sizes:
+        log_text = generate_log(LogParameters(size=size))
+        size_mb = len(log_text.encode("UTF-8")) / size_units["M"]
+        size_results = {}
+        for name, stage in stages.items():
+            seconds = min(
+                timeit.repeat(lambda: stage(log_text), number=1, repeat=repeat)
+            )
+            size_results[name] = {
+                "seconds": seconds,
+                "mb_per_s": size_mb / seconds,
+            }
+            if measure_memory:
+                size_results[name]["peak_memory"] = measure_peak_memory(stage, log_text)
+            print_result(format_size(size), name, size_results[name])
+        results[format_size(size)] = size_results
+    return results
+
+
+def print_result(size: str, stage: str, result: dict[str, float]):
+    line = (
+        f"{size:>8} {stage:>16} {result['seconds'] * 1000:>10.1f}ms "
+        f"{result['mb_per_s']:>8.2f}MB/s"
+    )
+    if "peak_memory" in result:
+        line += f" {result['peak_memory'] / size_units['M']:>9.1f}MB peak"
+    print(line, flush=True)
+
+
+def find_regressions(
+    results: dict[str, dict[str, dict[str, float]]],
+    baseline: dict[str, dict[str, dict[str, float]]],
+    threshold: float,
+) -> list[str]:
+    regressions = []
+    for size, size_results in results.items():
+        for stage, result in size_results.items():
+            baseline_result = baseline.get(size, {}).get(stage)
+            if baseline_result is None:
+                continue
+            for metric in ("seconds", "peak_memory"):
+                if result.get(metric) is None or not baseline_result.get(metric):
+                    continue
+                change = result[metric] / baseline_result[metric] - 1
+                if change > threshold:
+                    regressions.append(
+                        f"{size} {stage}: {metric} increased by {change:.0%}"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=parse_size,
+        nargs="+",
+        default=[parse_size(size) for size in ("10K", "100K", "1M", "10M", "100M")],
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--save-baseline", type=str)
+    parser.add_argument("--baseline", type=str)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.repeat, not args.no_memory)
+
+    if args.save_baseline is not None:
+        with open(args.save_baseline, "w") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+    if args.baseline is not None:
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)
+        regressions = find_regressions(results, baseline["results"], args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if len(regressions) > 0:
+            sys.exit(1)
+        print("No regressions found.")
+
+
+if __name__ == "__main__":
+    main()
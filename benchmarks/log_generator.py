@@ -0,0 +1,218 @@
+"""
+Generates synthetic Ryujinx log files for benchmarking the log analyser.
+
+Usage: python -m benchmarks.log_generator OUTPUT [--size 1000000] [--error-density 0.01] [--mods 10] [--cheats 5]
+                                                  [--build-id-blocks 1] [--settings-churn 0.002] [--seed 0]
+"""
+
+import argparse
+import random
+from dataclasses import dataclass
+
+from robocop_ng.helpers.ryujinx_log_analyser import settings_map
+
+header_lines = [
+    "{ts} |N| Application PrintSystemInfo: Ryujinx Version: 1.1.1376",
+    "{ts} |N| Application Print: Operating System: Windows 10.0.22631 (X64)",
+    "{ts} |N| Application Print: CPU: AMD Ryzen 7 5800X3D 8-Core Processor (16 logical cores)",
+    "{ts} |N| Application Print: RAM: Total 31.91 GiB ; Available 20.11 GiB",
+    "{ts} |N| Application PrintSystemInfo: Logs Enabled: Info, Warning, Error, Guest, Stub",
+    "{ts} |N| Application PrintSystemInfo: Command Line Arguments: C:\\Ryujinx\\Ryujinx.exe",
+    "{ts} |I| HLE.OsThread.1 ServiceFs Firmware Version: 17.0.0",
+]
+
+setting_values = {
+    "MaxAnisotropy": ["-1", "2", "4", "16"],
+    "AspectRatio": ["Fixed16x9", "Fixed4x3", "Stretched"],
+    "AudioBackend": ["SDL2", "OpenAl", "Dummy"],
+    "BackendThreading": ["Auto", "On", "Off"],
+    "EnableDockedMode": ["True", "False"],
+    "ExpandRam": ["True", "False"],
+    "EnableFsIntegrityChecks": ["True", "False"],
+    "GraphicsBackend": ["Vulkan", "OpenGl"],
+    "IgnoreMissingServices": ["True", "False"],
+    "MemoryManagerMode": ["HostMappedUnsafe", "HostMapped", "SoftwarePageTable"],
+    "EnablePtc": ["True", "False"],
+    "ResScale": ["1", "2", "3", "-1"],
+    "EnableShaderCache": ["True", "False"],
+    "EnableTextureRecompression": ["True", "False"],
+    "EnableVsync": ["True", "False"],
+    "UseHypervisor": ["True", "False"],
+}
+
+filler_lines = [
+    "{ts} |I| HLE.OsThread.12 ServiceFs OpenFileSystem: Opening file system C:\\Users\\someone\\AppData\\Roaming\\Ryujinx\\bis\\user\\save\\0000000000000001\\0",
+    "{ts} |W| HLE.OsThread.14 ServiceAm Stub: Stubbed. Unknown value 0x1234",
+    "{ts} |G| HLE.OsThread.17 Guest Print: Loading scene 3",
+    "{ts} |I| GUI.RenderLoop ShaderCache LoadShaders: Shader cache loaded 1234 entries",
+    "{ts} |S| HLE.OsThread.21 ServiceNv Ioctl: Stubbed. Command 0x40044801",
+    "{ts} |I| HLE.OsThread.9 ServiceAudio Configure: Audio renderer configured with 48000Hz",
+]
+
+error_blocks = [
+    [
+        "{ts} |E| HLE.OsThread.9 ServiceFs GetResult: ResultFsTargetNotFound (2002-0001)",
+        "    at Ryujinx.HLE.FileSystem.VirtualFileSystem.OpenFile(String path)",
+        "    at Ryujinx.HLE.HOS.Services.Fs.IFileSystemProxy.OpenSaveDataFileSystem()",
+    ],
+    [
+        "{ts} |E| GPU.MainThread Gpu Vulkan: ErrorOutOfDeviceMemory while allocating",
+        "    at Ryujinx.Graphics.Vulkan.MemoryAllocator.Allocate()",
+    ],
+    [
+        "{ts} |E| HLE.OsThread.33 Cpu Execute: Unhandled exception caught: Ryujinx.HLE.Exceptions.ServiceNotImplementedException",
+        "    at Ryujinx.HLE.HOS.Services.IpcService.CallCmifMethod(ServiceCtx context)",
+        "    at Ryujinx.HLE.HOS.Ipc.IpcHandler.Process()",
+        "    at Ryujinx.Cpu.Jit.JitCpuContext.Execute()",
+    ],
+    ["{ts} |E| HLE.GuiThread Application Print: Cache collision found in shader cache"],
+]
+
+
+@dataclass(slots=True)
+class LogParameters:
+    # Approximate size of the generated log in bytes
+    size: int = 1000 * 1000
+    # Probability of each filler line being replaced by an error block
+    error_density: float = 0.01
+    mods: int = 10
+    cheats: int = 5
+    build_id_blocks: int = 1
+    # Probability of each filler line being replaced by a LogValueChange entry
+    settings_churn: float = 0.002
+    seed: int = 0
+
+
+def timestamp(milliseconds: int) -> str:
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours % 100:02}:{minutes:02}:{seconds:02}.{milliseconds:03}"
+
+
+class LogGenerator:
+    def __init__(self, parameters: LogParameters):
+        self.parameters = parameters
+        self._random = random.Random(parameters.seed)
+        self._milliseconds = 0
+        self._lines: list[str] = []
+        self._size = 0
+
+    def __add(self, line: str):
+        self._milliseconds += self._random.randint(0, 20)
+        line = line.format(ts=timestamp(self._milliseconds))
+        self._lines.append(line)
+        self._size += len(line) + 1
+
+    def __add_continuation(self, line: str):
+        self._lines.append(line)
+        self._size += len(line) + 1
+
+    def __add_setting(self, key: str):
+        value = self._random.choice(setting_values[key])
+        self.__add(f"{{ts}} |I| Configuration LogValueChange: {key} set to: {value}")
+
+    def __add_build_ids(self, index: int):
+        app_id = f"0100{index:04X}115B6000"
+        build_id = "".join(self._random.choices("0123456789ABCDEF", k=40))
+        self.__add(
+            f"{{ts}} |I| HLE.GuiThread Loader LoadNca: Application Loaded: Synthetic Game {index} [{app_id}] [64-bit]"
+        )
+        self.__add(
+            f"{{ts}} |I| HLE.GuiThread Loader Start: Build ids found for application {app_id}:"
+        )
+        self.__add_continuation(f"    {build_id}")
+        self.__add("{ts} |I| HLE.GuiThread Loader PrintRoSectionInfo: main:")
+        self.__add_continuation("    Module: nnMain")
+        self.__add_continuation(
+            "    SDK Libraries: SDK MW+Nintendo+NintendoSdk_nnSdk-15_3_2-Release"
+        )
+
+    def __add_game(self):
+        for index in range(self.parameters.mods):
+            mod_type = "[E]" if index % 2 == 0 else "[R]"
+            self.__add(
+                f"{{ts}} |I| HLE.GuiThread ModLoader CollectMods: Found enabled mod 'Mod {index}' {mod_type}"
+            )
+        for index in range(self.parameters.cheats):
+            self.__add(
+                f"{{ts}} |I| HLE.GuiThread TamperMachine InstallAtmosphereCheat: Installing cheat 'Cheat {index}'"
+            )
+        self.__add("{ts} |I| HLE.GuiThread Hid Configure: ProController (Player1)")
+
+    def generate(self) -> str:
+        parameters = self.parameters
+        for line in header_lines:
+            self.__add(line)
+        self.__add(
+            "{ts} |I| HLE.GuiThread Gpu PrintGpuInformation: NVIDIA GeForce RTX 3070 (555.99)"
+        )
+        for key in settings_map.values():
+            self.__add_setting(key)
+
+        # Build id blocks are spread over the first half of the log, e.g. when several games were started
+        build_id_positions = [
+            parameters.size * index // (2 * parameters.build_id_blocks)
+            for index in range(parameters.build_id_blocks)
+        ]
+        build_id_index = 0
+        setting_keys = list(settings_map.values())
+        while self._size < parameters.size:
+            if (
+                build_id_index < len(build_id_positions)
+                and self._size >= build_id_positions[build_id_index]
+            ):
+                self.__add_build_ids(build_id_index)
+                self.__add_game()
+                build_id_index += 1
+                continue
+
+            roll = self._random.random()
+            if roll < parameters.error_density:
+                error_block = self._random.choice(error_blocks)
+                self.__add(error_block[0])
+                for line in error_block[1:]:
+                    self.__add_continuation(line)
+            elif roll < parameters.error_density + parameters.settings_churn:
+                self.__add_setting(self._random.choice(setting_keys))
+            else:
+                self.__add(self._random.choice(filler_lines))
+
+        self.__add("{ts} |I| HLE.GuiThread Application Exit: Ryujinx exit")
+        return "\n".join(self._lines)
+
+
+def generate_log(parameters: LogParameters) -> str:
+    return LogGenerator(parameters).generate()
+
+
+def main():
+    defaults = LogParameters()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("output", type=str)
+    parser.add_argument("--size", type=int, default=defaults.size)
+    parser.add_argument("--error-density", type=float, default=defaults.error_density)
+    parser.add_argument("--mods", type=int, default=defaults.mods)
+    parser.add_argument("--cheats", type=int, default=defaults.cheats)
+    parser.add_argument("--build-id-blocks", type=int, default=defaults.build_id_blocks)
+    parser.add_argument("--settings-churn", type=float, default=defaults.settings_churn)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    log_text = generate_log(
+        LogParameters(
+            size=args.size,
+            error_density=args.error_density,
+            mods=args.mods,
+            cheats=args.cheats,
+            build_id_blocks=args.build_id_blocks,
+            settings_churn=args.settings_churn,
+            seed=args.seed,
+        )
+    )
+    with open(args.output, "w") as file:
+        file.write(log_text)
+
+
+if __name__ == "__main__":
+    main()
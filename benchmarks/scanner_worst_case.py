@@ -0,0 +1,160 @@
+"""
+Runs the path, build id, RO section and homebrew scanners on crafted and randomly fuzzed inputs of growing size.
+
+The time per byte has to stay roughly constant as the input grows, otherwise a scanner isn't linear.
+With --legacy the regexes used before the scanners were introduced are timed as well.
+
+Usage: python -m benchmarks.scanner_worst_case [--sizes 10K 100K 1M] [--fuzz-runs 20] [--max-growth 4] [--legacy]
+
+Exits with status 1 if the time per byte of any input grows by more than --max-growth between the smallest
+and the largest size.
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from typing import Callable
+
+from benchmarks.analyser_suite import format_size, parse_size
+from robocop_ng.helpers.ryujinx_log_analyser import ParsedLog
+
+fuzz_fragments = [
+    " ",
+    "\t",
+    "\n",
+    "\n ",
+    "\r",
+    "/",
+    "\\",
+    "C:",
+    "a:/",
+    "segment",
+    '"',
+    "Load",
+    "Loading as homebrew",
+    "Application: Loading as ",
+    "Build ids found for title 0100F2C0115B6000:",
+    "Build ids found for application ",
+    "PrintRoSectionInfo: main:",
+    "    Module: nnMain",
+    "    082CE09B06E33A123CB1E2770F5F9147709033DB",
+    "00:00:00.000 |I| ",
+]
+
+
+def repeat_to_size(prefix: str, fragment: str, size: int) -> str:
+    return prefix + fragment * max(1, (size - len(prefix)) // len(fragment))
+
+
+# Inputs which made the previous regexes backtrack
+crafted_inputs: dict[str, Callable[[int], str]] = {
+    "build_ids_spaces": lambda size: repeat_to_size(
+        "00:00:00.000 |I| Loader Start: Build ids found for title A:\n", " ", size
+    ),
+    "build_ids_blank_lines": lambda size: repeat_to_size(
+        "00:00:00.000 |I| Loader Start: Build ids found for title A:", "\n ", size
+    ),
+    "ro_section_whitespace": lambda size: repeat_to_size(
+        "00:00:00.000 |I| Loader PrintRoSectionInfo: main:\n", " \t\r", size
+    ),
+    "homebrew_load": lambda size: repeat_to_size("00:00:00.000 |I| ", "Load", size),
+    "long_path": lambda size: repeat_to_size("00:00:00.000 |I| C:", "\\a", size),
+    "many_paths": lambda size: "".join(
+        f"/{index}" + ("\n" if index % 8 == 0 else " ") for index in range(size // 6)
+    ),
+    "drive_letters": lambda size: repeat_to_size("00:00:00.000 |I| ", "a:", size),
+}
+
+
+def generate_fuzz_input(size: int, seed: int) -> str:
+    fuzz_random = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        fragment = fuzz_random.choice(fuzz_fragments) * fuzz_random.choice(
+            (1, 1, 1, 8, 64)
+        )
+        parts.append(fragment)
+        length += len(fragment)
+    return "".join(parts)
+
+
+def run_scanners(log_text: str):
+    parsed_log = ParsedLog(log_text)
+    return (
+        parsed_log.filepaths,
+        parsed_log.build_ids,
+        parsed_log.main_ro_section,
+        parsed_log.is_homebrew,
+    )
+
+
+def run_legacy_scanners(log_text: str):
+    return (
+        re.findall(r"(?:[A-Za-z]:)?(?:[\\/]+[^\\/:\"\r\n]+)+", log_text),
+        re.findall(
+            r"Build ids found for (?:title|application) ([a-zA-Z0-9]*):[\n\r]*((?:\s+.*[\n\r]+)+)",
+            log_text,
+        ),
+        re.findall(r"PrintRoSectionInfo: main:[\r\n]((?:\s+.*[\r\n])*)", log_text),
+        re.search("Load.*Application: Loading as [Hh]omebrew", log_text),
+    )
+
+
+def time_per_byte(scanners: Callable[[str], object], log_text: str) -> float:
+    start_time = time.perf_counter()
+    scanners(log_text)
+    return (time.perf_counter() - start_time) / len(log_text)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=parse_size,
+        nargs="+",
+        default=[parse_size(size) for size in ("10K", "100K", "1M")],
+    )
+    parser.add_argument("--fuzz-runs", type=int, default=20)
+    parser.add_argument("--max-growth", type=float, default=4)
+    parser.add_argument("--legacy", action="store_true")
+    args = parser.parse_args()
+
+    inputs = dict(crafted_inputs)
+    for seed in range(args.fuzz_runs):
+        inputs[f"fuzz_{seed}"] = lambda size, seed=seed: generate_fuzz_input(size, seed)
+
+    scanner_sets = {"scanners": run_scanners}
+    if args.legacy:
+        scanner_sets["legacy"] = run_legacy_scanners
+
+    failures = []
+    print(
+        f"{'input':>24} {'scanners':>9} "
+        + " ".join(f"{format_size(size):>9}" for size in args.sizes)
+        + "  (ns/byte)"
+    )
+    for name, generate_input in inputs.items():
+        texts = [generate_input(size) for size in args.sizes]
+        for scanners_name, scanners in scanner_sets.items():
+            timings = [time_per_byte(scanners, text) for text in texts]
+            print(
+                f"{name:>24} {scanners_name:>9} "
+                + " ".join(f"{timing * 1e9:>9.1f}" for timing in timings),
+                flush=True,
+            )
+            growth = timings[-1] / max(timings[0], 1e-12)
+            if scanners_name == "scanners" and growth > args.max_growth:
+                failures.append(f"{name}: time per byte grew by {growth:.1f}x")
+
+    for failure in failures:
+        print(f"Not linear: {failure}")
+    if len(failures) > 0:
+        sys.exit(1)
+    print("All scanners stayed linear.")
+
+
+if __name__ == "__main__":
+    main()
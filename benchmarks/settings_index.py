@@ -0,0 +1,97 @@
+"""
+Compares the settings extraction of LogAnalyser before and after introducing the LogValueChange index.
+
+Usage: python -m benchmarks.settings_index [--lines 5000 20000 100000] [--repeat 3]
+"""
+
+import argparse
+import re
+import timeit
+
+from robocop_ng.helpers.ryujinx_log_analyser import LogValueChanges, settings_map
+
+filler_lines = [
+    "{ts} |I| HLE.OsThread.12 ServiceFs OpenFileSystem: Opening file system",
+    "{ts} |W| HLE.OsThread.14 ServiceAm Stub: Stubbed. Unknown value",
+    "{ts} |G| HLE.OsThread.17 Guest Print: Loading scene 3",
+    "{ts} |I| GUI.RenderLoop ShaderCache LoadShaders: Shader cache loaded 1234 entries",
+]
+
+
+def timestamp(index: int) -> str:
+    milliseconds = index * 7
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours % 100:02}:{minutes:02}:{seconds:02}.{milliseconds:03}"
+
+
+def generate_log(line_count: int) -> str:
+    keys = list(settings_map.values())
+    lines = []
+    for index in range(line_count):
+        if index % 250 == 0:
+            # Settings get re-applied every now and then, e.g. when a game is restarted
+            key = keys[(index // 250) % len(keys)]
+            lines.append(
+                f"{timestamp(index)} |I| Configuration LogValueChange: {key} set to: True"
+            )
+        else:
+            lines.append(
+                filler_lines[index % len(filler_lines)].format(ts=timestamp(index))
+            )
+    return "\n".join(lines)
+
+
+def legacy_settings(log_text: str) -> dict[str, str]:
+    # The settings extraction before the index was introduced: one full scan per setting
+    settings = {}
+    for name, key in settings_map.items():
+        values = [
+            line.split()[-1]
+            for line in log_text.splitlines()
+            if re.search(rf"LogValueChange: ({key})\s", line)
+        ]
+        if len(values) > 0:
+            settings[name] = values[-1]
+    return settings
+
+
+def indexed_settings(log_text: str) -> dict[str, str]:
+    log_values = LogValueChanges.from_log(log_text)
+    return {
+        name: log_values[key] for name, key in settings_map.items() if key in log_values
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, nargs="+", default=[5000, 20000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'lines':>8} {'size':>10} {'legacy':>10} {'indexed':>10} {'speedup':>8}")
+    for line_count in args.lines:
+        log_text = generate_log(line_count)
+        if legacy_settings(log_text) != indexed_settings(log_text):
+            raise AssertionError("Legacy and indexed settings differ")
+
+        legacy_time = min(
+            timeit.repeat(
+                lambda: legacy_settings(log_text), number=1, repeat=args.repeat
+            )
+        )
+        indexed_time = min(
+            timeit.repeat(
+                lambda: indexed_settings(log_text), number=1, repeat=args.repeat
+            )
+        )
+        print(
+            f"{line_count:>8} {len(log_text) / 1024:>8.0f}KB "
+            f"{legacy_time * 1000:>8.1f}ms {indexed_time * 1000:>8.1f}ms "
+            f"{legacy_time / indexed_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,11 @@ import logging.handlers
 import os
 import sys
 
-import aiohttp
 import discord
 from discord.ext import commands
 from discord.ext.commands import CommandError, Context
 
+from robocop_ng.helpers.http_client import HttpClient
 from robocop_ng.helpers.notifications import report_critical_error
 
 if len(sys.argv[1:]) != 1:
@@ -83,6 +83,9 @@ bot.config = config
 bot.script_name = script_name
 bot.state_dir = state_dir
 bot.wanted_jsons = wanted_jsons
+bot.http_client = HttpClient.from_config(
+    config, headers={"User-Agent": f"{script_name}/1.0'"}
+)
 
 
 async def get_channel_safe(self, channel_id: int):
@@ -98,8 +101,6 @@ commands.Bot.get_channel_safe = get_channel_safe
 
 @bot.event
 async def on_ready():
-    aioh = {"User-Agent": f"{script_name}/1.0'"}
-    bot.aiosession = aiohttp.ClientSession(headers=aioh)
     bot.app_info = await bot.application_info()
     bot.botlog_channel = await bot.get_channel_safe(config.botlog_channel)
 
@@ -272,7 +273,7 @@ async def on_message(message):
 
 
 async def main():
-    async with bot:
+    async with bot, bot.http_client:
         if len(config.guild_whitelist) == 1:
             invite_url = discord.utils.oauth_url(
                 config.client_id,
@@ -1,4 +1,5 @@
 import asyncio
+import json
 import traceback
 import datetime
 import humanize
@@ -73,13 +74,13 @@ class Common(Cog):
 
     async def aioget(self, url):
         try:
-            data = await self.bot.aiosession.get(url)
-            if data.status == 200:
-                text_data = await data.text()
-                self.bot.log.info(f"Data from {url}: {text_data}")
-                return text_data
-            else:
-                self.bot.log.error(f"HTTP Error {data.status} while getting {url}")
+            async with self.bot.http_client.get(url) as data:
+                if data.status == 200:
+                    text_data = await self.bot.http_client.text(data)
+                    self.bot.log.info(f"Data from {url}: {text_data}")
+                    return text_data
+                else:
+                    self.bot.log.error(f"HTTP Error {data.status} while getting {url}")
         except:
             self.bot.log.error(
                 f"Error while getting {url} "
@@ -88,13 +89,13 @@ class Common(Cog):
 
     async def aiogetbytes(self, url):
         try:
-            data = await self.bot.aiosession.get(url)
-            if data.status == 200:
-                byte_data = await data.read()
-                self.bot.log.debug(f"Data from {url}: {byte_data}")
-                return byte_data
-            else:
-                self.bot.log.error(f"HTTP Error {data.status} while getting {url}")
+            async with self.bot.http_client.get(url) as data:
+                if data.status == 200:
+                    byte_data = await self.bot.http_client.read(data)
+                    self.bot.log.debug(f"Data from {url}: {byte_data}")
+                    return byte_data
+                else:
+                    self.bot.log.error(f"HTTP Error {data.status} while getting {url}")
         except:
             self.bot.log.error(
                 f"Error while getting {url} "
@@ -103,14 +104,13 @@ class Common(Cog):
 
     async def aiojson(self, url):
         try:
-            data = await self.bot.aiosession.get(url)
-            if data.status == 200:
-                text_data = await data.text()
-                self.bot.log.info(f"Data from {url}: {text_data}")
-                content_type = data.headers["Content-Type"]
-                return await data.json(content_type=content_type)
-            else:
-                self.bot.log.error(f"HTTP Error {data.status} while getting {url}")
+            async with self.bot.http_client.get(url) as data:
+                if data.status == 200:
+                    text_data = await self.bot.http_client.text(data)
+                    self.bot.log.info(f"Data from {url}: {text_data}")
+                    return json.loads(text_data)
+                else:
+                    self.bot.log.error(f"HTTP Error {data.status} while getting {url}")
         except:
             self.bot.log.error(
                 f"Error while getting {url} "
@@ -129,8 +129,8 @@ class Common(Cog):
     # by link2110 (https://stackoverflow.com/users/5890923/link2110)
     # modified by Ave (https://github.com/aveao), licensed CC-BY-SA 3.0
     async def download_file(self, url, local_filename):
-        file_resp = await self.bot.aiosession.get(url)
-        file = await file_resp.read()
+        async with self.bot.http_client.get(url) as file_resp:
+            file = await self.bot.http_client.read(file_resp)
         with open(local_filename, "wb") as f:
             f.write(file)
 
@@ -154,12 +154,14 @@ class Common(Cog):
         return reply_list
 
     async def haste(self, text, instance="https://mystb.in/"):
-        response = await self.bot.aiosession.post(f"{instance}documents", data=text)
-        if response.status == 200:
-            result_json = await response.json()
-            return f"{instance}{result_json['key']}"
-        else:
-            return f"Error {response.status}: {response.text}"
+        async with self.bot.http_client.post(
+            f"{instance}documents", data=text
+        ) as response:
+            if response.status == 200:
+                result_json = json.loads(await self.bot.http_client.text(response))
+                return f"{instance}{result_json['key']}"
+            else:
+                return f"Error {response.status}: {await self.bot.http_client.text(response)}"
 
     async def async_call_shell(
         self, shell_command: str, inc_stdout=True, inc_stderr=True
@@ -1,10 +1,11 @@
+import asyncio
+import codecs
 import logging
-import re
-from typing import Optional
+import os
+from typing import Any, Awaitable, Callable, Optional, Union
 
-import aiohttp
 from discord import Colour, Embed, Message, Attachment
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord.ext.commands import Cog, Context, BucketType
 
 from robocop_ng.helpers.checks import check_if_staff
@@ -12,25 +13,51 @@ from robocop_ng.helpers.disabled_ids import (
     add_disabled_app_id,
     is_app_id_valid,
     remove_disabled_app_id,
+    get_blocklist,
     get_disabled_ids,
-    is_app_id_disabled,
     is_build_id_valid,
     add_disabled_build_id,
     remove_disabled_build_id,
-    is_build_id_disabled,
-    is_ro_section_disabled,
     is_ro_section_valid,
     add_disabled_ro_section,
     remove_disabled_ro_section,
     remove_disable_id,
 )
 from robocop_ng.helpers.disabled_paths import (
-    is_path_disabled,
+    find_disabled_filepath,
+    get_disabled_path_matcher,
     get_disabled_paths,
     add_disabled_path,
     remove_disabled_path,
 )
+from robocop_ng.helpers.log_analysis_service import LogAnalysisService
+from robocop_ng.helpers.log_cache import AnalysedLogCache
+from robocop_ng.helpers.log_job_queue import LogJob, LogJobQueue, QueueFullError
+from robocop_ng.helpers.log_prefilter import (
+    PrefilterStats,
+    has_log_markers,
+    log_prefilter_size,
+)
+from robocop_ng.helpers.note_rules import get_note_rules_path, load_note_plan
+from robocop_ng.helpers.ranged_download import RangedFile, fetch_ranges, format_range
+from robocop_ng.helpers.regex_registry import regex_registry
 from robocop_ng.helpers.ryujinx_log_analyser import LogAnalyser, RyujinxVersion
+from robocop_ng.helpers.ryujinx_log_notes import default_note_plan, note_sample_log
+from robocop_ng.helpers.ryujinx_log_results import LogAnalysis
+from robocop_ng.helpers.upload_index import UploadIndex, fingerprint_size
+
+ryujinx_log_file_regex = regex_registry.compile(
+    "ryujinx_log_file_name", r"^Ryujinx_.*\.log$"
+)
+log_file_regex = regex_registry.compile("log_file_name", r"^.*\.log|.*\.txt$")
+game_name_bitness_regex = regex_registry.compile(
+    "game_name_bitness", r"\s\[(64|32)-bit\]$"
+)
+# The number of bytes downloaded by download_file
+initial_download_size = 60001 + 6000
+# Discord rejects messages with more embeds or with embeds which are longer in total
+max_message_embeds = 10
+max_message_embeds_size = 6000
 
 logging.basicConfig(
     format="%(asctime)s (%(levelname)s) %(message)s (Line %(lineno)d)",
@@ -42,10 +69,8 @@ class LogFileReader(Cog):
     @staticmethod
     def is_valid_log_name(attachment: Attachment) -> tuple[bool, bool]:
         filename = attachment.filename
-        ryujinx_log_file_regex = re.compile(r"^Ryujinx_.*\.log$")
-        log_file = re.compile(r"^.*\.log|.*\.txt$")
-        is_ryujinx_log_file = re.match(ryujinx_log_file_regex, filename) is not None
-        is_log_file = re.match(log_file, filename) is not None
+        is_ryujinx_log_file = ryujinx_log_file_regex.match(filename) is not None
+        is_log_file = log_file_regex.match(filename) is not None
 
         return is_log_file, is_ryujinx_log_file
 
@@ -54,24 +79,71 @@ class LogFileReader(Cog):
         self.bot_log_allowed_channels = self.bot.config.bot_log_allowed_channels
         self.disallowed_named_roles = ["pirate"]
         self.ryujinx_blue = Colour(0x4A90E2)
-        self.uploaded_log_info = []
+        self.upload_index = UploadIndex(
+            self.bot,
+            self.bot.config.log_upload_index_size,
+            self.bot.config.log_upload_index_ttl,
+        )
+        self.log_cache = AnalysedLogCache(
+            self.bot.config.log_cache_size, self.bot.config.log_cache_ttl
+        )
+        # Set before the analysis workers are forked, so they inherit it
+        regex_registry.set_stats_enabled(self.bot.config.log_regex_stats)
+        self.analysis_service = LogAnalysisService(
+            self.bot.config.log_analysis_workers,
+            self.bot.config.log_analysis_timeout,
+        )
+        self.prefilter_stats = PrefilterStats()
+        self.analysis_queue = LogJobQueue(
+            self.bot.config.log_analysis_max_concurrent,
+            self.bot.config.log_analysis_queue_size,
+        )
 
         self.disallowed_roles = [
             self.bot.config.named_roles[x] for x in self.disallowed_named_roles
         ]
+        try:
+            self.note_plan = load_note_plan(self.bot)
+        except ValueError as error:
+            logging.error(f"Couldn't load log note rules, using the defaults: {error}")
+            self.note_plan = default_note_plan
+        self.flush_upload_index.start()
 
-    @staticmethod
-    async def download_file(log_url):
-        async with aiohttp.ClientSession() as session:
-            # Grabs first and last few bytes of log file to prevent abuse from large files
-            headers = {"Range": "bytes=0-60000, -6000"}
-            async with session.get(log_url, headers=headers) as response:
-                return await response.text("UTF-8")
+    def cog_unload(self):
+        self.flush_upload_index.cancel()
+        self.upload_index.flush()
+        self.analysis_queue.cancel_all()
+        self.analysis_service.shutdown()
+
+    @tasks.loop(minutes=1)
+    async def flush_upload_index(self):
+        self.upload_index.flush()
+
+    async def download_file(self, log_url) -> RangedFile:
+        # Grabs first and last few bytes of log file to prevent abuse from large files
+        return await fetch_ranges(self.bot.http_client, log_url, ["0-60000", "-6000"])
+
+    async def download_missing_range(
+        self, log_url: str, ranged_log: RangedFile
+    ) -> bool:
+        """
+        Downloads the next log_extra_range_size bytes of the first gap in the log file.
+        Returns False if the log file has been downloaded completely.
+        """
+        gaps = ranged_log.gaps()
+        if len(gaps) == 0:
+            return False
+        start, end = gaps[0]
+        range_end = start + self.bot.config.log_extra_range_size
+        end = range_end if end is None else min(end, range_end)
+        extra_range = await fetch_ranges(
+            self.bot.http_client, log_url, [format_range(start, end)]
+        )
+        ranged_log.add_all(extra_range.ranges)
+        return True
 
     @staticmethod
-    def is_log_valid(log_file: str) -> bool:
-        app_info = LogAnalyser.get_app_info(log_file)
-        is_homebrew = LogAnalyser.is_homebrew(log_file)
+    def is_log_valid(app_info: Optional[tuple], is_homebrew: bool) -> bool:
         if app_info is None or is_homebrew:
             return True
         game_name, app_id, another_app_id, build_ids, main_ro_section = app_info
@@ -85,28 +157,21 @@ class LogFileReader(Cog):
             return False
         return app_id == another_app_id
 
-    def is_game_blocked(self, log_file: str) -> bool:
-        app_info = LogAnalyser.get_app_info(log_file)
+    def is_game_blocked(self, app_info: Optional[tuple]) -> bool:
         if app_info is None:
             return False
         game_name, app_id, another_app_id, build_ids, main_ro_section = app_info
-        if is_app_id_disabled(self.bot, app_id) or is_app_id_disabled(
-            self.bot, another_app_id
+        blocklist = get_blocklist(self.bot)
+        if blocklist.is_app_id_disabled(app_id) or blocklist.is_app_id_disabled(
+            another_app_id
         ):
             return True
         for bid in build_ids:
-            if is_build_id_disabled(self.bot, bid):
+            if blocklist.is_build_id_disabled(bid):
                 return True
-        return is_ro_section_disabled(self.bot, main_ro_section)
-
-    def contains_blocked_paths(self, log_file: str) -> Optional[str]:
-        filepaths = LogAnalyser.get_filepaths(log_file)
-        if filepaths is None:
-            return None
-        for filepath in filepaths:
-            if is_path_disabled(self.bot, filepath):
-                return filepath
-        return None
+        if main_ro_section is None:
+            return False
+        return blocklist.is_ro_section_disabled(main_ro_section)
 
     async def blocked_game_action(self, message: Message) -> Embed:
         warn_command = self.bot.get_command("warn")
@@ -169,43 +234,48 @@ class LogFileReader(Cog):
         await message.delete()
         return embed
 
-    def format_analysed_log(self, author_name: str, analyser: LogAnalyser, analysed_log):
-        cleaned_game_name = re.sub(
-            r"\s\[(64|32)-bit\]$", "", analysed_log["game_info"]["game_name"]
+    def format_analysed_log(
+        self,
+        author_name: str,
+        analysed_log: LogAnalysis,
+        ryujinx_version: tuple[RyujinxVersion, str],
+    ):
+        cleaned_game_name = game_name_bitness_regex.sub(
+            "", analysed_log.game_info.game_name
         )
-        analysed_log["game_info"]["game_name"] = cleaned_game_name
+        analysed_log.game_info.game_name = cleaned_game_name
 
         hardware_info = "\n".join(
             (
-                f"**OS:** {analysed_log['hardware_info']['os']}",
-                f"**CPU:** {analysed_log['hardware_info']['cpu']}",
-                f"**GPU:** {analysed_log['hardware_info']['gpu']}",
-                f"**RAM:** {analysed_log['hardware_info']['ram']}",
+                f"**OS:** {analysed_log.hardware_info.os}",
+                f"**CPU:** {analysed_log.hardware_info.cpu}",
+                f"**GPU:** {analysed_log.hardware_info.gpu}",
+                f"**RAM:** {analysed_log.hardware_info.ram}",
             )
         )
 
         system_settings_info = "\n".join(
             (
-                f"**Audio Backend:** `{analysed_log['settings']['audio_backend']}`",
-                f"**Console Mode:** `{analysed_log['settings']['docked']}`",
-                f"**PPTC Cache:** `{analysed_log['settings']['pptc']}`",
-                f"**Shader Cache:** `{analysed_log['settings']['shader_cache']}`",
-                f"**V-Sync:** `{analysed_log['settings']['vsync']}`",
-                f"**Hypervisor:** `{analysed_log['settings']['hypervisor']}`",
+                f"**Audio Backend:** `{analysed_log.settings.audio_backend}`",
+                f"**Console Mode:** `{analysed_log.settings.docked}`",
+                f"**PPTC Cache:** `{analysed_log.settings.pptc}`",
+                f"**Shader Cache:** `{analysed_log.settings.shader_cache}`",
+                f"**V-Sync:** `{analysed_log.settings.vsync}`",
+                f"**Hypervisor:** `{analysed_log.settings.hypervisor}`",
             )
         )
 
         graphics_settings_info = "\n".join(
             (
-                f"**Graphics Backend:** `{analysed_log['settings']['graphics_backend']}`",
-                f"**Resolution:** `{analysed_log['settings']['resolution_scale']}`",
-                f"**Anisotropic Filtering:** `{analysed_log['settings']['anisotropic_filtering']}`",
-                f"**Aspect Ratio:** `{analysed_log['settings']['aspect_ratio']}`",
-                f"**Texture Recompression:** `{analysed_log['settings']['texture_recompression']}`",
+                f"**Graphics Backend:** `{analysed_log.settings.graphics_backend}`",
+                f"**Resolution:** `{analysed_log.settings.resolution_scale}`",
+                f"**Anisotropic Filtering:** `{analysed_log.settings.anisotropic_filtering}`",
+                f"**Aspect Ratio:** `{analysed_log.settings.aspect_ratio}`",
+                f"**Texture Recompression:** `{analysed_log.settings.texture_recompression}`",
             )
         )
 
-        version_type, version = analyser.get_ryujinx_version()
+        version_type, version = ryujinx_version
 
         if version_type == RyujinxVersion.STABLE:
             version = f"[{version}](https://github.com/GreemDev/Ryujinx/releases/tag/{version})"
@@ -215,7 +285,7 @@ class LogFileReader(Cog):
         ryujinx_info = " | ".join(
             (
                 f"**Version:** {version}",
-                f"**Firmware:** {analysed_log['emu_info']['ryu_firmware']}",
+                f"**Firmware:** {analysed_log.emu_info.ryu_firmware}",
             )
         )
 
@@ -238,7 +308,7 @@ class LogFileReader(Cog):
         )
         if (
             cleaned_game_name == "Unknown"
-            and analysed_log["game_info"]["errors"] == "No errors found in log"
+            and analysed_log.game_info.errors == "No errors found in log"
         ):
             log_embed.add_field(
                 name="Empty Log",
@@ -252,11 +322,11 @@ class LogFileReader(Cog):
             )
         if (
             cleaned_game_name == "Unknown"
-            and analysed_log["game_info"]["errors"] != "No errors found in log"
+            and analysed_log.game_info.errors != "No errors found in log"
         ):
             log_embed.add_field(
                 name="Latest Error Snippet",
-                value=analysed_log["game_info"]["errors"],
+                value=analysed_log.game_info.errors,
                 inline=False,
             )
             log_embed.add_field(
@@ -272,34 +342,283 @@ class LogFileReader(Cog):
         else:
             log_embed.add_field(
                 name="Latest Error Snippet",
-                value=analysed_log["game_info"]["errors"],
+                value=analysed_log.game_info.errors,
                 inline=False,
             )
+            if analysed_log.game_info.top_errors is not None:
+                log_embed.add_field(
+                    name="Most Frequent Errors",
+                    value=analysed_log.game_info.top_errors,
+                    inline=False,
+                )
             log_embed.add_field(
-                name="Mods", value=analysed_log["game_info"]["mods"], inline=False
+                name="Mods", value=analysed_log.game_info.mods, inline=False
             )
             log_embed.add_field(
-                name="Cheats", value=analysed_log["game_info"]["cheats"], inline=False
+                name="Cheats", value=analysed_log.game_info.cheats, inline=False
             )
 
         log_embed.add_field(
             name="Notes",
-            value=analysed_log["game_info"]["notes"],
+            value=analysed_log.game_info.notes,
             inline=False,
         )
 
         return log_embed
 
-    async def log_file_read(self, message):
-        attached_log = message.attachments[0]
+    def get_blocklist_verdict(self, result: dict[str, Any]) -> dict[str, Any]:
+        """
+        Checks the app info of an analysis result for blocked games and adds the blocked path it found.
+        """
+        blocked_game = self.is_game_blocked(result["app_info"])
+        return {
+            "blocked_game": blocked_game,
+            "blocked_path": None if blocked_game else result["blocked_path"],
+        }
+
+    async def download_blocklist_verdict(self, log_url: str) -> dict[str, Any]:
+        log_data = (await self.download_file(log_url)).to_bytes()
+        return await self.scan_blocklist_verdict(log_data)
+
+    async def scan_blocklist_verdict(self, log_data: bytes) -> dict[str, Any]:
+        cache_key = (AnalysedLogCache.hash_content(log_data), None)
+        verdict = self.log_cache.get(cache_key)
+        if verdict is None:
+            result = await self.analysis_service.scan(
+                log_data.decode("UTF-8"), get_disabled_path_matcher(self.bot)
+            )
+            # Only check files which contain log entries
+            if result["has_log_entries"]:
+                verdict = self.get_blocklist_verdict(result)
+            else:
+                verdict = {"blocked_game": False, "blocked_path": None}
+            self.log_cache.put(cache_key, verdict)
+        return verdict
+
+    async def stream_log_file(
+        self,
+        log_url: str,
+        analyser: LogAnalyser,
+        is_verdict_reached: Callable[[str, bool], Awaitable[bool]],
+    ):
+        """
+        Feeds the log file to an incremental analyser while it's being downloaded.
+
+        is_verdict_reached() is called with every decoded chunk after it has been fed to the analyser,
+        and whether it's the last chunk. Stops early once it returns True or log_stream_max_size bytes have been read.
+        """
+        decoder = codecs.getincrementaldecoder("UTF-8")()
+        read_size = 0
+        http_client = self.bot.http_client
+        async with http_client.get(log_url) as response:
+            async for chunk in http_client.iter_chunks(
+                response,
+                self.bot.config.log_stream_chunk_size,
+                self.bot.config.log_stream_max_size,
+            ):
+                read_size += len(chunk)
+                text = decoder.decode(chunk)
+                await asyncio.to_thread(analyser.feed, text)
+                is_cut_off = read_size >= self.bot.config.log_stream_max_size
+                if await is_verdict_reached(text, is_cut_off) or is_cut_off:
+                    return
+        text = decoder.decode(b"", final=True)
+        analyser.feed(text)
+        await is_verdict_reached(text, True)
+
+    async def stream_blocklist_verdict(
+        self, log_url: str, analyser: LogAnalyser
+    ) -> dict[str, Any]:
+        verdict = {"blocked_game": False, "blocked_path": None}
+        path_matcher = get_disabled_path_matcher(self.bot)
+        # Paths don't span lines, so the last line is only searched once it's complete
+        partial_line = ""
+
+        def find_blocked_path(text: str, is_last: bool) -> Optional[str]:
+            nonlocal partial_line
+            text = partial_line + text
+            lines_end = len(text) if is_last else text.rfind("\n") + 1
+            partial_line = text[lines_end:]
+            return find_disabled_filepath(path_matcher, text[:lines_end])
+
+        async def is_blocked(text: str, is_last: bool) -> bool:
+            if self.is_game_blocked(analyser.get_log_app_info()):
+                verdict["blocked_game"] = True
+                return True
+            verdict["blocked_path"] = await asyncio.to_thread(
+                find_blocked_path, text, is_last
+            )
+            return verdict["blocked_path"] is not None
+
+        await self.stream_log_file(log_url, analyser, is_blocked)
+        return verdict
+
+    async def stream_analyse_log(
+        self, log_url: str, author_name: str, is_channel_allowed: bool
+    ) -> dict[str, Any]:
+        analyser = LogAnalyser.incremental(note_plan=self.note_plan)
+        analysed_log = await self.stream_blocklist_verdict(log_url, analyser)
+        analysed_log["is_log_valid"] = True
+        analysed_log["analysis"] = None
+        analysed_log["embed"] = None
+        if analysed_log["blocked_game"] or analysed_log["blocked_path"] is not None:
+            return analysed_log
+
+        try:
+            await asyncio.to_thread(analyser.finish)
+        except ValueError:
+            return analysed_log
+
+        # The last loaded application decides the verdict, so it's checked again once the log is complete
+        analysed_log["blocked_game"] = self.is_game_blocked(analyser.get_log_app_info())
+        analysed_log["is_log_valid"] = self.is_log_valid(
+            analyser.get_log_app_info(), analyser.is_log_homebrew()
+        )
+        analysed_log["analysis"] = analyser.analyse_discord(
+            is_channel_allowed, self.bot.config.bot_log_allowed_channels["pr-testing"]
+        )
+        analysed_log["embed"] = self.format_analysed_log(
+            author_name, analysed_log["analysis"], analyser.get_ryujinx_version()
+        ).to_dict()
+        return analysed_log
+
+    async def download_analyse_log(
+        self, log_url: str, author_name: str, is_channel_allowed: bool
+    ) -> dict[str, Any]:
+        ranged_log = await self.download_file(log_url)
+        log_data = ranged_log.to_bytes()
+
+        # The channel is part of the key, because it decides whether the PR build note is shown.
+        # Extra ranges are only downloaded on a cache miss, so the key only covers the initial ranges.
+        cache_key = (AnalysedLogCache.hash_content(log_data), is_channel_allowed)
+        analysed_log = self.log_cache.get(cache_key)
+        if analysed_log is None:
+            path_matcher = get_disabled_path_matcher(self.bot)
+            result = await self.analysis_service.analyse(
+                log_data.decode("UTF-8"),
+                is_channel_allowed,
+                self.bot.config.bot_log_allowed_channels["pr-testing"],
+                self.note_plan,
+                path_matcher,
+            )
+            # Fields logged in between the downloaded ranges would be reported as "Unknown" otherwise
+            for _ in range(self.bot.config.log_max_extra_ranges):
+                if len(result["missing_fields"]) == 0:
+                    break
+                if not await self.download_missing_range(log_url, ranged_log):
+                    break
+                result = await self.analysis_service.analyse(
+                    ranged_log.to_bytes().decode("UTF-8"),
+                    is_channel_allowed,
+                    self.bot.config.bot_log_allowed_channels["pr-testing"],
+                    self.note_plan,
+                    path_matcher,
+                )
+            analysed_log = self.get_blocklist_verdict(result)
+            analysed_log["is_log_valid"] = self.is_log_valid(
+                result["app_info"], result["is_homebrew"]
+            )
+            analysed_log["analysis"] = result["analysis"]
+            analysed_log["embed"] = None
+            if result["analysis"] is not None:
+                analysed_log["embed"] = self.format_analysed_log(
+                    author_name, result["analysis"], result["ryujinx_version"]
+                ).to_dict()
+            self.log_cache.put(cache_key, analysed_log)
+        return analysed_log
+
+    async def analyse_log_file(
+        self, log_url: str, author_name: str, is_channel_allowed: bool
+    ) -> dict[str, Any]:
+        if self.bot.config.log_streaming:
+            return await self.stream_analyse_log(
+                log_url, author_name, is_channel_allowed
+            )
+        return await self.download_analyse_log(log_url, author_name, is_channel_allowed)
+
+    def is_channel_allowed(self, channel_id: int) -> bool:
+        for allowed_channel_id in self.bot.config.bot_log_allowed_channels.values():
+            if channel_id == allowed_channel_id:
+                return True
+        return False
+
+    @staticmethod
+    def get_log_attachments(
+        attachments: list[Attachment], max_count: int
+    ) -> list[Attachment]:
+        """
+        Returns up to max_count attachments, leaving out attachments with the same name and size as a previous one,
+        since they're the same log file uploaded twice.
+        """
+        log_attachments = {}
+        for attachment in attachments:
+            log_attachments.setdefault(
+                (attachment.filename, attachment.size), attachment
+            )
+        return list(log_attachments.values())[:max_count]
+
+    def queue_log_file(self, message: Message, attachment: Attachment) -> LogJob:
+        """
+        Queues the analysis of a log file. The same log file uploaded by the same user
+        is only downloaded and analysed once while it's in the queue.
+        Raises QueueFullError if too many log files are waiting to be analysed.
+        """
         author_name = f"@{message.author.name}"
-        log_file = await self.download_file(attached_log.url)
+        is_channel_allowed = self.is_channel_allowed(message.channel.id)
+        return self.analysis_queue.submit(
+            (
+                message.author.id,
+                attachment.filename,
+                attachment.size,
+                is_channel_allowed,
+            ),
+            message.channel.id,
+            lambda: self.analyse_log_file(
+                attachment.url, author_name, is_channel_allowed
+            ),
+        )
 
-        if self.is_game_blocked(log_file):
-            return await self.blocked_game_action(message)
-        blocked_path = self.contains_blocked_paths(log_file)
-        if blocked_path:
-            return await self.blocked_path_action(message, blocked_path)
+    async def prefiltered_blocklist_verdict(
+        self, attachment: Attachment
+    ) -> dict[str, Any]:
+        """
+        Checks a file for blocked games and paths, if its first log_prefilter_size bytes look like a Ryujinx log.
+        Other files, like long messages uploaded as message.txt, aren't downloaded completely.
+        """
+        head = await fetch_ranges(
+            self.bot.http_client,
+            attachment.url,
+            [format_range(0, log_prefilter_size)],
+        )
+        head_data = head.ranges[0].data if len(head.ranges) > 0 else b""
+        if not has_log_markers(head_data[:log_prefilter_size]):
+            if self.bot.config.log_streaming:
+                expected_size = self.bot.config.log_stream_max_size
+            else:
+                expected_size = initial_download_size
+            self.prefilter_stats.record_skip(
+                min(attachment.size, expected_size), len(head_data)
+            )
+            return {"blocked_game": False, "blocked_path": None}
+
+        self.prefilter_stats.record_pass(len(head_data), head.is_complete())
+        if head.is_complete():
+            return await self.scan_blocklist_verdict(head.to_bytes())
+        return await self.attachment_blocklist_verdict(attachment)
+
+    async def attachment_blocklist_verdict(
+        self, attachment: Attachment
+    ) -> dict[str, Any]:
+        if self.bot.config.log_streaming:
+            return await self.stream_blocklist_verdict(
+                attachment.url, LogAnalyser.incremental()
+            )
+        return await self.download_blocklist_verdict(attachment.url)
+
+    def get_analysed_log_embed(
+        self, message: Message, analysed_log: dict[str, Any]
+    ) -> Embed:
+        author_name = f"@{message.author.name}"
 
         for role in message.author.roles:
             if role.id in self.disallowed_roles:
@@ -310,7 +629,7 @@ class LogFileReader(Cog):
                 embed.set_footer(text=f"Log uploaded by {author_name}")
                 return embed
 
-        if not self.is_log_valid(log_file):
+        if not analysed_log["is_log_valid"]:
             embed = Embed(
                 title="⚠️ Modified log detected ⚠️",
                 colour=Colour(0xFCFC00),
@@ -319,27 +638,94 @@ class LogFileReader(Cog):
             embed.set_footer(text=f"Log uploaded by {author_name}")
             return embed
 
-        try:
-            analyser = LogAnalyser(log_file)
-        except ValueError:
+        if analysed_log["embed"] is None:
             return Embed(
                 colour=self.ryujinx_blue,
                 description="This log file appears to be invalid. Please make sure to upload a Ryujinx log file.",
             )
 
-        is_channel_allowed = False
-        for allowed_channel_id in self.bot.config.bot_log_allowed_channels.values():
-            if message.channel.id == allowed_channel_id:
-                is_channel_allowed = True
-                break
-
-        return self.format_analysed_log(
-            author_name,
-            analyser,
-            analyser.analyse_discord(
-                is_channel_allowed,
-                self.bot.config.bot_log_allowed_channels["pr-testing"],
-            ),
+        embed = Embed.from_dict(analysed_log["embed"])
+        embed.set_footer(text=f"Log uploaded by {author_name}")
+        return embed
+
+    @commands.check(check_if_staff)
+    @commands.command(aliases=["logcache", "log_cache"])
+    async def log_cache_stats(self, ctx: Context):
+        lookups = self.log_cache.hits + self.log_cache.misses
+        hit_rate = self.log_cache.hits / lookups if lookups > 0 else 0
+        return await ctx.send(
+            f"**Analysed log cache:** {len(self.log_cache)}/{self.log_cache.max_size} entries\n"
+            f"- Hits: {self.log_cache.hits}\n"
+            f"- Misses: {self.log_cache.misses}\n"
+            f"- Hit rate: {hit_rate:.1%}"
+        )
+
+    @commands.check(check_if_staff)
+    @commands.command(aliases=["logqueue", "log_queue"])
+    async def log_queue_stats(self, ctx: Context):
+        queue_stats = self.analysis_queue.stats()
+        return await ctx.send(
+            f"**Log analysis queue:** {queue_stats.depth}/{self.analysis_queue.max_size} waiting, "
+            f"{queue_stats.running}/{self.analysis_queue.max_concurrent} running\n"
+            f"- Max depth: {queue_stats.max_depth}\n"
+            f"- Submitted: {queue_stats.submitted}\n"
+            f"- Deduplicated: {queue_stats.deduplicated}\n"
+            f"- Rejected: {queue_stats.rejected}\n"
+            f"- Completed: {queue_stats.completed}\n"
+            f"- Failed: {queue_stats.failed}\n"
+            f"- Average wait time: {queue_stats.average_wait_time:.2f}s\n"
+            f"- Average service time: {queue_stats.average_service_time:.2f}s"
+        )
+
+    @commands.check(check_if_staff)
+    @commands.command(aliases=["logprefilter", "log_prefilter"])
+    async def log_prefilter_stats(self, ctx: Context):
+        return await ctx.send(
+            f"**Log file prefilter:** {self.prefilter_stats.passed}/{self.prefilter_stats.checked} files passed\n"
+            f"- Scanned without a second download: {self.prefilter_stats.complete}\n"
+            f"- Saved downloads: {self.prefilter_stats.saved_bytes / 1000:.1f} KB\n"
+            f"- Saved analyser calls: {self.prefilter_stats.saved_analyser_calls}"
+        )
+
+    @commands.check(check_if_staff)
+    @commands.command(aliases=["logregex", "log_regex"])
+    async def log_regex_stats(self, ctx: Context, count: int = 10):
+        if not regex_registry.stats_enabled:
+            return await ctx.send(
+                "Log regex stats are disabled, set `log_regex_stats` in the config to enable them."
+            )
+        pattern_stats = regex_registry.stats()[:count]
+        lines = [
+            f"- `{stats.name}`: {stats.calls} calls, {stats.match_time * 1000:.1f}ms"
+            for stats in pattern_stats
+        ]
+        return await ctx.send(f"**Log regexes by match time:**\n" + "\n".join(lines))
+
+    @commands.check(check_if_staff)
+    @commands.command(aliases=["reloadnotes", "reload_notes", "lognotes"])
+    async def reload_log_notes(self, ctx: Context, count: int = 10):
+        try:
+            note_plan = load_note_plan(self.bot)
+        except ValueError as error:
+            return await ctx.send(
+                f"Couldn't load `{os.path.basename(get_note_rules_path(self.bot))}`, "
+                f"keeping the current rules: {error}"
+            )
+
+        self.note_plan = note_plan
+        # Cached embeds contain the notes of the previous rules
+        self.log_cache.clear()
+
+        sample_analyser = LogAnalyser(note_sample_log)
+        rule_costs = note_plan.measure(sample_analyser.get_note_field)[:count]
+        lines = [
+            f"- `{cost.name}`: {cost.conditions} conditions, {cost.seconds * 1e6:.1f}µs"
+            for cost in rule_costs
+        ]
+        return await ctx.send(
+            f"**Loaded {len(note_plan)} log note rules** "
+            f"({len(note_plan.fields)} fields checked once per log)\n"
+            f"Most expensive rules:\n" + "\n".join(lines)
         )
 
     @commands.check(check_if_staff)
@@ -349,6 +735,8 @@ class LogFileReader(Cog):
     async def disable_log_id(
         self, ctx: Context, disable_id: str, block_id_type: str, *, block_id: str
     ):
+        # Cached blocklist verdicts might not be valid anymore
+        self.log_cache.clear()
         match block_id_type.lower():
             case "app" | "app_id" | "appid" | "tid" | "title_id":
                 if not is_app_id_valid(block_id):
@@ -376,10 +764,7 @@ class LogFileReader(Cog):
                     line for line in ro_section_snippet if len(line.strip()) > 0
                 ]
 
-                ro_section_info_regex = re.search(
-                    r"PrintRoSectionInfo: main:", ro_section_snippet[0]
-                )
-                if ro_section_info_regex is None:
+                if "PrintRoSectionInfo: main:" not in ro_section_snippet[0]:
                     ro_section_snippet.insert(0, "PrintRoSectionInfo: main:")
 
                 ro_section = LogAnalyser.get_main_ro_section(
@@ -410,6 +795,8 @@ class LogFileReader(Cog):
         ]
     )
     async def enable_log_id(self, ctx: Context, disable_id: str, block_id_type="all"):
+        # Cached blocklist verdicts might not be valid anymore
+        self.log_cache.clear()
         match block_id_type.lower():
             case "all":
                 if remove_disable_id(self.bot, disable_id):
@@ -512,6 +899,8 @@ class LogFileReader(Cog):
         aliases=["disallow_path", "forbid_path", "block_path", "blockpath"]
     )
     async def disable_path(self, ctx: Context, block_path: str):
+        # Cached blocklist verdicts might not be valid anymore
+        self.log_cache.clear()
         if add_disabled_path(self.bot, block_path):
             return await ctx.send(f"Path content `{block_path}` is now blocked!")
         else:
@@ -526,6 +915,8 @@ class LogFileReader(Cog):
         ]
     )
     async def enable_path(self, ctx: Context, block_path: str):
+        # Cached blocklist verdicts might not be valid anymore
+        self.log_cache.clear()
         if remove_disabled_path(self.bot, block_path):
             return await ctx.send(f"Path content `{block_path}` is now unblocked!")
         else:
@@ -562,70 +953,190 @@ class LogFileReader(Cog):
         for msg in messages:
             await ctx.send(msg)
 
-    async def analyse_log_message(self, message: Message, attachment_index=0):
-        author_id = message.author.id
+    async def get_upload_key(
+        self, author_id: int, attachment: Attachment
+    ) -> Optional[str]:
+        """
+        Returns the key of an uploaded log file in the upload index, which only requires
+        the first few bytes of the file. Returns None if they couldn't be downloaded.
+        """
+        try:
+            ranged_log = await fetch_ranges(
+                self.bot.http_client,
+                attachment.url,
+                [format_range(0, fingerprint_size)],
+            )
+        except Exception as error:
+            logging.warning(f"Couldn't download the start of {attachment.url}: {error}")
+            return None
+        partial_content = b"".join(
+            byte_range.data[:fingerprint_size]
+            for byte_range in ranged_log.ranges
+            if byte_range.start == 0
+        )
+        return UploadIndex.get_key(author_id, attachment.size, partial_content)
+
+    @staticmethod
+    def split_embeds(embeds: list[Embed]) -> list[list[Embed]]:
+        """
+        Splits embeds into groups which fit into one message each, keeping their order.
+        """
+        embed_groups = [[]]
+        group_size = 0
+        for embed in embeds:
+            embed_size = len(embed)
+            if len(embed_groups[-1]) > 0 and (
+                len(embed_groups[-1]) >= max_message_embeds
+                or group_size + embed_size > max_message_embeds_size
+            ):
+                embed_groups.append([])
+                group_size = 0
+            embed_groups[-1].append(embed)
+            group_size += embed_size
+        return embed_groups
+
+    def get_log_error_embed(self, filename: str, error: BaseException) -> Embed:
+        logging.warning(error)
+        if isinstance(error, UnicodeDecodeError):
+            return Embed(
+                description=f"The log file `{filename}` appears to be invalid. Please re-check and re-upload your log file.",
+                colour=self.ryujinx_blue,
+            )
+        if isinstance(error, QueueFullError):
+            return Embed(
+                description=f"Too many log files are being analysed right now, `{filename}` will not be analysed. "
+                "Please try again in a few minutes.",
+                colour=self.ryujinx_blue,
+            )
+        return Embed(
+            description=f"Error: Couldn't parse `{filename}`; parser threw `{type(error).__name__}` exception.",
+            colour=self.ryujinx_blue,
+        )
+
+    async def analyse_log_message(
+        self,
+        message: Message,
+        attachment_indexes: Optional[list[int]] = None,
+        other_attachments: Optional[list[Attachment]] = None,
+    ):
+        """
+        Analyses the log files at the given attachment indexes concurrently and replies with one embed per log file.
+        Embeds which don't fit into the reply are sent in further messages.
+
+        other_attachments are log files which aren't Ryujinx logs, they're only checked for blocked games and paths
+        while the Ryujinx logs are being analysed.
+        """
+        # Started right away, the verdicts are collected together with the analysed logs
+        blocklist_check = asyncio.create_task(
+            self.get_blocklist_verdicts(other_attachments or [])
+        )
         author_mention = message.author.mention
-        filename = message.attachments[attachment_index].filename
-        filesize = message.attachments[attachment_index].size
+        attachments = self.get_log_attachments(
+            [message.attachments[index] for index in attachment_indexes or [0]],
+            self.bot.config.log_max_attachments_per_message,
+        )
         # Any message over 2000 chars is uploaded as message.txt, so this is accounted for
         log_file_link = message.jump_url
 
-        uploaded_logs_exist = [
-            True for elem in self.uploaded_log_info if filename in elem.values()
-        ]
-        if not any(uploaded_logs_exist):
-            reply_message = await message.channel.send(
-                "Log detected, parsing...", reference=message
+        upload_keys = await asyncio.gather(
+            *(
+                self.get_upload_key(message.author.id, attachment)
+                for attachment in attachments
             )
-            try:
-                embed = await self.log_file_read(message)
-                if "Ryujinx_" in filename:
-                    self.uploaded_log_info.append(
-                        {
-                            "filename": filename,
-                            "file_size": filesize,
-                            "link": log_file_link,
-                            "author": author_id,
-                        }
-                    )
-                    # Avoid duplicate log file analysis, at least temporarily; keep track of the last few filenames of uploaded logs
-                    # this should help support channels not be flooded with too many log files
-                    # fmt: off
-                    self.uploaded_log_info = self.uploaded_log_info[-5:]
-                    # fmt: on
-                return await reply_message.edit(content=None, embed=embed)
-            except UnicodeDecodeError as error:
-                await reply_message.edit(
-                    content=author_mention,
-                    embed=Embed(
-                        description="This log file appears to be invalid. Please re-check and re-upload your log file.",
+        )
+        duplicate_embeds = []
+        queued_logs = []
+        for attachment, upload_key in zip(attachments, upload_keys):
+            duplicate_log_file = (
+                self.upload_index.get(upload_key) if upload_key is not None else None
+            )
+            if duplicate_log_file is not None:
+                duplicate_embeds.append(
+                    Embed(
+                        description=f"The log file `{attachment.filename}` appears to be a duplicate [already uploaded here]({duplicate_log_file['link']}). Please upload a more recent file.",
                         colour=self.ryujinx_blue,
-                    ),
-                )
-                logging.warning(error)
-            except Exception as error:
-                await reply_message.edit(
-                    content=f"Error: Couldn't parse log; parser threw `{type(error).__name__}` exception."
+                    )
                 )
-                logging.warning(error)
-        else:
-            duplicate_log_file = next(
-                (
-                    elem
-                    for elem in self.uploaded_log_info
-                    if elem["filename"] == filename
-                    and elem["file_size"] == filesize
-                    and elem["author"] == author_id
-                ),
-                None,
-            )
-            await message.channel.send(
-                content=author_mention,
-                embed=Embed(
-                    description=f"The log file `{filename}` appears to be a duplicate [already uploaded here]({duplicate_log_file['link']}). Please upload a more recent file.",
-                    colour=self.ryujinx_blue,
+                continue
+            try:
+                log_job = self.queue_log_file(message, attachment)
+            except QueueFullError as error:
+                log_job = error
+            queued_logs.append((attachment, upload_key, log_job))
+
+        if len(duplicate_embeds) > 0:
+            for embed_group in self.split_embeds(duplicate_embeds):
+                await message.channel.send(content=author_mention, embeds=embed_group)
+        if len(queued_logs) == 0:
+            blocked_embed = await self.blocked_action(message, await blocklist_check)
+            if blocked_embed is not None:
+                await message.channel.send(content=None, embed=blocked_embed)
+            return
+
+        reply_content = (
+            "Log detected, parsing..."
+            if len(queued_logs) == 1
+            else f"{len(queued_logs)} logs detected, parsing..."
+        )
+        queue_position = max(
+            log_job.position if isinstance(log_job, LogJob) else 0
+            for _, _, log_job in queued_logs
+        )
+        if queue_position > 0:
+            reply_content += f" (position {queue_position} in queue)"
+        reply_message = await message.channel.send(reply_content, reference=message)
+
+        async def wait_for_log(
+            attachment: Attachment, log_job: Union[LogJob, QueueFullError]
+        ):
+            if isinstance(log_job, QueueFullError):
+                # A full queue mustn't let blocked logs through, so they're still checked outside the queue
+                verdict = await self.attachment_blocklist_verdict(attachment)
+                if verdict["blocked_game"] or verdict["blocked_path"] is not None:
+                    return verdict
+                raise log_job
+            return await log_job
+
+        analysed_logs, other_verdicts = await asyncio.gather(
+            asyncio.gather(
+                *(
+                    wait_for_log(attachment, log_job)
+                    for attachment, _, log_job in queued_logs
                 ),
-            )
+                return_exceptions=True,
+            ),
+            blocklist_check,
+        )
+
+        # The message is deleted if a single log is blocked, so the other logs aren't shown
+        blocked_embed = await self.blocked_action(
+            message, [*analysed_logs, *other_verdicts]
+        )
+        if blocked_embed is not None:
+            return await reply_message.edit(content=None, embed=blocked_embed)
+
+        embeds = []
+        has_errors = False
+        for (attachment, upload_key, _), analysed_log in zip(
+            queued_logs, analysed_logs
+        ):
+            if isinstance(analysed_log, BaseException):
+                has_errors = True
+                embeds.append(
+                    self.get_log_error_embed(attachment.filename, analysed_log)
+                )
+                continue
+            embeds.append(self.get_analysed_log_embed(message, analysed_log))
+            if "Ryujinx_" in attachment.filename and upload_key is not None:
+                # Avoid duplicate log file analysis, at least temporarily,
+                # this should help support channels not be flooded with too many log files
+                self.upload_index.put(upload_key, attachment.filename, log_file_link)
+        embed_groups = self.split_embeds(embeds)
+        await reply_message.edit(
+            content=author_mention if has_errors else None, embeds=embed_groups[0]
+        )
+        for embed_group in embed_groups[1:]:
+            await message.channel.send(embeds=embed_group, reference=message)
 
     @commands.cooldown(3, 30, BucketType.channel)
     @commands.command(
@@ -641,7 +1152,7 @@ class LogFileReader(Cog):
 
                 if is_log_file:
                     return await self.analyse_log_message(
-                        message, attachment_number - 1
+                        message, [attachment_number - 1]
                     )
                 else:
                     return await ctx.send(
@@ -653,65 +1164,104 @@ class LogFileReader(Cog):
             "Please use `.analyse` as a reply to a message with an attached log file."
         )
 
+    async def blocked_action(
+        self, message: Message, verdicts: list[Union[dict[str, Any], BaseException]]
+    ) -> Optional[Embed]:
+        """
+        Takes the action for the first blocked verdict and returns its embed, or None if nothing is blocked.
+        Failed checks are skipped.
+        """
+        for verdict in verdicts:
+            if isinstance(verdict, BaseException):
+                continue
+            if verdict["blocked_game"]:
+                return await self.blocked_game_action(message)
+            if verdict["blocked_path"] is not None:
+                return await self.blocked_path_action(message, verdict["blocked_path"])
+        return None
+
+    async def get_blocklist_verdicts(
+        self, attachments: list[Attachment]
+    ) -> list[Union[dict[str, Any], BaseException]]:
+        """
+        Checks the log files which aren't Ryujinx logs for blocked games and paths concurrently.
+
+        The checks don't go through the analysis queue, so flooding the queue can't be used to skip them.
+        Most files are only checked by their first log_prefilter_size bytes, which keeps them cheap.
+        """
+        verdicts = await asyncio.gather(
+            *(
+                self.prefiltered_blocklist_verdict(attachment)
+                for attachment in attachments
+            ),
+            return_exceptions=True,
+        )
+        for verdict in verdicts:
+            if isinstance(verdict, BaseException):
+                logging.warning(verdict)
+        return verdicts
+
+    async def check_blocked_logs(
+        self, message: Message, attachments: list[Attachment]
+    ) -> Optional[Embed]:
+        """
+        Returns the embed of the action taken if one of the attachments is blocked.
+        """
+        return await self.blocked_action(
+            message, await self.get_blocklist_verdicts(attachments)
+        )
+
     @Cog.listener()
     async def on_message(self, message: Message):
         await self.bot.wait_until_ready()
         if message.author.bot:
             return
-        for attachment in message.attachments:
+
+        other_log_files = []
+        ryujinx_log_indexes = []
+        for index, attachment in enumerate(message.attachments):
             is_log_file, is_ryujinx_log_file = self.is_valid_log_name(attachment)
+            if is_log_file and is_ryujinx_log_file:
+                ryujinx_log_indexes.append(index)
+            elif is_log_file:
+                other_log_files.append(attachment)
 
-            if is_log_file and not is_ryujinx_log_file:
-                attached_log = message.attachments[0]
-                log_file = await self.download_file(attached_log.url)
-                # Large files show a header value when not downloaded completely
-                # this regex makes sure that the log text to read starts from the first timestamp, ignoring headers
-                log_file_header_regex = re.compile(
-                    r"\d{2}:\d{2}:\d{2}\.\d{3}.*", re.DOTALL
-                )
-                log_file_match = re.search(log_file_header_regex, log_file)
-                if log_file_match:
-                    log_file = log_file_match.group(0)
-                    if self.is_game_blocked(log_file):
-                        return await message.channel.send(
-                            content=None, embed=await self.blocked_game_action(message)
-                        )
-                    blocked_path = self.contains_blocked_paths(log_file)
-                    if blocked_path:
-                        return await message.channel.send(
-                            content=None,
-                            embed=await self.blocked_path_action(message, blocked_path),
-                        )
-            elif (
-                is_log_file
-                and is_ryujinx_log_file
-                and message.channel.id in self.bot_log_allowed_channels.values()
-            ):
-                return await self.analyse_log_message(
-                    message, message.attachments.index(attachment)
-                )
-            elif (
-                is_log_file
-                and is_ryujinx_log_file
-                and message.channel.id not in self.bot_log_allowed_channels.values()
-            ):
-                return await message.author.send(
-                    content=message.author.mention,
-                    embed=Embed(
-                        description="\n".join(
-                            (
-                                f"Please upload Ryujinx log files to the correct location:\n",
-                                f'<#{self.bot.config.bot_log_allowed_channels["windows-support"]}>: Windows help and troubleshooting',
-                                f'<#{self.bot.config.bot_log_allowed_channels["linux-support"]}>: Linux help and troubleshooting',
-                                f'<#{self.bot.config.bot_log_allowed_channels["macos-support"]}>: macOS help and troubleshooting',
-                                f'<#{self.bot.config.bot_log_allowed_channels["patreon-support"]}>: Help and troubleshooting for Patreon subscribers',
-                                f'<#{self.bot.config.bot_log_allowed_channels["development"]}>: Ryujinx development discussion',
-                                f'<#{self.bot.config.bot_log_allowed_channels["pr-testing"]}>: Discussion of in-progress pull request builds',
-                            )
-                        ),
-                        colour=self.ryujinx_blue,
-                    ),
-                )
+        other_log_files = self.get_log_attachments(
+            other_log_files, self.bot.config.log_max_attachments_per_message
+        )
+        if (
+            len(ryujinx_log_indexes) > 0
+            and message.channel.id in self.bot_log_allowed_channels.values()
+        ):
+            # The other log files are checked while the Ryujinx logs are being analysed
+            return await self.analyse_log_message(
+                message, ryujinx_log_indexes, other_log_files
+            )
+
+        if len(other_log_files) > 0:
+            blocked_embed = await self.check_blocked_logs(message, other_log_files)
+            if blocked_embed is not None:
+                return await message.channel.send(content=None, embed=blocked_embed)
+
+        if len(ryujinx_log_indexes) == 0:
+            return
+        return await message.author.send(
+            content=message.author.mention,
+            embed=Embed(
+                description="\n".join(
+                    (
+                        f"Please upload Ryujinx log files to the correct location:\n",
+                        f'<#{self.bot.config.bot_log_allowed_channels["windows-support"]}>: Windows help and troubleshooting',
+                        f'<#{self.bot.config.bot_log_allowed_channels["linux-support"]}>: Linux help and troubleshooting',
+                        f'<#{self.bot.config.bot_log_allowed_channels["macos-support"]}>: macOS help and troubleshooting',
+                        f'<#{self.bot.config.bot_log_allowed_channels["patreon-support"]}>: Help and troubleshooting for Patreon subscribers',
+                        f'<#{self.bot.config.bot_log_allowed_channels["development"]}>: Ryujinx development discussion',
+                        f'<#{self.bot.config.bot_log_allowed_channels["pr-testing"]}>: Discussion of in-progress pull request builds',
+                    )
+                ),
+                colour=self.ryujinx_blue,
+            ),
+        )
 
 
 async def setup(bot):
@@ -1,4 +1,3 @@
-import aiohttp
 import gidgethub.aiohttp
 from discord import Embed
 from discord.enums import MessageType
@@ -63,16 +62,17 @@ class Pin(Cog):
             # Don't add to gist pinboard if we don't have an oauth token
             return
 
-        async with aiohttp.ClientSession() as session:
-            gh = gidgethub.aiohttp.GitHubAPI(
-                session, "RoboCop-NG", oauth_token=self.bot.config.github_oauth_token
-            )
-            (id, content) = await self.get_pinboard(gh, channel)
-            content += "- " + data + "\n"
+        gh = gidgethub.aiohttp.GitHubAPI(
+            self.bot.http_client.session,
+            "RoboCop-NG",
+            oauth_token=self.bot.config.github_oauth_token,
+        )
+        id, content = await self.get_pinboard(gh, channel)
+        content += "- " + data + "\n"
 
-            await gh.patch(
-                f"/gists/{id}", data={"files": {"pinboard.md": {"content": content}}}
-            )
+        await gh.patch(
+            f"/gists/{id}", data={"files": {"pinboard.md": {"content": content}}}
+        )
 
     @commands.command()
     @commands.guild_only()
@@ -81,12 +81,12 @@ class YubicoOTP(Cog):
         for api_server in self.api_servers:
             url = f"{api_server}/wsapi/2.0/verify?{params}"
             try:
-                resp = await self.bot.aiosession.get(url)
-                assert resp.status == 200
+                async with self.bot.http_client.get(url) as resp:
+                    assert resp.status == 200
+                    resptext = await self.bot.http_client.text(resp)
             except Exception as ex:
                 self.bot.log.warning(f"Got {repr(ex)} on {api_server} with otp {otp}.")
                 continue
-            resptext = await resp.text()
 
             # Turn the fields to a python dict for easier parsing
             datafields = resptext.strip().split("\r\n")
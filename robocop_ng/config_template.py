@@ -184,6 +184,19 @@ suspect_ignored_words = [
     "jit's",
 ]
 
+# HTTP client shared by all cogs
+# Maximum number of open connections in total and per host
+http_connection_limit = 100
+http_connection_limit_per_host = 10
+# Seconds DNS lookups are cached and idle connections are kept alive
+http_dns_cache_ttl = 300
+http_keepalive_timeout = 30
+# Seconds to wait for a connection to be established and for new data to be received
+http_connect_timeout = 10
+http_read_timeout = 30
+# Maximum size of a response body read at once in bytes
+http_max_body_size = 8 * 1000 * 1000
+
 # == For cogs.links ==
 links_guide_text = """**Generic starter guides:**
 Nintendo Homebrew's Guide: <https://nh-server.github.io/switch-guide/>
@@ -334,6 +347,37 @@ pingmods_allow = [named_roles["community"]] + staff_role_ids
 pingmods_role = 360138431524765707
 modtoggle_role = 360138431524765707
 
+# == Only if you want to use cogs.logfilereader ==
+# Number of worker processes used to analyse uploaded log files, or threads if processes can't be forked
+log_analysis_workers = 2
+# Seconds after which the analysis of a single log file is aborted
+log_analysis_timeout = 30
+# Maximum number of log files downloaded and analysed at the same time
+# and how many more can wait in the queue before new ones are rejected
+log_analysis_max_concurrent = 4
+log_analysis_queue_size = 50
+# Maximum number of log files analysed per message. Every log file gets its own embed,
+# the embeds are split across several messages if they exceed Discord's limit of 6000 characters per message
+log_max_attachments_per_message = 5
+# Number of analysed log uploads remembered to detect duplicates and for how many seconds
+log_upload_index_size = 1000
+log_upload_index_ttl = 24 * 60 * 60
+# Maximum number of analysed log files kept in memory and for how many seconds they stay cached
+log_cache_size = 128
+log_cache_ttl = 3600
+# Analyse log files while they're being downloaded and stop as soon as a blocked game or path is found
+log_streaming = False
+# Maximum number of bytes read from a streamed log file and the size of the chunks it's read in
+log_stream_max_size = 8 * 1000 * 1000
+log_stream_chunk_size = 64 * 1024
+# If values are missing from the start and end of a log file, up to log_max_extra_ranges more parts
+# of log_extra_range_size bytes are downloaded from the first part which hasn't been read yet
+log_max_extra_ranges = 3
+log_extra_range_size = 256 * 1000
+# Count the calls and match time of the regexes used to read log files, see the log_regex_stats command.
+# This is a diagnostic, measuring every call makes the log analysis about 10% slower.
+log_regex_stats = False
+
 # == Only if you want to use cogs.yubicootp ==
 # Optiona: Get your own from https://upgrade.yubico.com/getapikey/
 yubico_otp_client_id = 1
@@ -1,10 +1,48 @@
 import json
 import os
-from typing import Union
+from typing import Optional, Union
 
 from robocop_ng.helpers.data_loader import read_json
 
 
+class Blocklist:
+    """
+    Index of the disabled ids, so checking a log doesn't need to read disabled_ids.json again.
+    """
+
+    def __init__(self, disabled_ids: dict[str, dict[str, Union[str, dict[str, str]]]]):
+        self.app_ids: set[str] = set()
+        self.build_ids: set[str] = set()
+        # Lowercase module names of the disabled read-only sections
+        self.ro_section_modules: set[str] = set()
+        for entry in disabled_ids.values():
+            if len(entry["app_id"]) > 0:
+                self.app_ids.add(entry["app_id"].lower())
+            if len(entry["build_id"]) > 0:
+                self.build_ids.add(pad_build_id(entry["build_id"]))
+            if "module" in entry["ro_section"].keys():
+                self.ro_section_modules.add(entry["ro_section"]["module"].lower())
+
+    def is_app_id_disabled(self, app_id: Optional[str]) -> bool:
+        return app_id is not None and app_id.lower() in self.app_ids
+
+    def is_build_id_disabled(self, build_id: Optional[str]) -> bool:
+        return build_id is not None and pad_build_id(build_id) in self.build_ids
+
+    def is_ro_section_disabled(
+        self, ro_section: dict[str, Union[str, list[str]]]
+    ) -> bool:
+        # Only the module name is compared, the SDK libraries of a disabled section don't have to match
+        return (
+            "module" in ro_section.keys()
+            and ro_section["module"].lower() in self.ro_section_modules
+        )
+
+
+# Blocklists by the path of their disabled_ids.json, replaced whenever the file is written
+blocklists: dict[str, Blocklist] = {}
+
+
 def get_disabled_ids_path(bot) -> str:
     return os.path.join(bot.state_dir, "data/disabled_ids.json")
 
@@ -21,6 +59,10 @@ def is_ro_section_valid(ro_section: dict[str, str]) -> bool:
     return "module" in ro_section.keys() and "sdk_libraries" in ro_section.keys()
 
 
+def pad_build_id(build_id: str) -> str:
+    return build_id.lower().ljust(64, "0")
+
+
 def get_disabled_ids(bot) -> dict[str, dict[str, Union[str, dict[str, str]]]]:
     disabled_ids = read_json(bot, get_disabled_ids_path(bot))
     if len(disabled_ids) > 0:
@@ -47,6 +89,15 @@ def get_disabled_ids(bot) -> dict[str, dict[str, Union[str, dict[str, str]]]]:
 def set_disabled_ids(bot, contents: dict[str, dict[str, Union[str, dict[str, str]]]]):
     with open(get_disabled_ids_path(bot), "w") as f:
         json.dump(contents, f)
+    blocklists.pop(get_disabled_ids_path(bot), None)
+
+
+def get_blocklist(bot) -> Blocklist:
+    blocklist = blocklists.get(get_disabled_ids_path(bot))
+    if blocklist is None:
+        blocklist = Blocklist(get_disabled_ids(bot))
+        blocklists[get_disabled_ids_path(bot)] = blocklist
+    return blocklist
 
 
 def add_disable_id_if_necessary(
@@ -57,45 +108,15 @@ def add_disable_id_if_necessary(
 
 
 def is_app_id_disabled(bot, app_id: str) -> bool:
-    disabled_app_ids = [
-        entry["app_id"]
-        for entry in get_disabled_ids(bot).values()
-        if len(entry["app_id"]) > 0
-    ]
-    app_id = app_id.lower()
-    return app_id in disabled_app_ids
+    return get_blocklist(bot).is_app_id_disabled(app_id)
 
 
 def is_build_id_disabled(bot, build_id: str) -> bool:
-    disabled_build_ids = [
-        entry["build_id"]
-        for entry in get_disabled_ids(bot).values()
-        if len(entry["build_id"]) > 0
-    ]
-    build_id = build_id.lower()
-    if len(build_id) < 64:
-        build_id += "0" * (64 - len(build_id))
-    return build_id in disabled_build_ids
+    return get_blocklist(bot).is_build_id_disabled(build_id)
 
 
 def is_ro_section_disabled(bot, ro_section: dict[str, Union[str, list[str]]]) -> bool:
-    disabled_ro_sections = [
-        entry["ro_section"]
-        for entry in get_disabled_ids(bot).values()
-        if len(entry["ro_section"]) > 0
-    ]
-    matches = []
-    for disabled_ro_section in disabled_ro_sections:
-        for key, content in disabled_ro_section.items():
-            if key == "module":
-                matches.append(ro_section[key].lower() == content.lower())
-            else:
-                matches.append(ro_section[key] == content)
-            if all(matches) and len(matches) > 0:
-                return True
-            else:
-                matches = []
-        return False
+    return get_blocklist(bot).is_ro_section_disabled(ro_section)
 
 
 def remove_disable_id(bot, disable_id: str) -> bool:
@@ -122,9 +143,7 @@ def add_disabled_app_id(bot, disable_id: str, app_id: str) -> bool:
 def add_disabled_build_id(bot, disable_id: str, build_id: str) -> bool:
     disabled_ids = get_disabled_ids(bot)
     disable_id = disable_id.lower()
-    build_id = build_id.lower()
-    if len(build_id) < 64:
-        build_id += "0" * (64 - len(build_id))
+    build_id = pad_build_id(build_id)
     if not is_build_id_disabled(bot, build_id):
         add_disable_id_if_necessary(disable_id, disabled_ids)
         disabled_ids[disable_id]["build_id"] = build_id
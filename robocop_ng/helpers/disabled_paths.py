@@ -1,7 +1,13 @@
 import json
 import os
+from typing import Optional
 
 from robocop_ng.helpers.data_loader import read_json
+from robocop_ng.helpers.fragment_matcher import FragmentMatcher
+from robocop_ng.helpers.ryujinx_log_scanners import iter_filepaths
+
+# Matchers by the path of their disabled_paths.json, replaced whenever the file is written
+path_matchers: dict[str, FragmentMatcher] = {}
 
 
 def get_disabled_paths_path(bot) -> str:
@@ -18,13 +24,41 @@ def get_disabled_paths(bot) -> list[str]:
 def set_disabled_paths(bot, contents: list[str]):
     with open(get_disabled_paths_path(bot), "w") as f:
         json.dump({"paths": contents}, f)
+    path_matchers.pop(get_disabled_paths_path(bot), None)
+
+
+def get_disabled_path_matcher(bot) -> FragmentMatcher:
+    path_matcher = path_matchers.get(get_disabled_paths_path(bot))
+    if path_matcher is None:
+        path_matcher = FragmentMatcher(get_disabled_paths(bot))
+        path_matchers[get_disabled_paths_path(bot)] = path_matcher
+    return path_matcher
+
+
+def find_disabled_path(bot, path: str) -> Optional[str]:
+    """
+    Returns the first disabled path fragment found in a path.
+    """
+    return get_disabled_path_matcher(bot).search(path.lower())
+
+
+def find_disabled_filepath(path_matcher: FragmentMatcher, text: str) -> Optional[str]:
+    """
+    Returns the first file path in text which contains a disabled path fragment.
+
+    Only file paths are checked, so fragments in other parts of a log don't count.
+    This doesn't need the bot, so it can run in the log analysis workers.
+    """
+    if len(path_matcher) == 0:
+        return None
+    for filepath in iter_filepaths(text):
+        if path_matcher.search(filepath.strip().lower()) is not None:
+            return filepath
+    return None
 
 
 def is_path_disabled(bot, path: str) -> bool:
-    for disabled_path in get_disabled_paths(bot):
-        if disabled_path in path.strip().lower():
-            return True
-    return False
+    return find_disabled_path(bot, path.strip()) is not None
 
 
 def add_disabled_path(bot, disabled_path: str) -> bool:
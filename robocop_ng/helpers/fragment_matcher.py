@@ -0,0 +1,73 @@
+from collections import deque
+from typing import Iterable, Optional
+
+
+class FragmentMatcher:
+    """
+    Aho-Corasick automaton which finds any of a set of fragments in a text.
+
+    A text is scanned once regardless of the number of fragments,
+    so the time spent per path doesn't grow with the number of blocked paths.
+    """
+
+    def __init__(self, fragments: Iterable[str]):
+        # Node 0 is the root, each node maps the next character to its child node
+        self._transitions: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # The fragment which ends at a node, inherited from the fail node if none ends at the node itself
+        self._outputs: list[Optional[str]] = [None]
+        self.fragments: set[str] = set()
+
+        for fragment in fragments:
+            self.__add(fragment)
+        self.__build_fail_links()
+
+    def __len__(self) -> int:
+        return len(self.fragments)
+
+    def __add(self, fragment: str):
+        self.fragments.add(fragment)
+        node = 0
+        for char in fragment:
+            next_node = self._transitions[node].get(char)
+            if next_node is None:
+                next_node = len(self._transitions)
+                self._transitions.append({})
+                self._fail.append(0)
+                self._outputs.append(None)
+                self._transitions[node][char] = next_node
+            node = next_node
+        self._outputs[node] = fragment
+
+    def __build_fail_links(self):
+        queue = deque(self._transitions[0].values())
+        while len(queue) > 0:
+            node = queue.popleft()
+            for char, child in self._transitions[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail > 0 and char not in self._transitions[fail]:
+                    fail = self._fail[fail]
+                fail = self._transitions[fail].get(char, 0)
+                self._fail[child] = fail if fail != child else 0
+                if self._outputs[child] is None:
+                    self._outputs[child] = self._outputs[self._fail[child]]
+
+    def search(self, text: str) -> Optional[str]:
+        """
+        Returns the first fragment found in text, i.e. the one which ends first, or None if there's none.
+        """
+        if self._outputs[0] is not None:
+            # An empty fragment is contained in every text
+            return self._outputs[0]
+        transitions = self._transitions
+        fail = self._fail
+        outputs = self._outputs
+        node = 0
+        for char in text:
+            while node > 0 and char not in transitions[node]:
+                node = fail[node]
+            node = transitions[node].get(char, 0)
+            if outputs[node] is not None:
+                return outputs[node]
+        return None
@@ -0,0 +1,135 @@
+from typing import AsyncIterator, Optional
+
+import aiohttp
+
+
+class ResponseTooLargeError(ValueError):
+    def __init__(self, url: str, max_size: int):
+        super().__init__(f"Response from {url} is larger than {max_size} bytes.")
+        self.url = url
+        self.max_size = max_size
+
+
+class HttpClient:
+    """
+    The HTTP client shared by all cogs.
+
+    All requests go through the same connector, so connections to a host are kept alive and reused
+    and DNS lookups are cached instead of being repeated for every request.
+    The session is created on first use, since it has to be created inside the running event loop.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[dict[str, str]] = None,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30,
+        connect_timeout: float = 10,
+        read_timeout: float = 30,
+        max_body_size: int = 8 * 1000 * 1000,
+    ):
+        self.headers = headers
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        # There's no total timeout, so streamed downloads can take longer as long as data keeps arriving
+        self.timeout = aiohttp.ClientTimeout(
+            total=None, connect=connect_timeout, sock_read=read_timeout
+        )
+        self.max_body_size = max_body_size
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @classmethod
+    def from_config(cls, config, headers: Optional[dict[str, str]] = None):
+        return cls(
+            headers,
+            config.http_connection_limit,
+            config.http_connection_limit_per_host,
+            config.http_dns_cache_ttl,
+            config.http_keepalive_timeout,
+            config.http_connect_timeout,
+            config.http_read_timeout,
+            config.http_max_body_size,
+        )
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                headers=self.headers, connector=connector, timeout=self.timeout
+            )
+        return self._session
+
+    def get(self, url: str, **kwargs):
+        """
+        Sends a GET request. Use it with "async with", so the connection is released for reuse afterwards.
+        """
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.session.post(url, **kwargs)
+
+    def __get_max_size(self, max_size: Optional[int]) -> int:
+        return self.max_body_size if max_size is None else max_size
+
+    async def read(
+        self, response: aiohttp.ClientResponse, max_size: Optional[int] = None
+    ) -> bytes:
+        """
+        Reads the response body. Raises ResponseTooLargeError if it's larger than max_size bytes,
+        which defaults to max_body_size.
+        """
+        max_size = self.__get_max_size(max_size)
+        if response.content_length is not None and response.content_length > max_size:
+            raise ResponseTooLargeError(str(response.url), max_size)
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            body += chunk
+            if len(body) > max_size:
+                raise ResponseTooLargeError(str(response.url), max_size)
+        return bytes(body)
+
+    async def text(
+        self, response: aiohttp.ClientResponse, max_size: Optional[int] = None
+    ) -> str:
+        body = await self.read(response, max_size)
+        return body.decode(response.get_encoding())
+
+    async def iter_chunks(
+        self,
+        response: aiohttp.ClientResponse,
+        chunk_size: int,
+        max_size: Optional[int] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Yields the response body in chunks of up to chunk_size bytes.
+        Unlike read(), the body is cut off after max_size bytes instead of raising an error.
+        """
+        max_size = self.__get_max_size(max_size)
+        read_size = 0
+        async for chunk in response.content.iter_chunked(chunk_size):
+            if read_size + len(chunk) >= max_size:
+                yield chunk[: max_size - read_size]
+                return
+            read_size += len(chunk)
+            yield chunk
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.queues import SimpleQueue
+from typing import Any, Callable, Optional, Union
+
+from robocop_ng.helpers.disabled_paths import find_disabled_filepath
+from robocop_ng.helpers.fragment_matcher import FragmentMatcher
+from robocop_ng.helpers.regex_registry import regex_registry
+from robocop_ng.helpers.ryujinx_log_analyser import (
+    LogAnalyser,
+    ParsedLog,
+    RyujinxVersion,
+    required_fields,
+)
+from robocop_ng.helpers.ryujinx_log_notes import NotePlan, default_note_plan
+
+# The functions below are executed inside the worker processes,
+# so they and their results have to stay picklable.
+
+
+def init_worker(worker_pids: SimpleQueue):
+    # Forked workers would otherwise report the stats of the main process again
+    regex_registry.reset()
+    # Lets the main process find the workers of its pool, in case it has to terminate them
+    worker_pids.put(os.getpid())
+
+
+def run_job(func: Callable, *args) -> tuple[Any, dict[str, tuple[int, int]]]:
+    # The regex stats of the worker are returned along with the result, so they show up in the main process
+    result = func(*args)
+    return result, regex_registry.collect()
+
+
+def scan_parsed_log(
+    parsed_log: ParsedLog, path_matcher: Optional[FragmentMatcher] = None
+) -> dict[str, Union[bool, Optional[str], Optional[tuple]]]:
+    return {
+        "has_log_entries": parsed_log.body is not None,
+        "app_info": parsed_log.app_info,
+        "is_homebrew": parsed_log.is_homebrew,
+        "blocked_path": (
+            find_disabled_filepath(path_matcher, parsed_log.raw_text)
+            if path_matcher is not None
+            else None
+        ),
+    }
+
+
+def scan_log_file(
+    log_file: str, path_matcher: Optional[FragmentMatcher] = None
+) -> dict[str, Union[bool, Optional[str], Optional[tuple]]]:
+    return scan_parsed_log(ParsedLog(log_file), path_matcher)
+
+
+def analyse_log_file(
+    log_file: str,
+    is_channel_allowed: bool,
+    pr_channel: int,
+    note_plan: NotePlan = default_note_plan,
+    path_matcher: Optional[FragmentMatcher] = None,
+) -> dict[str, Any]:
+    parsed_log = ParsedLog(log_file)
+    result = scan_parsed_log(parsed_log, path_matcher)
+    try:
+        analyser = LogAnalyser(parsed_log, note_plan)
+    except ValueError:
+        result["analysis"] = None
+        result["ryujinx_version"] = (RyujinxVersion.CUSTOM, "Unknown")
+        result["missing_fields"] = []
+        return result
+
+    result["analysis"] = analyser.analyse_discord(is_channel_allowed, pr_channel)
+    result["ryujinx_version"] = analyser.get_ryujinx_version()
+    result["missing_fields"] = analyser.get_missing_fields(required_fields)
+    return result
+
+
+class LogAnalysisService:
+    """
+    Runs the log analysis outside the event loop, so large or malicious logs can't stall the gateway heartbeat.
+
+    Jobs are executed in a process pool if the platform supports forking and in a thread pool otherwise.
+    A job which timed out in a thread keeps running until it's done, since threads can't be cancelled,
+    and it takes up one of the max_workers threads until then.
+    """
+
+    def __init__(self, max_workers: int, timeout: float):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        # The PIDs reported by the workers of the current process pool
+        self._worker_pids: Optional[SimpleQueue] = None
+        self._executor = self.__create_executor()
+
+    def __create_executor(self) -> Executor:
+        # Spawned processes would re-run the bot's __main__ module, so only fork is usable here
+        if "fork" in multiprocessing.get_all_start_methods():
+            try:
+                mp_context = multiprocessing.get_context("fork")
+                worker_pids = mp_context.SimpleQueue()
+                executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=mp_context,
+                    initializer=init_worker,
+                    initargs=(worker_pids,),
+                )
+                self._worker_pids = worker_pids
+                return executor
+            except (NotImplementedError, OSError) as error:
+                logging.warning(f"Couldn't create log analysis process pool: {error}")
+
+        logging.warning("Log analysis is running in threads instead of processes.")
+        self._worker_pids = None
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="log_analysis"
+        )
+
+    @staticmethod
+    def __terminate_workers(worker_pids: SimpleQueue):
+        pids = set()
+        while not worker_pids.empty():
+            pids.add(worker_pids.get())
+        worker_pids.close()
+        # Only processes which are still children of the bot are terminated, so a reused PID can't be hit
+        for process in multiprocessing.active_children():
+            if process.pid in pids:
+                process.terminate()
+
+    def __recycle_executor(self, old_executor: Executor):
+        if old_executor is not self._executor:
+            # Another job already replaced the executor
+            return
+        old_worker_pids = self._worker_pids
+        self._executor = self.__create_executor()
+        if old_worker_pids is not None:
+            # A worker stuck on a job can't be interrupted, so its process is terminated instead.
+            # Other jobs still running in the old pool fail with BrokenProcessPool.
+            self.__terminate_workers(old_worker_pids)
+        old_executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, func: Callable, *args) -> Any:
+        """
+        Runs func(*args) in the executor.
+
+        Raises asyncio.TimeoutError if the job takes longer than the configured timeout.
+        Cancelling the awaiting task cancels the job if it hasn't been started yet.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        try:
+            result, regex_counters = await asyncio.wait_for(
+                loop.run_in_executor(executor, run_job, func, *args), self.timeout
+            )
+        except asyncio.TimeoutError:
+            logging.warning(f"Log analysis job timed out after {self.timeout}s.")
+            # A job in a thread can't be stopped, recycling the thread pool wouldn't free its thread
+            if isinstance(executor, ProcessPoolExecutor):
+                self.__recycle_executor(executor)
+            raise
+        except BrokenProcessPool:
+            logging.warning("Log analysis process pool broke, recreating it.")
+            self.__recycle_executor(executor)
+            raise
+        regex_registry.merge(regex_counters)
+        return result
+
+    async def scan(
+        self, log_file: str, path_matcher: Optional[FragmentMatcher] = None
+    ) -> dict[str, Any]:
+        """
+        Extracts the fields needed for blocklist checks.
+        If path_matcher is given, the first file path containing one of its fragments is returned as "blocked_path".
+        """
+        return await self.run(scan_log_file, log_file, path_matcher)
+
+    async def analyse(
+        self,
+        log_file: str,
+        is_channel_allowed: bool,
+        pr_channel: int,
+        note_plan: NotePlan = default_note_plan,
+        path_matcher: Optional[FragmentMatcher] = None,
+    ) -> dict[str, Any]:
+        # The note plan and path matcher are sent along with every job,
+        # so reloaded rules and changed disabled paths apply to workers forked before the change
+        return await self.run(
+            analyse_log_file,
+            log_file,
+            is_channel_allowed,
+            pr_channel,
+            note_plan,
+            path_matcher,
+        )
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
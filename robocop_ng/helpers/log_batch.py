@@ -0,0 +1,213 @@
+import glob
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+from robocop_ng.helpers.ryujinx_log_analyser import LogAnalyser
+
+
+def collect_log_files(
+    patterns: Iterable[str], file_pattern: str = "*.log"
+) -> list[str]:
+    """
+    Expands files, directories (searched recursively for file_pattern) and glob patterns into a sorted list of files.
+    """
+    log_files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(
+                os.path.join(glob.escape(pattern), "**", file_pattern), recursive=True
+            )
+        elif os.path.isfile(pattern):
+            matches = [pattern]
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        log_files.update(
+            os.path.abspath(match) for match in matches if os.path.isfile(match)
+        )
+    return sorted(log_files)
+
+
+def analyse_file(job: tuple[str, Optional[str], bool]) -> dict[str, Any]:
+    """
+    Analyses a single log file, unless its content hash matches the cached hash.
+    Executed inside the worker processes.
+    """
+    log_file, cached_hash, use_mmap = job
+    start_time = time.perf_counter()
+    with open(log_file, "rb") as file:
+        if use_mmap:
+            file_hash = hashlib.file_digest(file, "sha256").hexdigest()
+            log_data = None
+        else:
+            log_data = file.read()
+            file_hash = hashlib.sha256(log_data).hexdigest()
+
+    result = {
+        "path": log_file,
+        "size": os.path.getsize(log_file),
+        "hash": file_hash,
+    }
+    if result["hash"] == cached_hash:
+        result["unchanged"] = True
+    else:
+        try:
+            if log_data is None:
+                analyser = LogAnalyser.from_file(log_file, max_error_groups=None)
+            else:
+                analyser = LogAnalyser(log_data.decode("UTF-8", errors="replace"))
+            result["result"] = analyser.analyse()
+        except ValueError as error:
+            result["error"] = str(error)
+        except Exception as error:
+            # A single broken log file mustn't stop the whole batch
+            result["error"] = f"{type(error).__name__}: {error}"
+    result["seconds"] = time.perf_counter() - start_time
+    return result
+
+
+class BatchResultsCache:
+    """
+    Analysis results of previous batch runs, stored as JSON and keyed by the path of the log file.
+
+    A file is unchanged if its modification time is the same. Otherwise its content hash is compared,
+    so touched or copied files don't have to be analysed again.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._entries: dict[str, dict[str, Any]] = {}
+        if path is not None and os.path.isfile(path):
+            try:
+                with open(path, "r") as file:
+                    entries = json.load(file)
+                if not isinstance(entries, dict):
+                    raise ValueError("The cache doesn't contain a JSON object.")
+                self._entries = entries
+            except (OSError, ValueError) as error:
+                # The files are analysed again instead
+                logging.warning(f"Couldn't load the results cache {path}: {error}")
+
+    def get(self, log_file: str) -> Optional[dict[str, Any]]:
+        return self._entries.get(log_file)
+
+    def is_unchanged(self, log_file: str) -> bool:
+        entry = self.get(log_file)
+        return entry is not None and entry["mtime_ns"] == os.stat(log_file).st_mtime_ns
+
+    def put(self, log_file: str, file_hash: str, result: dict[str, Any]):
+        self._entries[log_file] = {
+            "mtime_ns": os.stat(log_file).st_mtime_ns,
+            "hash": file_hash,
+            "result": result,
+        }
+
+    def save(self):
+        if self.path is None:
+            return
+        # The cache is replaced at once, so an interrupted run doesn't leave a partially written file behind
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self._entries, file)
+        os.replace(temp_path, self.path)
+
+
+def run_batch(
+    log_files: list[str],
+    cache: BatchResultsCache,
+    workers: int,
+    use_mmap: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """
+    Analyses the log files in a process pool and yields their results in the order they finish.
+    """
+    jobs = []
+    for log_file in log_files:
+        if cache.is_unchanged(log_file):
+            yield {
+                "path": log_file,
+                "cached": True,
+                "seconds": 0.0,
+                **cache.get(log_file)["result"],
+            }
+            continue
+        cached_entry = cache.get(log_file)
+        jobs.append(
+            (log_file, cached_entry["hash"] if cached_entry else None, use_mmap)
+        )
+
+    if len(jobs) == 0:
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap_unordered(analyse_file, jobs):
+            log_file = result.pop("path")
+            seconds = result.pop("seconds")
+            if result.pop("unchanged", False):
+                cached_result = cache.get(log_file)["result"]
+                cache.put(log_file, result["hash"], cached_result)
+                yield {
+                    "path": log_file,
+                    "cached": True,
+                    "seconds": seconds,
+                    **cached_result,
+                }
+                continue
+            cache.put(log_file, result["hash"], result)
+            yield {"path": log_file, "cached": False, "seconds": seconds, **result}
+
+
+def write_batch_results(
+    results: Iterable[dict[str, Any]], output: TextIO, progress: TextIO = sys.stderr
+):
+    """
+    Writes the results as JSON lines and prints per file timings and the aggregate throughput to progress.
+    """
+    start_time = time.perf_counter()
+    file_count = 0
+    cached_count = 0
+    analysed_size = 0
+    for result in results:
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+        file_count += 1
+        if result["cached"]:
+            cached_count += 1
+        else:
+            analysed_size += result["size"]
+        print(
+            f"{result['seconds'] * 1000:>10.1f}ms {'cached' if result['cached'] else '':>6} {result['path']}",
+            file=progress,
+        )
+
+    elapsed = time.perf_counter() - start_time
+    print(
+        f"Analysed {file_count - cached_count} files ({analysed_size / 1000 / 1000:.1f}MB), "
+        f"skipped {cached_count} unchanged files in {elapsed:.1f}s "
+        f"({analysed_size / 1000 / 1000 / elapsed if elapsed > 0 else 0:.2f}MB/s)",
+        file=progress,
+    )
+
+
+def main(args):
+    log_files = collect_log_files(args.log_files, args.pattern)
+    if len(log_files) == 0:
+        logging.error("Couldn't find any log files.")
+        exit(1)
+
+    cache = BatchResultsCache(args.cache)
+    output = open(args.output, "w") if args.output is not None else sys.stdout
+    try:
+        write_batch_results(
+            run_batch(log_files, cache, args.workers or os.cpu_count(), args.mmap),
+            output,
+        )
+    finally:
+        cache.save()
+        if output is not sys.stdout:
+            output.close()
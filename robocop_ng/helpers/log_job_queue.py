@@ -0,0 +1,197 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class QueueFullError(Exception):
+    pass
+
+
+@dataclass(slots=True)
+class QueueStats:
+    depth: int
+    running: int
+    max_depth: int
+    submitted: int
+    deduplicated: int
+    rejected: int
+    completed: int
+    failed: int
+    # Averages of the last completed jobs in seconds
+    average_wait_time: float
+    average_service_time: float
+
+
+class LogJob:
+    """
+    A queued or running job. Awaiting it returns the result of the job, jobs which are awaited
+    by several messages aren't cancelled if one of them is cancelled.
+    """
+
+    __slots__ = ("queue_key", "channel_id", "func", "future", "enqueued_at", "position")
+
+    def __init__(
+        self,
+        queue_key: Hashable,
+        channel_id: int,
+        func: Callable[[], Awaitable[Any]],
+        future: asyncio.Future,
+    ):
+        self.queue_key = queue_key
+        self.channel_id = channel_id
+        self.func = func
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        # The position in the queue when the job was submitted, 0 if it was started right away
+        self.position = 0
+
+    def __await__(self):
+        return asyncio.shield(self.future).__await__()
+
+
+class LogJobQueue:
+    """
+    Runs log analysis jobs with a global concurrency limit.
+
+    Waiting jobs are started round-robin across channels, so a flood of logs in one support channel
+    doesn't hold up the others. A job submitted again while the same key is queued or running
+    isn't run twice, the existing job is returned instead.
+    """
+
+    def __init__(self, max_concurrent: int, max_size: int, history_size: int = 100):
+        self.max_concurrent = max_concurrent
+        self.max_size = max_size
+        self.running = 0
+        self.max_depth = 0
+        self.submitted = 0
+        self.deduplicated = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self._wait_times: deque[float] = deque(maxlen=history_size)
+        self._service_times: deque[float] = deque(maxlen=history_size)
+        # The channel at the front is the next one to start a job
+        self._channels: OrderedDict[int, deque[LogJob]] = OrderedDict()
+        self._jobs: dict[Hashable, LogJob] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return sum(len(channel_jobs) for channel_jobs in self._channels.values())
+
+    def submit(
+        self,
+        queue_key: Hashable,
+        channel_id: int,
+        func: Callable[[], Awaitable[Any]],
+    ) -> LogJob:
+        """
+        Queues func() and returns its job. Raises QueueFullError if max_size jobs are already waiting.
+        """
+        job = self._jobs.get(queue_key)
+        if job is not None:
+            self.deduplicated += 1
+            job.position = self.get_position(job)
+            return job
+
+        if len(self) >= self.max_size:
+            self.rejected += 1
+            raise QueueFullError(f"{len(self)} log analysis jobs are already waiting.")
+
+        job = LogJob(
+            queue_key, channel_id, func, asyncio.get_running_loop().create_future()
+        )
+        self.submitted += 1
+        self._jobs[queue_key] = job
+        self._channels.setdefault(channel_id, deque()).append(job)
+        self.max_depth = max(self.max_depth, len(self))
+        self.__start_jobs()
+        job.position = self.get_position(job)
+        return job
+
+    def get_position(self, job: LogJob) -> int:
+        """
+        Returns the position of a waiting job in the queue, starting at 1, or 0 if the job is running.
+        """
+        channel_jobs = self._channels.get(job.channel_id)
+        if channel_jobs is None or job not in channel_jobs:
+            return 0
+        index = channel_jobs.index(job)
+        position = index + 1
+        is_channel_ahead = True
+        for channel_id, other_jobs in self._channels.items():
+            if channel_id == job.channel_id:
+                # Channels behind this one get one turn less before the job is started
+                is_channel_ahead = False
+            else:
+                position += min(
+                    len(other_jobs), index + 1 if is_channel_ahead else index
+                )
+        return position
+
+    def __start_jobs(self):
+        while self.running < self.max_concurrent and len(self._channels) > 0:
+            channel_id, channel_jobs = next(iter(self._channels.items()))
+            job = channel_jobs.popleft()
+            if len(channel_jobs) > 0:
+                self._channels.move_to_end(channel_id)
+            else:
+                del self._channels[channel_id]
+
+            self.running += 1
+            task = asyncio.create_task(self.__run(job))
+            # The event loop only keeps weak references to tasks
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def __run(self, job: LogJob):
+        started_at = time.monotonic()
+        self._wait_times.append(started_at - job.enqueued_at)
+        try:
+            result = await job.func()
+        except Exception as error:
+            self.failed += 1
+            if not job.future.done():
+                job.future.set_exception(error)
+                # Marks the exception as retrieved, nobody might be waiting for the job anymore
+                job.future.exception()
+        except asyncio.CancelledError:
+            job.future.cancel()
+            raise
+        else:
+            self.completed += 1
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self._service_times.append(time.monotonic() - started_at)
+            self.running -= 1
+            del self._jobs[job.queue_key]
+            self.__start_jobs()
+
+    @staticmethod
+    def __average(values: deque[float]) -> float:
+        return sum(values) / len(values) if len(values) > 0 else 0
+
+    def stats(self) -> QueueStats:
+        return QueueStats(
+            len(self),
+            self.running,
+            self.max_depth,
+            self.submitted,
+            self.deduplicated,
+            self.rejected,
+            self.completed,
+            self.failed,
+            self.__average(self._wait_times),
+            self.__average(self._service_times),
+        )
+
+    def cancel_all(self):
+        for channel_jobs in self._channels.values():
+            for job in channel_jobs:
+                job.future.cancel()
+                del self._jobs[job.queue_key]
+        self._channels.clear()
+        for task in self._tasks:
+            task.cancel()
@@ -0,0 +1,48 @@
+import re
+from dataclasses import dataclass
+
+from robocop_ng.helpers.regex_registry import regex_registry
+
+# Number of bytes at the start of a file which are checked before the whole file is downloaded
+log_prefilter_size = 4096
+
+log_marker_regex = regex_registry.compile(
+    "log_marker",
+    rb"^\d{2}:\d{2}:\d{2}\.\d{3} \|[A-Z]\| |Ryujinx Version:|Application Loaded",
+    re.MULTILINE,
+)
+
+
+def has_log_markers(head: bytes) -> bool:
+    """
+    Returns True if the start of a file looks like it's part of a Ryujinx log.
+    """
+    return log_marker_regex.search(head) is not None
+
+
+@dataclass(slots=True)
+class PrefilterStats:
+    checked: int = 0
+    passed: int = 0
+    # Files which were small enough to be scanned without a second download
+    complete: int = 0
+    # Bytes which didn't have to be downloaded, minus the bytes of the checked starts of files which passed
+    saved_bytes: int = 0
+    saved_analyser_calls: int = 0
+
+    def record_skip(self, expected_size: int, head_size: int):
+        """
+        Records a skipped file, for which expected_size bytes would have been downloaded and analysed otherwise.
+        """
+        self.checked += 1
+        self.saved_bytes += max(expected_size - head_size, 0)
+        self.saved_analyser_calls += 1
+
+    def record_pass(self, head_size: int, is_complete: bool):
+        self.checked += 1
+        self.passed += 1
+        if is_complete:
+            # The file doesn't need to be downloaded again
+            self.complete += 1
+        else:
+            self.saved_bytes -= head_size
@@ -0,0 +1,36 @@
+import json
+import os
+from typing import Any
+
+from robocop_ng.helpers.data_loader import read_json
+from robocop_ng.helpers.ryujinx_log_notes import NotePlan, default_note_rules
+
+
+def get_note_rules_path(bot) -> str:
+    return os.path.join(bot.state_dir, "data/log_note_rules.json")
+
+
+def get_note_rules(bot) -> list[dict[str, Any]]:
+    # The default rules are written to the state dir, so they can be edited there
+    if not os.path.isfile(get_note_rules_path(bot)):
+        set_note_rules(bot, default_note_rules)
+        return default_note_rules
+    note_rules = read_json(bot, get_note_rules_path(bot))
+    if "rules" not in note_rules.keys():
+        return []
+    return note_rules["rules"]
+
+
+def set_note_rules(bot, contents: list[dict[str, Any]]):
+    with open(get_note_rules_path(bot), "w") as f:
+        json.dump({"rules": contents}, f, indent=2, ensure_ascii=False)
+
+
+def load_note_plan(bot) -> NotePlan:
+    """
+    Compiles the note rules from the state dir. Raises ValueError if a rule is invalid.
+    """
+    note_rules = get_note_rules(bot)
+    if not isinstance(note_rules, list):
+        raise ValueError("'rules' has to be a list of rules.")
+    return NotePlan.from_data(note_rules)
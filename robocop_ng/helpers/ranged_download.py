@@ -0,0 +1,196 @@
+import re
+from dataclasses import dataclass
+from typing import Iterable, Mapping, Optional
+
+from robocop_ng.helpers.http_client import HttpClient
+from robocop_ng.helpers.regex_registry import regex_registry
+
+content_range_regex = regex_registry.compile(
+    "content_range", r"bytes\s+(\d+)-(\d+)/(\d+|\*)"
+)
+boundary_regex = regex_registry.compile(
+    "boundary", r'boundary="?([^";]+)"?', re.IGNORECASE
+)
+# Used to find the first complete log entry behind a gap
+log_line_regex = regex_registry.compile(
+    "log_line", rb"^\d{2}:\d{2}:\d{2}\.\d{3} \|", re.MULTILINE
+)
+
+
+@dataclass(slots=True)
+class ByteRange:
+    start: int
+    data: bytes
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.data)
+
+
+def parse_content_range(value: str) -> tuple[int, int, Optional[int]]:
+    """
+    Returns the start, exclusive end and total size of a Content-Range header value.
+    The total size is None if the server didn't know it.
+    """
+    content_range_match = content_range_regex.match(value.strip())
+    if content_range_match is None:
+        raise ValueError(f"Invalid Content-Range: {value}")
+    start = int(content_range_match.group(1))
+    end = int(content_range_match.group(2)) + 1
+    total = content_range_match.group(3)
+    return start, end, int(total) if total != "*" else None
+
+
+def parse_multipart_byteranges(
+    body: bytes, boundary: str
+) -> tuple[list[ByteRange], Optional[int]]:
+    """
+    Splits a multipart/byteranges response body into its ranges.
+    Returns the ranges and the total size of the file, if it was sent.
+    """
+    delimiter = b"--" + boundary.encode("ascii")
+    ranges = []
+    total_size = None
+    position = body.find(delimiter)
+    while position != -1:
+        position += len(delimiter)
+        if body.startswith(b"--", position):
+            # Closing delimiter
+            break
+        headers_end = body.find(b"\r\n\r\n", position)
+        if headers_end == -1:
+            break
+
+        content_range = None
+        for header in body[position:headers_end].split(b"\r\n"):
+            name, _, value = header.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-range":
+                content_range = value
+        if content_range is None:
+            raise ValueError("Missing Content-Range in multipart/byteranges part")
+
+        start, end, total_size = parse_content_range(content_range)
+        # The length is known from the Content-Range, so line breaks in the data can't be mistaken for the delimiter
+        data_start = headers_end + 4
+        ranges.append(ByteRange(start, body[data_start : data_start + end - start]))
+        position = body.find(delimiter, data_start + end - start)
+
+    return ranges, total_size
+
+
+class RangedFile:
+    """
+    The parts of a remote file which have been downloaded so far.
+    """
+
+    def __init__(self, total_size: Optional[int] = None):
+        self.total_size = total_size
+        self.ranges: list[ByteRange] = []
+
+    @classmethod
+    def from_response(
+        cls, status: int, headers: Mapping[str, str], body: bytes
+    ) -> "RangedFile":
+        content_type = headers.get("Content-Type", "")
+        if status != 206:
+            # The server ignored the Range header and sent the whole file
+            ranged_file = cls(len(body))
+            ranged_file.add(ByteRange(0, body))
+        elif content_type.lower().startswith("multipart/byteranges"):
+            boundary_match = boundary_regex.search(content_type)
+            if boundary_match is None:
+                raise ValueError(f"Missing boundary in Content-Type: {content_type}")
+            ranges, total_size = parse_multipart_byteranges(
+                body, boundary_match.group(1)
+            )
+            ranged_file = cls(total_size)
+            ranged_file.add_all(ranges)
+        else:
+            start, _, total_size = parse_content_range(headers.get("Content-Range", ""))
+            ranged_file = cls(total_size)
+            ranged_file.add(ByteRange(start, body))
+        return ranged_file
+
+    @property
+    def downloaded_size(self) -> int:
+        return sum(len(byte_range.data) for byte_range in self.ranges)
+
+    def add(self, new_range: ByteRange):
+        """
+        Adds a downloaded range, merging it with the ranges it overlaps or touches.
+        """
+        merged = []
+        for byte_range in self.ranges:
+            if byte_range.end < new_range.start or new_range.end < byte_range.start:
+                merged.append(byte_range)
+                continue
+            start = min(byte_range.start, new_range.start)
+            data = bytearray(max(byte_range.end, new_range.end) - start)
+            data[byte_range.start - start : byte_range.end - start] = byte_range.data
+            data[new_range.start - start : new_range.end - start] = new_range.data
+            new_range = ByteRange(start, bytes(data))
+        merged.append(new_range)
+        self.ranges = sorted(merged, key=lambda byte_range: byte_range.start)
+
+    def add_all(self, ranges: Iterable[ByteRange]):
+        for byte_range in ranges:
+            self.add(byte_range)
+
+    def gaps(self) -> list[tuple[int, Optional[int]]]:
+        """
+        Returns the start and exclusive end of all parts which haven't been downloaded.
+        The end of the last gap is None if the size of the file is unknown.
+        """
+        gaps = []
+        position = 0
+        for byte_range in self.ranges:
+            if byte_range.start > position:
+                gaps.append((position, byte_range.start))
+            position = max(position, byte_range.end)
+        if self.total_size is None:
+            if len(self.ranges) == 0:
+                gaps.append((position, None))
+        elif position < self.total_size:
+            gaps.append((position, self.total_size))
+        return gaps
+
+    def is_complete(self) -> bool:
+        return len(self.gaps()) == 0
+
+    def to_bytes(self) -> bytes:
+        """
+        Joins the downloaded ranges, leaving out lines which have been cut by a gap.
+
+        Lines following a gap are skipped until the next log entry starts,
+        so the continuation lines of a missing entry aren't attached to the entry in front of the gap.
+        """
+        parts = []
+        for byte_range in self.ranges:
+            data = byte_range.data
+            if byte_range.start > 0:
+                log_line_match = log_line_regex.search(data, data.find(b"\n") + 1)
+                if data.find(b"\n") == -1 or log_line_match is None:
+                    continue
+                data = data[log_line_match.start() :]
+            if self.total_size is None or byte_range.end < self.total_size:
+                data = data[: data.rfind(b"\n") + 1]
+            parts.append(data)
+        return b"".join(parts)
+
+
+def format_range(start: int, end: Optional[int]) -> str:
+    return f"{start}-{end - 1}" if end is not None else f"{start}-"
+
+
+async def fetch_ranges(
+    http_client: HttpClient, url: str, ranges: Iterable[str]
+) -> RangedFile:
+    """
+    Requests the given byte ranges (e.g. "0-60000" or "-6000") of a file in a single request.
+    """
+    headers = {"Range": "bytes=" + ", ".join(ranges)}
+    async with http_client.get(url, headers=headers) as response:
+        response.raise_for_status()
+        return RangedFile.from_response(
+            response.status, response.headers, await http_client.read(response)
+        )
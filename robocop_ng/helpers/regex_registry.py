@@ -0,0 +1,159 @@
+import re
+import time
+from dataclasses import dataclass
+from typing import AnyStr, Callable, Iterator, Union
+
+
+@dataclass(slots=True)
+class PatternStats:
+    name: str
+    pattern: str
+    calls: int
+    match_time: float
+
+
+class RegisteredPattern:
+    """
+    A compiled pattern which can count its calls and measure the time spent matching.
+
+    Supports the methods of re.Pattern used in this bot, the returned matches are regular re.Match objects.
+    While stats are disabled, the methods are the ones of the compiled pattern, so there's no overhead.
+    """
+
+    __slots__ = (
+        "name",
+        "pattern",
+        "calls",
+        "match_time_ns",
+        "match",
+        "fullmatch",
+        "search",
+        "findall",
+        "sub",
+        "finditer",
+    )
+
+    def __init__(self, name: str, pattern: re.Pattern, stats_enabled: bool = False):
+        self.name = name
+        self.pattern = pattern
+        self.calls = 0
+        self.match_time_ns = 0
+        self.set_stats_enabled(stats_enabled)
+
+    def __repr__(self) -> str:
+        return f"<RegisteredPattern {self.name}: {self.pattern.pattern!r}>"
+
+    def set_stats_enabled(self, enabled: bool):
+        for method_name in ("match", "fullmatch", "search", "findall", "sub"):
+            method = getattr(self.pattern, method_name)
+            setattr(self, method_name, self.__timed(method) if enabled else method)
+        self.finditer = self.__timed_finditer if enabled else self.pattern.finditer
+
+    def __timed(self, method: Callable) -> Callable:
+        def timed_method(*args, **kwargs):
+            self.calls += 1
+            start_time = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.match_time_ns += time.perf_counter_ns() - start_time
+
+        return timed_method
+
+    def __timed_finditer(self, string: AnyStr, *args, **kwargs) -> Iterator[re.Match]:
+        self.calls += 1
+        matches = self.pattern.finditer(string, *args, **kwargs)
+        while True:
+            # Only the time spent finding the next match is measured, not the caller's loop body
+            start_time = time.perf_counter_ns()
+            match = next(matches, None)
+            self.match_time_ns += time.perf_counter_ns() - start_time
+            if match is None:
+                return
+            yield match
+
+
+class RegexRegistry:
+    """
+    Compiles patterns once at import time and keeps track of how they're used.
+    """
+
+    def __init__(self):
+        self._patterns: dict[str, RegisteredPattern] = {}
+        # Timing every call slows down the analysis, so stats are only collected once they're enabled
+        self.stats_enabled = False
+
+    def set_stats_enabled(self, enabled: bool):
+        """
+        Enables or disables the stats of all patterns, including those registered later.
+        """
+        self.stats_enabled = enabled
+        for registered_pattern in self._patterns.values():
+            registered_pattern.set_stats_enabled(enabled)
+
+    def compile(
+        self, name: str, pattern: AnyStr, flags: Union[int, re.RegexFlag] = 0
+    ) -> RegisteredPattern:
+        """
+        Compiles and registers a pattern. Registering a name again replaces the previous pattern.
+        """
+        registered_pattern = RegisteredPattern(
+            name, re.compile(pattern, flags), self.stats_enabled
+        )
+        self._patterns[name] = registered_pattern
+        return registered_pattern
+
+    def __getitem__(self, name: str) -> RegisteredPattern:
+        return self._patterns[name]
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def stats(self) -> list[PatternStats]:
+        """
+        Returns the usage of all registered patterns, sorted by their cumulative match time.
+        """
+        return sorted(
+            (
+                PatternStats(
+                    name,
+                    str(registered_pattern.pattern.pattern),
+                    registered_pattern.calls,
+                    registered_pattern.match_time_ns / 1e9,
+                )
+                for name, registered_pattern in self._patterns.items()
+            ),
+            key=lambda pattern_stats: pattern_stats.match_time,
+            reverse=True,
+        )
+
+    def collect(self) -> dict[str, tuple[int, int]]:
+        """
+        Returns and resets the calls and match time (in ns) of the patterns used since the last collection.
+        Used to transfer the stats of worker processes to the main process.
+        """
+        counters = {}
+        for name, registered_pattern in self._patterns.items():
+            if registered_pattern.calls > 0:
+                counters[name] = (
+                    registered_pattern.calls,
+                    registered_pattern.match_time_ns,
+                )
+                registered_pattern.calls = 0
+                registered_pattern.match_time_ns = 0
+        return counters
+
+    def merge(self, counters: dict[str, tuple[int, int]]):
+        for name, (calls, match_time_ns) in counters.items():
+            registered_pattern = self._patterns.get(name)
+            if registered_pattern is not None:
+                registered_pattern.calls += calls
+                registered_pattern.match_time_ns += match_time_ns
+
+    def reset(self):
+        for registered_pattern in self._patterns.values():
+            registered_pattern.calls = 0
+            registered_pattern.match_time_ns = 0
+
+
+regex_registry = RegexRegistry()
@@ -1,20 +1,116 @@
+import mmap
+import os
 import re
+from collections import Counter
 from enum import IntEnum, auto, EnumType
-from typing import Optional, Union
+from functools import cached_property
+from typing import Any, Iterable, Optional, Self, Union
 
 from robocop_ng.helpers.disabled_ids import is_build_id_valid
+from robocop_ng.helpers.regex_registry import regex_registry
+from robocop_ng.helpers.ryujinx_log_notes import NotePlan, default_note_plan
+from robocop_ng.helpers.ryujinx_log_errors import (
+    CommonError,
+    ErrorAggregator,
+    ErrorGroup,
+    common_error_matcher,
+    error_signature,
+    max_error_groups,
+)
+from robocop_ng.helpers.ryujinx_log_scanners import (
+    build_ids_regex,
+    contains_homebrew_marker,
+    max_block_lines,
+    max_filepaths,
+    scan_filepaths,
+    scan_last_build_ids,
+    scan_last_ro_section,
+)
+from robocop_ng.helpers.ryujinx_log_results import (
+    EmulatorInfo,
+    GameInfo,
+    HardwareInfo,
+    LogAnalysis,
+    SettingValue,
+    SettingsInfo,
+    anisotropic_values,
+    aspect_ratio_values,
+    intern_setting,
+    resolution_values,
+    unknown_value,
+)
+from robocop_ng.helpers.ryujinx_log_timeline import LogTimeline, format_timestamp
+from robocop_ng.helpers.ryujinx_log_tokenizer import (
+    LogEntry,
+    LogTokenizer,
+    parse_log_line,
+    tokenize_buffer,
+    tokenize_log,
+)
 from robocop_ng.helpers.size import Size
 
-
-class CommonError(IntEnum):
-    SHADER_CACHE_COLLISION = auto()
-    DUMP_HASH = auto()
-    SHADER_CACHE_CORRUPTION = auto()
-    UPDATE_KEYS = auto()
-    FILE_PERMISSIONS = auto()
-    FILE_NOT_FOUND = auto()
-    MISSING_SERVICES = auto()
-    VULKAN_OUT_OF_MEMORY = auto()
+sizes = "|".join(Size.names())
+ram_regex = regex_registry.compile(
+    "ram", rf"RAM: Total ([\d.]+) ({sizes}) ; Available ([\d.]+) ({sizes})"
+)
+mods_regex = regex_registry.compile(
+    "mods", r"Found\s(enabled|disabled)?\s?mod\s\'(.+?)\'\s(\[.+?\])"
+)
+cheat_regex = regex_registry.compile("cheat", r"Installing cheat\s'(.+)'")
+log_file_header_regex = regex_registry.compile(
+    "log_file_header", r"\d{2}:\d{2}:\d{2}\.\d{3}"
+)
+app_id_regex = regex_registry.compile("app_id", r".* \[([a-zA-Z0-9]*)\]")
+app_name_regex = regex_registry.compile(
+    "app_name",
+    r"Loader [A-Za-z]*: Application Loaded:\s([^;\n\r]*)",
+    re.MULTILINE,
+)
+mainline_version_regex = regex_registry.compile("mainline_version", r"^\d\.\d\.\d+$")
+canary_version_regex = regex_registry.compile("canary_version", r"^Canary \d\.\d\.\d+$")
+pr_version_regex = regex_registry.compile("pr_version", r"^\d\.\d\.\d\+([a-f]|\d){7}$")
+default_user_id = "UserId: 00000000000000010000000000000000"
+# Number of error groups listed in the embed and the length their messages are cut off at
+top_errors_count = 3
+max_top_error_length = 100
+# Periods without log entries which are reported as possible hangs, in milliseconds
+min_hang_duration = 30 * 1000
+# Shader entries less than a second apart from each other are reported as a compilation burst
+shader_burst_interval = 1000
+min_shader_burst_count = 20
+# The characters str.splitlines() splits on, the tokenizer never returns lines containing them
+line_boundaries = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+
+settings_map = {
+    "anisotropic_filtering": "MaxAnisotropy",
+    "aspect_ratio": "AspectRatio",
+    "audio_backend": "AudioBackend",
+    "backend_threading": "BackendThreading",
+    "docked": "EnableDockedMode",
+    "expand_ram": "ExpandRam",
+    "fs_integrity": "EnableFsIntegrityChecks",
+    "graphics_backend": "GraphicsBackend",
+    "ignore_missing_services": "IgnoreMissingServices",
+    "memory_manager": "MemoryManagerMode",
+    "pptc": "EnablePtc",
+    "resolution_scale": "ResScale",
+    "shader_cache": "EnableShaderCache",
+    "texture_recompression": "EnableTextureRecompression",
+    "vsync": "EnableVsync",
+    "hypervisor": "UseHypervisor",
+}
+
+# Fields which are reported as "Unknown" if they aren't part of the analysed text
+required_fields = (
+    "app_info",
+    "cpu",
+    "gpu",
+    "ram",
+    "os",
+    "ryu_version",
+    "ryu_firmware",
+    *settings_map.keys(),
+)
 
 
 class RyujinxVersion(IntEnum):
@@ -23,723 +119,860 @@ class RyujinxVersion(IntEnum):
     PR = auto()
     CUSTOM = auto()
 
+
+class LogValueChanges(dict[str, str]):
+    """
+    Maps each key of the LogValueChange entries in a log to the last value it was set to.
+    """
+
+    def add(self, entry: LogEntry):
+        if entry.method == "LogValueChange":
+            self[entry.message.partition(" ")[0]] = entry.line.split()[-1]
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[LogEntry]) -> Self:
+        log_values = cls()
+        for entry in entries:
+            log_values.add(entry)
+        return log_values
+
+    @classmethod
+    def from_log(cls, log_text: str) -> Self:
+        return cls.from_entries(tokenize_log(log_text))
+
+
+def parse_app_id(app_name: str) -> str:
+    app_id_match = app_id_regex.match(app_name)
+    if app_id_match:
+        return app_id_match.group(1).strip().upper()
+    return ""
+
+
+def parse_build_ids(lines: Iterable[str]) -> list[str]:
+    return [bid.strip().upper() for bid in lines if is_build_id_valid(bid.strip())]
+
+
+def parse_ro_section(lines: list[str]) -> Optional[dict[str, str]]:
+    if len(lines) == 0:
+        return None
+    ro_section = {"module": "", "sdk_libraries": []}
+    for line in lines:
+        line = line.strip()
+        if line.startswith("Module:"):
+            ro_section["module"] = line[8:]
+        elif line.startswith("SDK Libraries:"):
+            ro_section["sdk_libraries"].append(line[19:])
+        elif line.startswith("SDK "):
+            ro_section["sdk_libraries"].append(line[4:])
+        else:
+            break
+    return ro_section
+
+
+class ParsedLog:
+    """
+    A downloaded log file, which computes its expensive extractions lazily and at most once.
+    """
+
+    raw_text: str
+
+    def __init__(self, log_text: Union[str, list[str]]):
+        if isinstance(log_text, str):
+            self.raw_text = log_text.replace("\r\n", "\n")
+        elif isinstance(log_text, list):
+            self.raw_text = "\n".join(log_text)
+        else:
+            raise TypeError(log_text)
+
+    @cached_property
+    def body(self) -> Optional[str]:
+        # Large files show a header value when not downloaded completely
+        # this makes sure that the log text to read starts from the first timestamp, ignoring headers
+        log_file_match = log_file_header_regex.search(self.raw_text)
+        if log_file_match is None:
+            return None
+        return self.raw_text[log_file_match.start() :]
+
+    @property
+    def text(self) -> str:
+        return self.body if self.body is not None else self.raw_text
+
+    @cached_property
+    def is_homebrew(self) -> bool:
+        return contains_homebrew_marker(self.text)
+
+    @cached_property
+    def filepaths(self) -> set[str]:
+        return set(scan_filepaths(self.text))
+
+    @cached_property
+    def app_name(self) -> Optional[str]:
+        game_name_match = app_name_regex.findall(self.text)
+        if game_name_match:
+            return game_name_match[-1].rstrip()
+        return None
+
+    @cached_property
+    def app_id(self) -> Optional[str]:
+        if self.app_name is None:
+            return None
+        return parse_app_id(self.app_name)
+
+    @cached_property
+    def build_ids(self) -> Optional[tuple[Optional[str], Optional[list[str]]]]:
+        """
+        Returns the app id of the last "Build ids found" block and its valid build ids.
+        """
+        bids_block = scan_last_build_ids(self.text)
+        if bids_block is None:
+            return None
+        app_id_from_bids, bids_lines = bids_block
+        return app_id_from_bids.strip().upper(), parse_build_ids(bids_lines)
+
+    @cached_property
+    def main_ro_section(self) -> Optional[dict[str, str]]:
+        ro_section_lines = scan_last_ro_section(self.text)
+        if ro_section_lines is None:
+            return None
+        return parse_ro_section(ro_section_lines)
+
+    @cached_property
+    def app_info(
+        self,
+    ) -> Optional[tuple[str, str, str, list[str], dict[str, str]]]:
+        if self.app_name is None or self.build_ids is None:
+            return None
+        app_id_from_bids, build_ids = self.build_ids
+        return (
+            self.app_name,
+            self.app_id,
+            app_id_from_bids,
+            build_ids,
+            self.main_ro_section,
+        )
+
+
 class LogAnalyser:
-    _log_text: str
-    _log_errors: list[list[str]]
-    _hardware_info: dict[str, Optional[str]]
-    _emu_info: dict[str, Optional[str]]
-    _game_info: dict[str, Optional[str]]
-    _settings: dict[str, Optional[str]]
-    _notes: Union[set[str], list[str]]
+    _parsed_log: Optional["ParsedLog"]
+    _log_text: Optional[str]
+    # Errors are stored as (start, end) offsets into _log_text if the text is kept, as lines otherwise
+    _error_groups: ErrorAggregator
+    _last_error: Optional[Union[tuple[int, int], list[str]]]
+    _game_name: str
+    _mod_messages: list[str]
+    _note_plan: NotePlan
+    _log_values: LogValueChanges
+    _controllers: list[str]
+    _timeline: LogTimeline
+    _is_default_user_profile: bool
 
     @staticmethod
     def is_homebrew(log_file: str) -> bool:
-        return (
-            re.search("Load.*Application: Loading as [Hh]omebrew", log_file) is not None
-        )
+        return ParsedLog(log_file).is_homebrew
 
     @staticmethod
     def get_filepaths(log_file: str) -> set[str]:
-        return set(
-            x.rstrip("\u0000")
-            for x in re.findall(r"(?:[A-Za-z]:)?(?:[\\/]+[^\\/:\"\r\n]+)+", log_file)
-        )
+        return ParsedLog(log_file).filepaths
 
     @staticmethod
     def get_main_ro_section(log_file: str) -> Optional[dict[str, str]]:
-        ro_section_matches = re.findall(
-            r"PrintRoSectionInfo: main:[\r\n]((?:\s+.*[\r\n])*)", log_file
-        )
-        if ro_section_matches and len(ro_section_matches) > 0:
-            ro_section_match: str = ro_section_matches[-1]
-            ro_section = {"module": "", "sdk_libraries": []}
-            if ro_section_match is None or len(ro_section_match) == 0:
-                return None
-            for line in ro_section_match.splitlines():
-                line = line.strip()
-                if line.startswith("Module:"):
-                    ro_section["module"] = line[8:]
-                elif line.startswith("SDK Libraries:"):
-                    ro_section["sdk_libraries"].append(line[19:])
-                elif line.startswith("SDK "):
-                    ro_section["sdk_libraries"].append(line[4:])
-                else:
-                    break
-            return ro_section
-        return None
+        return ParsedLog(log_file).main_ro_section
 
     @staticmethod
     def get_app_info(
         log_file: str,
     ) -> Optional[tuple[str, str, str, list[str], dict[str, str]]]:
-        game_name_match = re.findall(
-            r"Loader [A-Za-z]*: Application Loaded:\s([^;\n\r]*)",
-            log_file,
-            re.MULTILINE,
-        )
-        if game_name_match:
-            game_name = game_name_match[-1].rstrip()
-            app_id_match = re.match(r".* \[([a-zA-Z0-9]*)\]", game_name)
-            if app_id_match:
-                app_id = app_id_match.group(1).strip().upper()
-            else:
-                app_id = ""
-            bids_match_all = re.findall(
-                r"Build ids found for (?:title|application) ([a-zA-Z0-9]*):[\n\r]*((?:\s+.*[\n\r]+)+)",
-                log_file,
-            )
-            if bids_match_all and len(bids_match_all) > 0:
-                bids_match: tuple[str] = bids_match_all[-1]
-                app_id_from_bids = None
-                build_ids = None
-                if bids_match[0] is not None:
-                    app_id_from_bids = bids_match[0].strip().upper()
-                if bids_match[1] is not None:
-                    build_ids = [
-                        bid.strip().upper()
-                        for bid in bids_match[1].splitlines()
-                        if is_build_id_valid(bid.strip())
-                    ]
-
-                return (
-                    game_name,
-                    app_id,
-                    app_id_from_bids,
-                    build_ids,
-                    LogAnalyser.get_main_ro_section(log_file),
-                )
-        return None
+        return ParsedLog(log_file).app_info
 
-    @staticmethod
-    def contains_errors(search_terms, errors):
-        for term in search_terms:
-            for error_lines in errors:
-                line = "\n".join(error_lines)
-                if term in line:
-                    return True
-        return False
-
-    def __init__(self, log_text: Union[str, list[str]]):
+    def __init__(
+        self,
+        log_text: Union[str, list[str], "ParsedLog"],
+        note_plan: NotePlan = default_note_plan,
+    ):
         self.__init_members()
+        self._note_plan = note_plan
 
-        if isinstance(log_text, str):
-            self._log_text = log_text.replace("\r\n", "\n")
-        elif isinstance(log_text, list):
-            self._log_text = "\n".join(log_text)
+        if isinstance(log_text, ParsedLog):
+            self._parsed_log = log_text
         else:
-            raise TypeError(log_text)
+            self._parsed_log = ParsedLog(log_text)
 
-        # Large files show a header value when not downloaded completely
-        # this regex makes sure that the log text to read starts from the first timestamp, ignoring headers
-        log_file_header_regex = re.compile(r"\d{2}:\d{2}:\d{2}\.\d{3}.*", re.DOTALL)
-        log_file_match = re.search(log_file_header_regex, self._log_text)
-        if log_file_match and log_file_match.group(0) is not None:
-            self._log_text = log_file_match.group(0)
-        else:
+        if self._parsed_log.body is None:
             raise ValueError("No log entries found.")
-
-        self.__get_errors()
-        self.__get_hardware_info()
-        self.__get_settings_info()
-        self.__get_ryujinx_info()
-        self.__get_app_name()
-        self.__get_mods()
-        self.__get_cheats()
-        self.__get_notes()
+        self._log_text = self._parsed_log.body
+
+        for entry in tokenize_log(self._log_text):
+            self.__parse_entry(entry)
+        self.__finish()
+
+    @classmethod
+    def incremental(
+        cls,
+        max_error_groups: Optional[int] = max_error_groups,
+        note_plan: NotePlan = default_note_plan,
+    ) -> Self:
+        """
+        Creates an analyser for logs which are passed in chunks to feed() and completed by finish().
+
+        The log text itself isn't kept: app info and file paths are collected from the entries
+        and the lines of the first block of each error group are retained.
+        At most max_error_groups groups are kept, or all of them if max_error_groups is None.
+        """
+        analyser = cls.__new__(cls)
+        analyser.__init_members()
+        analyser._note_plan = note_plan
+        analyser._parsed_log = None
+        analyser._log_text = None
+        analyser._tokenizer = LogTokenizer()
+        analyser._error_groups = ErrorAggregator(max_error_groups)
+        return analyser
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        max_error_groups: Optional[int] = max_error_groups,
+        note_plan: NotePlan = default_note_plan,
+    ) -> Self:
+        """
+        Analyses a log file through a memory map, so the file is never read or decoded as a whole.
+        Lines are decoded one at a time, memory use only depends on the longest line and the retained errors.
+        """
+        analyser = cls.incremental(max_error_groups, note_plan)
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                raise ValueError("No log entries found.")
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                analyser.feed_entries(tokenize_buffer(mapped_file))
+        analyser.__finish()
+        return analyser
+
+    def feed(self, log_text: str):
+        self.feed_entries(self._tokenizer.feed(log_text))
+
+    def feed_entries(self, entries: Iterable[LogEntry]):
+        for entry in entries:
+            self.__parse_entry(entry)
+
+    def finish(self):
+        for entry in self._tokenizer.close():
+            self.__parse_entry(entry)
+        self.__finish()
 
     def __init_members(self):
-        self._hardware_info = {
-            "cpu": "Unknown",
-            "gpu": "Unknown",
-            "ram": "Unknown",
-            "os": "Unknown",
+        self._game_name = unknown_value
+        self._error_groups = ErrorAggregator()
+        self._last_error = None
+        self._common_error_counts = Counter()
+        self._log_values = LogValueChanges()
+        self._controllers = []
+        self._timeline = LogTimeline()
+        self._is_default_user_profile = False
+        self._found_values = {}
+        self._pending_cheat = None
+        self._mod_messages = []
+        self._cheats = []
+        self._app_name = None
+        self._build_ids = None
+        self._main_ro_section = None
+        self._filepaths = {}
+        self._is_homebrew = False
+        self._error_search_start = 0
+
+    def __parse_entry(self, entry: LogEntry):
+        first_values = {
+            "cpu": "CPU: ",
+            "os": "Operating System: ",
+            "logs_enabled": "Logs Enabled: ",
         }
-        self._emu_info = {
-            "ryu_version": "Unknown",
-            "ryu_firmware": "Unknown",
-            "logs_enabled": None,
-        }
-        self._game_info = {
-            "game_name": "Unknown",
-            "errors": "No errors found in log",
-            "mods": "No mods found",
-            "cheats": "No cheats found",
-        }
-        self._settings = {
-            "audio_backend": "Unknown",
-            "backend_threading": "Unknown",
-            "docked": "Unknown",
-            "expand_ram": "Unknown",
-            "fs_integrity": "Unknown",
-            "graphics_backend": "Unknown",
-            "ignore_missing_services": "Unknown",
-            "memory_manager": "Unknown",
-            "pptc": "Unknown",
-            "shader_cache": "Unknown",
-            "vsync": "Unknown",
-            "hypervisor": "Unknown",
-            "resolution_scale": "Unknown",
-            "anisotropic_filtering": "Unknown",
-            "aspect_ratio": "Unknown",
-            "texture_recompression": "Unknown",
-        }
-        self._notes = set()
-        self._log_errors = []
-
-    def __get_errors(self):
-        errors = []
-        curr_error_lines = []
-        error_line = False
-        for line in self._log_text.splitlines():
-            if len(line.strip()) == 0:
-                continue
-            if "|E|" in line:
-                curr_error_lines = [line]
-                errors.append(curr_error_lines)
-                error_line = True
-            elif error_line and line[0] == " ":
-                curr_error_lines.append(line)
-        if len(curr_error_lines) > 0:
-            errors.append(curr_error_lines)
-
-        self._log_errors = errors
-
-    def __get_hardware_info(self):
-        for setting in self._hardware_info.keys():
-            match setting:
-                case "cpu":
-                    cpu_match = re.search(
-                        r"CPU:\s([^;\n\r]*)", self._log_text, re.MULTILINE
-                    )
-                    if cpu_match is not None and cpu_match.group(1) is not None:
-                        self._hardware_info[setting] = cpu_match.group(1).rstrip()
-
-                case "ram":
-                    sizes = "|".join(Size.names())
-                    ram_match = re.search(
-                        rf"RAM: Total ([\d.]+) ({sizes}) ; Available ([\d.]+) ({sizes})",
-                        self._log_text,
-                        re.MULTILINE,
-                    )
-                    if ram_match is not None:
-                        try:
-                            dest_unit = Size.MiB
-
-                            ram_available = float(ram_match.group(3))
-                            ram_available = Size.from_name(ram_match.group(4)).convert(
-                                ram_available, dest_unit
-                            )
-
-                            ram_total = float(ram_match.group(1))
-                            ram_total = Size.from_name(ram_match.group(2)).convert(
-                                ram_total, dest_unit
-                            )
-
-                            self._hardware_info[setting] = (
-                                f"{ram_available:.0f}/{ram_total:.0f} {dest_unit.name}"
-                            )
-                        except ValueError:
-                            # ram_match.group(1) or ram_match.group(3) couldn't be parsed as a float.
-                            self._hardware_info[setting] = "Error"
-
-                case "os":
-                    os_match = re.search(
-                        r"Operating System:\s([^;\n\r]*)",
-                        self._log_text,
-                        re.MULTILINE,
-                    )
-                    if os_match is not None and os_match.group(1) is not None:
-                        self._hardware_info[setting] = os_match.group(1).rstrip()
-
-                case "gpu":
-                    gpu_match = re.search(
-                        r"PrintGpuInformation:\s([^;\n\r]*)",
-                        self._log_text,
-                        re.MULTILINE,
-                    )
-                    if gpu_match is not None and gpu_match.group(1) is not None:
-                        self._hardware_info[setting] = gpu_match.group(1).rstrip()
-
-                case _:
-                    raise NotImplementedError(setting)
-
-    def __get_ryujinx_info(self):
-        for setting in self._emu_info.keys():
-            match setting:
-                case "ryu_version":
-                    for line in self._log_text.splitlines():
-                        if "Ryujinx Version:" in line:
-                            self._emu_info[setting] = line.split()[-1].strip()
-                            break
-                        if "Ryujinx Canary Version:" in line:
-                            self._emu_info[setting] = "Canary " + line.split()[-1].strip()
-                            break
-
-                case "logs_enabled":
-                    logs_match = re.search(
-                        r"Logs Enabled:\s([^;\n\r]*)", self._log_text, re.MULTILINE
-                    )
-                    if logs_match is not None and logs_match.group(1) is not None:
-                        self._emu_info[setting] = logs_match.group(1).rstrip()
+        found_values = self._found_values
+        message = entry.message
+        self._timeline.add(entry)
+
+        if self._pending_cheat is not None:
+            # Make sure to skip cheats which fail to compile
+            if not (
+                entry.is_error
+                and entry.source == "TamperMachine"
+                and entry.method == "Compile"
+            ):
+                self._cheats.append(self._pending_cheat)
+            self._pending_cheat = None
+
+        if entry.is_error:
+            error_lines = entry.error_lines()
+            if self._log_text is not None:
+                self._last_error = self.__find_error_span(entry)
+            else:
+                self._last_error = error_lines[:max_block_lines]
+            self._error_groups.add(
+                error_signature(
+                    f"{entry.source} {entry.method}: {message}", error_lines[1:]
+                ),
+                entry.timestamp,
+                self._last_error,
+            )
+            self._common_error_counts.update(common_error_matcher.match(error_lines))
 
-                case "ryu_firmware":
-                    for line in self._log_text.splitlines():
-                        if "Firmware Version:" in line:
-                            self._emu_info[setting] = line.split()[-1].strip()
-                            break
+        if self._parsed_log is None:
+            self.__collect_app_info(entry)
 
-                case _:
-                    raise NotImplementedError(setting)
+        if entry.method == "LogValueChange":
+            self._log_values.add(entry)
+            return
 
-    def __get_setting_value(self, name, key):
-        values = [
-            line.split()[-1]
-            for line in self._log_text.splitlines()
-            if re.search(rf"LogValueChange: ({key})\s", line)
-        ]
-        if len(values) > 0:
-            value = values[-1]
-        else:
-            return None
+        for name, marker in first_values.items():
+            if name not in found_values and marker in message:
+                value = message.split(marker, maxsplit=1)[1]
+                found_values[name] = value.split(";", maxsplit=1)[0].rstrip()
 
-        match name:
-            case "docked":
-                return "Docked" if value == "True" else "Handheld"
+        if "ram" not in found_values and "RAM: " in message:
+            ram_match = ram_regex.search(message)
+            if ram_match is not None:
+                found_values["ram"] = ram_match
 
-            case "resolution_scale":
-                resolution_map = {
-                    "-1": "Custom",
-                    "1": "Native (720p/1080p)",
-                    "2": "2x (1440p/2160p)",
-                    "3": "3x (2160p/3240p)",
-                    "4": "4x (2880p/4320p)",
-                }
-                if value in resolution_map.keys():
-                    return resolution_map[value]
-                else:
-                    return "Custom"
+        if "ryu_version" not in found_values:
+            if "Ryujinx Version:" in message:
+                found_values["ryu_version"] = entry.line.split()[-1].strip()
+            elif "Ryujinx Canary Version:" in message:
+                found_values["ryu_version"] = "Canary " + entry.line.split()[-1].strip()
 
-            case "anisotropic_filtering":
-                anisotropic_map = {
-                    "-1": "Auto",
-                    "2": "2x",
-                    "4": "4x",
-                    "8": "8x",
-                    "16": "16x",
-                }
-                if value in anisotropic_map.keys():
-                    return anisotropic_map[value]
-                else:
-                    return "Auto"
+        if "ryu_firmware" not in found_values and "Firmware Version:" in message:
+            found_values["ryu_firmware"] = entry.line.split()[-1].strip()
 
-            case "aspect_ratio":
-                aspect_map = {
-                    "Fixed4x3": "4:3",
-                    "Fixed16x9": "16:9",
-                    "Fixed16x10": "16:10",
-                    "Fixed21x9": "21:9",
-                    "Fixed32x9": "32:9",
-                    "Stretched": "Stretch to Fit Window",
-                }
-                if value in aspect_map.keys():
-                    return aspect_map[value]
-                else:
-                    return "Unknown"
+        if "gpu" not in found_values and entry.method == "PrintGpuInformation":
+            found_values["gpu"] = message.split(";", maxsplit=1)[0].rstrip()
 
-            case "pptc" | "shader_cache" | "texture_recompression" | "vsync":
-                return "Enabled" if value == "True" else "Disabled"
+        if entry.source == "Loader" and message.startswith("Application Loaded:"):
+            app_name = message[len("Application Loaded:") :].split(";")[0]
+            self._game_name = app_name.strip()
 
-            case "hypervisor":
-                if "mac" in self._hardware_info["os"]:
-                    return "Enabled" if value == "True" else "Disabled"
-                else:
-                    return "N/A"
-            case _:
-                return value
-
-    def __get_settings_info(self):
-        settings_map = {
-            "anisotropic_filtering": "MaxAnisotropy",
-            "aspect_ratio": "AspectRatio",
-            "audio_backend": "AudioBackend",
-            "backend_threading": "BackendThreading",
-            "docked": "EnableDockedMode",
-            "expand_ram": "ExpandRam",
-            "fs_integrity": "EnableFsIntegrityChecks",
-            "graphics_backend": "GraphicsBackend",
-            "ignore_missing_services": "IgnoreMissingServices",
-            "memory_manager": "MemoryManagerMode",
-            "pptc": "EnablePtc",
-            "resolution_scale": "ResScale",
-            "shader_cache": "EnableShaderCache",
-            "texture_recompression": "EnableTextureRecompression",
-            "vsync": "EnableVsync",
-            "hypervisor": "UseHypervisor",
-        }
-
-        for key in self._settings.keys():
-            if key in settings_map:
-                self._settings[key] = self.__get_setting_value(key, settings_map[key])
-            else:
-                raise NotImplementedError(key)
-
-    def __get_mods(self):
-        mods_regex = re.compile(
-            r"Found\s(enabled|disabled)?\s?mod\s\'(.+?)\'\s(\[.+?\])"
-        )
-        matches = re.findall(mods_regex, self._log_text)
-        if matches:
-            mods = [
-                {"mod": match[1], "status": match[0], "type": match[2]}
-                for match in matches
-            ]
-            mods_status = [
-                f"ℹ️ {i['mod']} ({'ExeFS' if i['type'] == '[E]' else 'RomFS'})"
-                for i in mods
-                if i["status"] == "" or i["status"] == "enabled"
-            ]
-            # Remove duplicated mods from output
-            mods_status = list(dict.fromkeys(mods_status))
-
-            self._game_info["mods"] = "\n".join(mods_status)
-
-    def __get_cheats(self):
-        # Make sure to skip cheats which fail to compile
-        cheat_regex = re.compile(
-            r"Installing cheat\s'(.+)'(?!\s\d{2}:\d{2}:\d{2}\.\d{3}\s\|E\|\sTamperMachine\sCompile)"
-        )
-        matches = re.findall(cheat_regex, self._log_text)
-        if matches:
-            cheats = [f"ℹ️ {match}" for match in matches]
+        elif "mod '" in message:
+            # Parsed once the mods are requested
+            self._mod_messages.append(message)
 
-            self._game_info["cheats"] = "\n".join(cheats)
+        elif "Installing cheat '" in message:
+            cheat_match = cheat_regex.search(message)
+            if cheat_match is not None:
+                self._pending_cheat = cheat_match.group(1)
 
-    def __get_app_name(self):
-        app_match = re.findall(
-            r"Loader [A-Za-z]*: Application Loaded:\s([^;\n\r]*)",
-            self._log_text,
-            re.MULTILINE,
-        )
-        if app_match:
-            self._game_info["game_name"] = app_match[-1].rstrip()
-
-    def __get_controller_notes(self):
-        controllers_regex = re.compile(r"Hid Configure: ([^\r\n]+)")
-        controllers = re.findall(controllers_regex, self._log_text)
-        if controllers:
-            input_status = [f"ℹ {match}" for match in controllers]
-            # Hid Configure lines can appear multiple times, so converting to dict keys removes duplicate entries,
-            # also maintains the list order
-            input_status = list(dict.fromkeys(input_status))
-            self._notes.add("\n".join(input_status))
-        # If emulator crashes on startup without game load, there is no need to show controller notification at all
-        elif self._game_info["game_name"] != "Unknown":
-            self._notes.add("⚠️ No controller information found")
+        elif entry.source == "Hid" and entry.method == "Configure":
+            self._controllers.append(message)
 
-    def __get_os_notes(self):
-        if (
-            "Windows" in self._hardware_info["os"]
-            and self._settings["graphics_backend"] != "Vulkan"
+        if not self._is_default_user_profile and (
+            default_user_id in entry.line
+            or any(default_user_id in line for line in entry.continuation)
         ):
-            if "Intel" in self._hardware_info["gpu"]:
-                self._notes.add(
-                    "**⚠️ Intel iGPU users should consider using Vulkan graphics backend**"
+            self._is_default_user_profile = True
+
+    def __collect_app_info(self, entry: LogEntry):
+        # Used instead of ParsedLog when the log text isn't kept around
+        message = entry.message
+        if entry.source == "Loader" and message.startswith("Application Loaded:"):
+            app_name = message[len("Application Loaded:") :].split(";")[0]
+            self._app_name = app_name.strip()
+        elif "Build ids found for " in message:
+            bids_match = build_ids_regex.search(message)
+            if bids_match is not None and len(entry.continuation) > 0:
+                self._build_ids = (
+                    bids_match.group(1).strip().upper(),
+                    parse_build_ids(entry.continuation[:max_block_lines]),
                 )
-            if "AMD" in self._hardware_info["gpu"]:
-                self._notes.add(
-                    "**⚠️ AMD GPU users should consider using Vulkan graphics backend**"
+        elif entry.method == "PrintRoSectionInfo" and message.startswith("main:"):
+            self._main_ro_section = parse_ro_section(
+                entry.continuation[:max_block_lines]
+            )
+
+        if not self._is_homebrew and "Loading as " in message:
+            self._is_homebrew = contains_homebrew_marker(entry.line)
+
+        for line in [entry.line, *entry.continuation]:
+            if len(self._filepaths) >= max_filepaths:
+                break
+            if "/" in line or "\\" in line:
+                self._filepaths.update(
+                    scan_filepaths(line, max_filepaths - len(self._filepaths))
                 )
 
-        if "macOS" in self._hardware_info["os"] and "Intel" in self._hardware_info["cpu"]:
-            self._notes.add("**⚠️ Intel Macs are not supported.**")
+    def __find_error_span(self, entry: LogEntry) -> tuple[int, int]:
+        # Entries are parsed in order, so the search continues after the previous error
+        log_text = self._log_text
+        start = log_text.find(entry.line, self._error_search_start)
+        while start > 0 and log_text[start - 1] not in line_boundaries:
+            start = log_text.find(entry.line, start + 1)
+        end = start + len(entry.line)
+        for line in entry.continuation:
+            end = log_text.find(line, end) + len(line)
+        self._error_search_start = end
+        return start, end
+
+    def __get_error_lines(
+        self,
+        error: Union[tuple[int, int], list[str]],
+        max_lines: Optional[int] = None,
+    ) -> list[str]:
+        if isinstance(error, list):
+            return error[:max_lines]
+        start, end = error
+        lines = self._log_text[start:end].splitlines()
+        error_lines = [lines[0]]
+        for line in lines[1:]:
+            if max_lines is not None and len(error_lines) >= max_lines:
+                break
+            if len(line.strip()) > 0 and line[0] == " ":
+                error_lines.append(line)
+        return error_lines
+
+    def __finish(self):
+        if len(self._timeline) == 0:
+            raise ValueError("No log entries found.")
 
-    def __get_cpu_notes(self):
-        if "VirtualApple" in self._hardware_info["cpu"]:
-            self._notes.add("🔴 **Rosetta should be disabled**")
+        if self._pending_cheat is not None:
+            self._cheats.append(self._pending_cheat)
+            self._pending_cheat = None
+
+    @cached_property
+    def hardware_info(self) -> HardwareInfo:
+        hardware_info = HardwareInfo()
+        for name in ("cpu", "gpu", "os"):
+            if name in self._found_values:
+                setattr(hardware_info, name, self._found_values[name])
+        if "ram" in self._found_values:
+            hardware_info.ram = self.__get_ram_info(self._found_values["ram"])
+        return hardware_info
+
+    @cached_property
+    def emu_info(self) -> EmulatorInfo:
+        emu_info = EmulatorInfo()
+        for name in ("ryu_version", "ryu_firmware", "logs_enabled"):
+            if name in self._found_values:
+                setattr(emu_info, name, self._found_values[name])
+        return emu_info
+
+    @cached_property
+    def settings(self) -> SettingsInfo:
+        settings = SettingsInfo()
+        for name, key in settings_map.items():
+            setattr(settings, name, self.__get_setting_value(name, key))
+        return settings
+
+    @cached_property
+    def mods(self) -> Optional[list[tuple[str, bool]]]:
+        """
+        Returns the names of the enabled mods without duplicates and whether they are ExeFS mods,
+        or None if the log doesn't contain any mods.
+        """
+        if len(self._mod_messages) == 0:
+            return None
+        mods = {}
+        found_mods = False
+        for message in self._mod_messages:
+            for status, mod, mod_type in mods_regex.findall(message):
+                found_mods = True
+                if status == "" or status == "enabled":
+                    mods[(mod, mod_type == "[E]")] = None
+        return list(mods.keys()) if found_mods else None
+
+    def get_mods(self, limit: Optional[int] = None) -> str:
+        """
+        Returns the enabled mods, only the first limit mods are listed if limit is set.
+        """
+        if self.mods is None:
+            return "No mods found"
+        mods_status = [
+            f"ℹ️ {mod} ({'ExeFS' if is_exefs else 'RomFS'})"
+            for mod, is_exefs in self.mods[:limit]
+        ]
+        if limit is not None and len(self.mods) > limit:
+            mods_status.append(f"✂️ {len(self.mods) - limit} other mods")
+        return "\n".join(mods_status)
+
+    def get_cheats(self, limit: Optional[int] = None) -> str:
+        """
+        Returns the installed cheats, only the first limit cheats are listed if limit is set.
+        """
+        if len(self._cheats) == 0:
+            return "No cheats found"
+        cheats_status = [f"ℹ️ {cheat}" for cheat in self._cheats[:limit]]
+        if limit is not None and len(self._cheats) > limit:
+            cheats_status.append(f"✂️ {len(self._cheats) - limit} other cheats")
+        return "\n".join(cheats_status)
+
+    def get_errors_field(self) -> str:
+        last_error = self.get_last_error(max_lines=2)
+        if last_error is None:
+            return "No errors found in log"
+        last_error = "\n".join(last_error)
+        return f"```\n{last_error}\n```"
+
+    def get_top_errors_field(self) -> Optional[str]:
+        # A single error is already shown as the latest error
+        if self._error_groups.total_count <= 1:
+            return None
+        return self.__format_top_errors(top_errors_count)
+
+    def get_game_info(self, limit: Optional[int] = None) -> GameInfo:
+        """
+        Returns the game info without notes and top errors,
+        mods and cheats are limited to limit entries if limit is set.
+        """
+        return GameInfo(
+            game_name=self._game_name,
+            errors=self.get_errors_field(),
+            mods=self.get_mods(limit),
+            cheats=self.get_cheats(limit),
+        )
 
-    def __get_log_notes(self):
-        default_logs = ["Info", "Warning", "Error", "Guest"]
-        user_logs = []
-        if self._emu_info["logs_enabled"] is not None:
-            user_logs = (
-                self._emu_info["logs_enabled"].rstrip().replace(" ", "").split(",")
-            )
+    def get_missing_fields(self, fields: Iterable[str]) -> list[str]:
+        """
+        Returns the given fields which haven't been found yet.
+        "app_info" is resolved once both the application name and its build ids have been found,
+        settings are resolved once their LogValueChange entry has been found.
+        """
+        missing_fields = []
+        for field in fields:
+            if field == "app_info":
+                is_resolved = self.get_log_app_info() is not None
+            elif field in settings_map:
+                is_resolved = settings_map[field] in self._log_values
+            else:
+                is_resolved = field in self._found_values
+            if not is_resolved:
+                missing_fields.append(field)
+        return missing_fields
 
-        if "Debug" in user_logs:
-            self._notes.add(
-                "⚠️ **Debug logs enabled will have a negative impact on performance**"
-            )
+    def get_log_app_info(
+        self,
+    ) -> Optional[tuple[str, str, str, list[str], dict[str, str]]]:
+        if self._parsed_log is not None:
+            return self._parsed_log.app_info
+        if self._app_name is None or self._build_ids is None:
+            return None
+        app_id_from_bids, build_ids = self._build_ids
+        return (
+            self._app_name,
+            parse_app_id(self._app_name),
+            app_id_from_bids,
+            build_ids,
+            self._main_ro_section,
+        )
 
-        disabled_logs = set(default_logs).difference(set(user_logs))
-        if disabled_logs:
-            logs_status = [f"⚠️ {log} log is not enabled" for log in disabled_logs]
-            log_string = "\n".join(logs_status)
-        else:
-            log_string = "✅ Default logs enabled"
+    def get_log_filepaths(self) -> list[str]:
+        if self._parsed_log is not None:
+            return list(self._parsed_log.filepaths)
+        return list(self._filepaths.keys())
 
-        self._notes.add(log_string)
+    def is_log_homebrew(self) -> bool:
+        if self._parsed_log is not None:
+            return self._parsed_log.is_homebrew
+        return self._is_homebrew
 
-    def __get_settings_notes(self):
-        if self._settings["audio_backend"] == "Dummy":
-            self._notes.add(
-                "⚠️ Dummy audio backend, consider changing to SDL2 or OpenAL"
+    @staticmethod
+    def __get_ram_info(ram_match: re.Match) -> str:
+        try:
+            dest_unit = Size.MiB
+
+            ram_available = float(ram_match.group(3))
+            ram_available = Size.from_name(ram_match.group(4)).convert(
+                ram_available, dest_unit
             )
 
-        if self._settings["pptc"] == "Disabled":
-            self._notes.add("🔴 **PPTC cache should be enabled**")
+            ram_total = float(ram_match.group(1))
+            ram_total = Size.from_name(ram_match.group(2)).convert(ram_total, dest_unit)
 
-        if self._settings["shader_cache"] == "Disabled":
-            self._notes.add("🔴 **Shader cache should be enabled**")
+            return f"{ram_available:.0f}/{ram_total:.0f} {dest_unit.name}"
+        except ValueError:
+            # ram_match.group(1) or ram_match.group(3) couldn't be parsed as a float.
+            return "Error"
 
-        if self._settings["expand_ram"] == "True":
-            self._notes.add(
-                "⚠️ `Use alternative memory layout` should only be enabled for 4K mods"
-            )
+    def __get_setting_value(self, name, key):
+        value = self._log_values.get(key)
+        if value is None:
+            return None
 
-        if self._settings["memory_manager"] == "SoftwarePageTable":
-            self._notes.add(
-                "🔴 **`Software` setting in Memory Manager Mode will give slower performance than the default setting of `Host unchecked`**"
-            )
+        match name:
+            case "docked":
+                return SettingValue.DOCKED if value == "True" else SettingValue.HANDHELD
 
-        if self._settings["ignore_missing_services"] == "True":
-            self._notes.add(
-                "⚠️ `Ignore Missing Services` being enabled can cause instability"
-            )
+            case "resolution_scale":
+                return resolution_values.get(value, SettingValue.CUSTOM)
 
-        if self._settings["vsync"] == "Disabled":
-            self._notes.add(
-                "⚠️ V-Sync disabled can cause instability like games running faster than intended or longer load times"
-            )
+            case "anisotropic_filtering":
+                return anisotropic_values.get(value, SettingValue.AUTO)
 
-        if self._settings["fs_integrity"] == "Disabled":
-            self._notes.add(
-                "⚠️ Disabling file integrity checks may cause corrupted dumps to not be detected"
-            )
+            case "aspect_ratio":
+                return aspect_ratio_values.get(value, SettingValue.UNKNOWN)
 
-        if self._settings["backend_threading"] == "Off":
-            self._notes.add(
-                "🔴 **Graphics Backend Multithreading should be set to `Auto`**"
-            )
+            case "pptc" | "shader_cache" | "texture_recompression" | "vsync":
+                return (
+                    SettingValue.ENABLED if value == "True" else SettingValue.DISABLED
+                )
+
+            case "hypervisor":
+                if "mac" in self.hardware_info.os:
+                    return (
+                        SettingValue.ENABLED
+                        if value == "True"
+                        else SettingValue.DISABLED
+                    )
+                else:
+                    return SettingValue.NOT_AVAILABLE
+            case _:
+                return intern_setting(value)
+
+    def __get_controller_notes(self, notes: set[str]):
+        if self._controllers:
+            input_status = [f"ℹ {controller}" for controller in self._controllers]
+            # Hid Configure lines can appear multiple times, so converting to dict keys removes duplicate entries,
+            # also maintains the list order
+            input_status = list(dict.fromkeys(input_status))
+            notes.add("\n".join(input_status))
+        # If emulator crashes on startup without game load, there is no need to show controller notification at all
+        elif self._game_name != unknown_value:
+            notes.add("⚠️ No controller information found")
 
-    def __sort_notes(self):
+    @staticmethod
+    def __sort_notes(notes: Iterable[str]) -> list[str]:
         def severity(log_note_string):
             symbols = ["❌", "🔴", "⚠️", "ℹ", "✅"]
             return next(
                 i for i, symbol in enumerate(symbols) if symbol in log_note_string
             )
 
-        game_notes = [note for note in self._notes]
+        game_notes = list(notes)
         # Warnings split on the string after the warning symbol for alphabetical ordering
         # Severity key then orders alphabetically sorted warnings to show most severe first
         return sorted(sorted(game_notes, key=lambda x: x.split()[1]), key=severity)
 
-    def __get_notes(self):
-        for common_error in self.get_common_errors():
-            match common_error:
-                case CommonError.SHADER_CACHE_COLLISION:
-                    self._notes.add(
-                        "⚠️ Cache collision detected. Investigate possible shader cache issues"
-                    )
-                case CommonError.SHADER_CACHE_CORRUPTION:
-                    self._notes.add(
-                        "⚠️ Cache corruption detected. Investigate possible shader cache issues"
-                    )
-                case CommonError.DUMP_HASH:
-                    self._notes.add(
-                        "⚠️ Dump error detected. Investigate possible bad game/firmware dump issues"
-                    )
-                case CommonError.UPDATE_KEYS:
-                    self._notes.add(
-                        "⚠️ Keys or firmware out of date, consider updating them"
-                    )
-                case CommonError.FILE_PERMISSIONS:
-                    self._notes.add(
-                        "⚠️ File permission error. Consider deleting save directory and allowing Ryujinx to make a new one"
-                    )
-                case CommonError.FILE_NOT_FOUND:
-                    self._notes.add(
-                        "⚠️ Save not found error. Consider starting game without a save file or using a new save file"
-                    )
-                case CommonError.MISSING_SERVICES:
-                    if self._settings["ignore_missing_services"] == "False":
-                        self._notes.add(
-                            "⚠️ Consider enabling `Ignore Missing Services` in Ryujinx settings"
-                        )
-                case CommonError.VULKAN_OUT_OF_MEMORY:
-                    if self._settings["texture_recompression"] == "Disabled":
-                        self._notes.add(
-                            "⚠️ Consider enabling `Texture Recompression` in Ryujinx settings"
-                        )
-                case _:
-                    raise NotImplementedError(common_error)
-
-        timestamp_regex = re.compile(r"(\d{2}:\d{2}:\d{2}\.\d{3})\s+?\|")
-        latest_timestamp = re.findall(timestamp_regex, self._log_text)[-1]
-        if latest_timestamp:
-            timestamp_message = f"ℹ️ Time elapsed: `{latest_timestamp}`"
-            self._notes.add(timestamp_message)
-
-        if self.is_default_user_profile():
-            self._notes.add(
-                "⚠️ Default user profile in use, consider creating a custom one."
+    def get_note_field(self, name: str) -> Any:
+        """
+        Returns the value of a field referenced by the note rules.
+        """
+        namespace, _, key = name.partition(".")
+        match namespace:
+            case "hardware_info":
+                return getattr(self.hardware_info, key)
+            case "emu_info":
+                return getattr(self.emu_info, key)
+            case "game_info":
+                return self.__get_game_info_field(key)
+            case "settings":
+                return getattr(self.settings, key)
+            case "log_values":
+                return self.get_log_value(key)
+            case "common_errors":
+                return {error.name for error in self.get_common_errors()}
+            case "ryujinx_version":
+                return self.get_ryujinx_version()[0].name
+            case "default_user_profile":
+                return self.is_default_user_profile()
+            case _:
+                raise KeyError(name)
+
+    def __get_game_info_field(self, key: str) -> Optional[str]:
+        match key:
+            case "game_name":
+                return self._game_name
+            case "errors":
+                return self.get_errors_field()
+            case "mods":
+                return self.get_mods()
+            case "cheats":
+                return self.get_cheats()
+            case "top_errors":
+                return self.get_top_errors_field()
+            case _:
+                raise KeyError(key)
+
+    @cached_property
+    def notes(self) -> list[str]:
+        """
+        Returns the notes of the log, most severe first.
+        """
+        notes = set(self._note_plan.evaluate(self.get_note_field))
+
+        if len(self._timeline) > 0:
+            timestamp_message = (
+                f"ℹ️ Time elapsed: `{format_timestamp(self._timeline.elapsed())}`"
             )
+            notes.add(timestamp_message)
 
-        self.__get_controller_notes()
-        self.__get_os_notes()
-        self.__get_cpu_notes()
-
-        if (
-            self._emu_info["ryu_firmware"] == "Unknown"
-            and self._game_info["game_name"] != "Unknown"
-        ):
-            firmware_warning = f"**❌ Nintendo Switch firmware not found**"
-            self._notes.add(firmware_warning)
-
-        self.__get_settings_notes()
-        version_type, version_str = self.get_ryujinx_version()
-        if version_type == RyujinxVersion.CUSTOM:
-            self._notes.add("**⚠️ Custom builds are not officially supported**")
+        self.__get_controller_notes(notes)
+        return self.__sort_notes(notes)
 
     def get_ryujinx_version(self) -> tuple[RyujinxVersion, str]:
-        mainline_version = re.compile(r"^\d\.\d\.\d+$")
-        canary_version = re.compile(r"^Canary \d\.\d\.\d+$")
-        pr_version = re.compile(r"^\d\.\d\.\d\+([a-f]|\d){7}$")
-
-        version_data = self._emu_info["ryu_version"]
+        version_data = self.emu_info.ryu_version
 
-        if re.match(mainline_version, version_data):
+        if mainline_version_regex.match(version_data):
             return RyujinxVersion.STABLE, version_data
-        elif re.match(canary_version, version_data):
+        elif canary_version_regex.match(version_data):
             return RyujinxVersion.CANARY, version_data.split(" ", maxsplit=2)[1]
-        elif re.match(pr_version, version_data):
+        elif pr_version_regex.match(version_data):
             return RyujinxVersion.PR, version_data
         else:
             return RyujinxVersion.CUSTOM, version_data
 
-    def is_default_user_profile(self) -> bool:
-        return (
-            re.search(r"UserId: 00000000000000010000000000000000", self._log_text)
-            is not None
+    def __summarise_timeline(self) -> dict[str, Union[int, str, list]]:
+        shader_bursts = self._timeline.bursts(
+            self._timeline.get_source_ids("Shader"),
+            shader_burst_interval,
+            min_shader_burst_count,
         )
+        return {
+            "entries": len(self._timeline),
+            "elapsed": format_timestamp(self._timeline.elapsed()),
+            "errors_per_minute": self._timeline.errors_per_minute().tolist(),
+            "gaps": [
+                {"start": format_timestamp(gap.start), "seconds": gap.duration / 1000}
+                for gap in self._timeline.gaps(min_hang_duration)
+            ],
+            "shader_bursts": [
+                {
+                    "start": format_timestamp(burst.start),
+                    "end": format_timestamp(burst.end),
+                    "count": burst.count,
+                }
+                for burst in shader_bursts
+            ],
+        }
+
+    def get_log_value(self, key: str) -> Optional[str]:
+        return self._log_values.get(key)
+
+    def is_default_user_profile(self) -> bool:
+        return self._is_default_user_profile
+
+    def get_error_group_lines(self, error_group: ErrorGroup) -> list[str]:
+        return self.__get_error_lines(error_group.sample)
+
+    def __format_top_errors(self, count: int) -> str:
+        top_errors = []
+        for error_group in self._error_groups.top(count):
+            first_line = self.get_error_group_lines(error_group)[0]
+            entry = parse_log_line(first_line)
+            message = entry.message if entry is not None else first_line
+            message = message[:max_top_error_length].replace("`", "'")
+            timestamps = error_group.first_timestamp
+            if error_group.count > 1:
+                timestamps += f" - {error_group.last_timestamp}"
+            top_errors.append(f"**{error_group.count}×** `{message}` ({timestamps})")
+        return "\n".join(top_errors)
+
+    def get_last_error(self, max_lines: Optional[int] = None) -> Optional[list[str]]:
+        if self._last_error is None:
+            return None
+        return self.__get_error_lines(self._last_error, max_lines)
 
-    def get_last_error(self) -> Optional[list[str]]:
-        return self._log_errors[-1] if len(self._log_errors) > 0 else None
+    def get_common_error_counts(self) -> Counter[CommonError]:
+        return self._common_error_counts
 
     def get_common_errors(self) -> list[CommonError]:
-        errors = []
-
-        if self.contains_errors(["Cache collision found"], self._log_errors):
-            errors.append(CommonError.SHADER_CACHE_COLLISION)
-        if self.contains_errors(
-            [
-                "ResultFsInvalidIvfcHash",
-                "ResultFsNonRealDataVerificationFailed",
-            ],
-            self._log_errors,
-        ):
-            errors.append(CommonError.DUMP_HASH)
-        if self.contains_errors(
-            [
-                "Ryujinx.Graphics.Gpu.Shader.ShaderCache.Initialize()",
-                "System.IO.InvalidDataException: End of Central Directory record could not be found",
-                "ICSharpCode.SharpZipLib.Zip.ZipException: Cannot find central directory",
-            ],
-            self._log_errors,
-        ):
-            errors.append(CommonError.SHADER_CACHE_CORRUPTION)
-        if self.contains_errors(["MissingKeyException"], self._log_errors):
-            errors.append(CommonError.UPDATE_KEYS)
-        if self.contains_errors(["ResultFsPermissionDenied"], self._log_errors):
-            errors.append(CommonError.FILE_PERMISSIONS)
-        if self.contains_errors(["ResultFsTargetNotFound"], self._log_errors):
-            errors.append(CommonError.FILE_NOT_FOUND)
-        if self.contains_errors(["ServiceNotImplementedException"], self._log_errors):
-            errors.append(CommonError.MISSING_SERVICES)
-        if self.contains_errors(["ErrorOutOfDeviceMemory"], self._log_errors):
-            errors.append(CommonError.VULKAN_OUT_OF_MEMORY)
-
-        return errors
-
-    def analyse_discord(
-        self, is_channel_allowed: bool, pr_channel: int
-    ) -> dict[str, dict[str, str]]:
-        last_error = self.get_last_error()
-        if last_error is not None:
-            last_error = "\n".join(last_error[:2])
-            self._game_info["errors"] = f"```\n{last_error}\n```"
-        else:
-            self._game_info["errors"] = "No errors found in log"
-
-        # Limit mods and cheats to 5 entries
-        mods = self._game_info["mods"].splitlines()
-        cheats = self._game_info["cheats"].splitlines()
-        if len(mods) > 5:
-            limit_mods = mods[:5]
-            limit_mods.append(f"✂️ {len(mods) - 5} other mods")
-            self._game_info["mods"] = "\n".join(limit_mods)
-        if len(cheats) > 5:
-            limit_cheats = cheats[:5]
-            limit_cheats.append(f"✂️ {len(cheats) - 5} other cheats")
-            self._game_info["cheats"] = "\n".join(limit_cheats)
+        return sorted(self.get_common_error_counts().keys())
+
+    def analyse_discord(self, is_channel_allowed: bool, pr_channel: int) -> LogAnalysis:
+        """
+        Returns the fields shown in the log embed, with at most 5 mods and cheats listed.
+        """
+        game_info = self.get_game_info(limit=5)
+        game_info.top_errors = self.get_top_errors_field()
 
+        notes = self.notes
         if is_channel_allowed and self.get_ryujinx_version()[0] == RyujinxVersion.PR:
-            self._notes.add(
-                f"**⚠️ PR build logs should be posted in <#{pr_channel}> if reporting bugs or tests**"
+            notes = self.__sort_notes(
+                [
+                    *notes,
+                    f"**⚠️ PR build logs should be posted in <#{pr_channel}> if reporting bugs or tests**",
+                ]
             )
+        if len(notes) > 0:
+            game_info.notes = "\n".join(notes)
 
-        self._notes = self.__sort_notes()
-        full_game_info = self._game_info
-        full_game_info["notes"] = (
-            "\n".join(self._notes) if len(self._notes) > 0 else "Nothing to note"
-        )
-
-        return {
-            "hardware_info": self._hardware_info,
-            "emu_info": self._emu_info,
-            "game_info": full_game_info,
-            "settings": self._settings,
-        }
+        return LogAnalysis(self.hardware_info, self.emu_info, game_info, self.settings)
 
     def analyse(self) -> dict[str, Union[dict[str, str], list[str], list[list[str]]]]:
-        self._notes = list(self.__sort_notes())
-
-        last_error = self.get_last_error()
-        if last_error is not None:
-            last_error = "\n".join(last_error[:2])
-            self._game_info["errors"] = f"```\n{last_error}\n```"
-        else:
-            self._game_info["errors"] = "No errors found in log"
+        game_info = self.get_game_info()
+        if len(self.notes) > 0:
+            game_info.notes = "\n".join(self.notes)
 
+        analysis = LogAnalysis(
+            self.hardware_info, self.emu_info, game_info, self.settings
+        ).to_dict()
         return {
-            "hardware_info": self._hardware_info,
-            "emu_info": self._emu_info,
-            "game_info": self._game_info,
-            "notes": self._notes,
-            "errors": self._log_errors,
-            "settings": self._settings,
-            "app_info": self.get_app_info(self._log_text),
-            "paths": list(self.get_filepaths(self._log_text)),
+            "hardware_info": analysis["hardware_info"],
+            "emu_info": analysis["emu_info"],
+            "game_info": analysis["game_info"],
+            "notes": self.notes,
+            "errors": [
+                {
+                    "signature": error_group.signature,
+                    "count": error_group.count,
+                    "first_timestamp": error_group.first_timestamp,
+                    "last_timestamp": error_group.last_timestamp,
+                    "lines": self.get_error_group_lines(error_group),
+                }
+                for error_group in self._error_groups
+            ],
+            "settings": analysis["settings"],
+            "timeline": self.__summarise_timeline(),
+            "app_info": self.get_log_app_info(),
+            "paths": self.get_log_filepaths(),
         }
 
 
 if __name__ == "__main__":
     import argparse
     import json
-    import os
 
     parser = argparse.ArgumentParser()
-    parser.add_argument("log_file", type=str)
+    parser.add_argument(
+        "log_files",
+        type=str,
+        nargs="+",
+        help="A log file or, in batch mode, log files, directories or glob patterns",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Analyse all given log files in parallel and write the results as JSON lines",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Number of worker processes used in batch mode"
+    )
+    parser.add_argument(
+        "--pattern",
+        type=str,
+        default="*.log",
+        help="Pattern of the files searched for in directories",
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        help="JSON file used to skip log files which haven't changed since the last batch run",
+    )
+    parser.add_argument(
+        "--output", type=str, help="File to write the results to instead of stdout"
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="Analyse log files through a memory map instead of reading them into memory",
+    )
 
     args = parser.parse_args()
 
-    if not os.path.isfile(args.log_file):
-        print(f"Couldn't find log file: {args.log_file}")
-        exit(1)
+    if args.batch or len(args.log_files) > 1 or not os.path.isfile(args.log_files[0]):
+        from robocop_ng.helpers import log_batch
+
+        log_batch.main(args)
+        exit(0)
 
-    with open(args.log_file, "r") as file:
-        text = file.read()
+    if args.mmap:
+        analyser = LogAnalyser.from_file(args.log_files[0], max_error_groups=None)
+    else:
+        with open(args.log_files[0], "r") as file:
+            text = file.read()
 
-    analyser = LogAnalyser(text)
+        analyser = LogAnalyser(text)
     result = analyser.analyse()
 
     print(json.dumps(result, indent=2))
@@ -0,0 +1,150 @@
+import heapq
+import re
+from dataclasses import dataclass
+from enum import IntEnum, auto
+from operator import attrgetter
+from typing import Iterable, Iterator, Mapping, Optional, Union
+
+from robocop_ng.helpers.regex_registry import regex_registry
+
+# Caps for the errors grouped from a single log, so a crash loop can't grow the analysis indefinitely
+max_error_groups = 1000
+max_signature_lines = 8
+max_signature_line_length = 256
+
+# Addresses, hashes and other numbers which differ between otherwise identical errors
+error_variable_regex = regex_registry.compile(
+    "error_variable", r"0[xX][0-9a-fA-F]++|\b[0-9a-fA-F]{8,}+\b|\d++"
+)
+
+
+class CommonError(IntEnum):
+    SHADER_CACHE_COLLISION = auto()
+    DUMP_HASH = auto()
+    SHADER_CACHE_CORRUPTION = auto()
+    UPDATE_KEYS = auto()
+    FILE_PERMISSIONS = auto()
+    FILE_NOT_FOUND = auto()
+    MISSING_SERVICES = auto()
+    VULKAN_OUT_OF_MEMORY = auto()
+
+
+# Maps the name of a CommonError to the strings identifying it in an error block.
+# Signatures can be added here without changing the log analyser.
+common_error_signatures: dict[str, list[str]] = {
+    "SHADER_CACHE_COLLISION": ["Cache collision found"],
+    "DUMP_HASH": [
+        "ResultFsInvalidIvfcHash",
+        "ResultFsNonRealDataVerificationFailed",
+    ],
+    "SHADER_CACHE_CORRUPTION": [
+        "Ryujinx.Graphics.Gpu.Shader.ShaderCache.Initialize()",
+        "System.IO.InvalidDataException: End of Central Directory record could not be found",
+        "ICSharpCode.SharpZipLib.Zip.ZipException: Cannot find central directory",
+    ],
+    "UPDATE_KEYS": ["MissingKeyException"],
+    "FILE_PERMISSIONS": ["ResultFsPermissionDenied"],
+    "FILE_NOT_FOUND": ["ResultFsTargetNotFound"],
+    "MISSING_SERVICES": ["ServiceNotImplementedException"],
+    "VULKAN_OUT_OF_MEMORY": ["ErrorOutOfDeviceMemory"],
+}
+
+
+class ErrorSignatureMatcher:
+    """
+    Classifies error blocks using a single regex compiled from all signatures.
+    """
+
+    def __init__(self, signatures: Mapping[str, Iterable[str]]):
+        self._term_errors: dict[str, CommonError] = {}
+        for error_name, terms in signatures.items():
+            error = CommonError[error_name]
+            for term in terms:
+                self._term_errors[term] = error
+
+        # Longer terms first, so a term which is a prefix of another one can't shadow it
+        terms = sorted(self._term_errors.keys(), key=len, reverse=True)
+        self._regex = regex_registry.compile(
+            "error_signatures", "|".join(re.escape(term) for term in terms)
+        )
+
+    def match(self, error_lines: list[str]) -> set[CommonError]:
+        if len(self._term_errors) == 0:
+            return set()
+        return {
+            self._term_errors[match.group(0)]
+            for match in self._regex.finditer("\n".join(error_lines))
+        }
+
+
+common_error_matcher = ErrorSignatureMatcher(common_error_signatures)
+
+
+def error_signature(message: str, continuation: Iterable[str] = ()) -> str:
+    """
+    Returns the signature used to group an error block: the message and the first continuation lines,
+    without their numbers, addresses and hashes.
+    """
+    lines = [message]
+    for line in continuation:
+        if len(lines) >= max_signature_lines:
+            break
+        lines.append(line.strip())
+    return "\n".join(
+        error_variable_regex.sub("#", line[:max_signature_line_length])
+        for line in lines
+    )
+
+
+@dataclass(slots=True)
+class ErrorGroup:
+    signature: str
+    # The first block with this signature, either as (start, end) offsets into the log text or as lines
+    sample: Union[tuple[int, int], list[str]]
+    first_timestamp: str
+    last_timestamp: str
+    count: int = 1
+
+
+class ErrorAggregator:
+    """
+    Groups error blocks by their signature, so repeated errors only take up memory once.
+
+    Blocks with a new signature are dropped once max_groups groups exist, but they are still counted.
+    """
+
+    def __init__(self, max_groups: Optional[int] = max_error_groups):
+        self.max_groups = max_groups
+        self.total_count = 0
+        self._groups: dict[str, ErrorGroup] = {}
+
+    def add(
+        self,
+        signature: str,
+        timestamp: str,
+        sample: Union[tuple[int, int], list[str]],
+    ) -> Optional[ErrorGroup]:
+        self.total_count += 1
+        group = self._groups.get(signature)
+        if group is not None:
+            group.count += 1
+            group.last_timestamp = timestamp
+            return group
+        if self.max_groups is not None and len(self._groups) >= self.max_groups:
+            return None
+        group = ErrorGroup(signature, sample, timestamp, timestamp)
+        self._groups[signature] = group
+        return group
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def __iter__(self) -> Iterator[ErrorGroup]:
+        # Groups are kept in the order their first block appeared
+        return iter(self._groups.values())
+
+    def top(self, count: int) -> list[ErrorGroup]:
+        """
+        Returns the count most frequent groups, earlier groups first if they occurred equally often.
+        """
+        return heapq.nlargest(count, self._groups.values(), key=attrgetter("count"))
@@ -0,0 +1,374 @@
+import time
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Iterable, Optional
+
+from robocop_ng.helpers.ryujinx_log_results import (
+    EmulatorInfo,
+    GameInfo,
+    HardwareInfo,
+    SettingsInfo,
+)
+
+# Fields which can be referenced by note rules, as "<namespace>.<key>" or just "<namespace>".
+# A namespace mapped to None accepts any key, e.g. "log_values.EnableDockedMode".
+note_field_namespaces: dict[str, Optional[set[str]]] = {
+    "hardware_info": {field.name for field in fields(HardwareInfo)},
+    "emu_info": {field.name for field in fields(EmulatorInfo)},
+    # The notes can't depend on themselves
+    "game_info": {field.name for field in fields(GameInfo)} - {"notes"},
+    "settings": {field.name for field in fields(SettingsInfo)},
+    "log_values": None,
+    # The names of the CommonErrors found in the log
+    "common_errors": set(),
+    # The name of the RyujinxVersion type
+    "ryujinx_version": set(),
+    "default_user_profile": set(),
+}
+severity_symbols = ["❌", "🔴", "⚠️", "ℹ", "✅"]
+
+
+def equals(value: Any, operand: Any) -> bool:
+    return value == operand
+
+
+def not_equals(value: Any, operand: Any) -> bool:
+    return value != operand
+
+
+def contains(value: Any, operand: Any) -> bool:
+    return value is not None and operand in value
+
+
+def not_contains(value: Any, operand: Any) -> bool:
+    return value is not None and operand not in value
+
+
+def is_in(value: Any, operand: Any) -> bool:
+    return value in operand
+
+
+note_operators: dict[str, Callable[[Any, Any], bool]] = {
+    "equals": equals,
+    "not_equals": not_equals,
+    "contains": contains,
+    "not_contains": not_contains,
+    "in": is_in,
+}
+
+
+@dataclass(slots=True)
+class NoteCondition:
+    field: str
+    operator: str
+    value: Any
+
+
+@dataclass(slots=True)
+class NoteRule:
+    name: str
+    note: str
+    conditions: list[NoteCondition]
+
+
+def is_note_field(field: str) -> bool:
+    namespace, _, key = field.partition(".")
+    if namespace not in note_field_namespaces:
+        return False
+    keys = note_field_namespaces[namespace]
+    if keys is None:
+        return len(key) > 0
+    if len(keys) == 0:
+        return len(key) == 0
+    return key in keys
+
+
+def parse_note_rule(rule: dict[str, Any]) -> NoteRule:
+    """
+    Parses a rule like {"name": ..., "note": ..., "all": [{"field": ..., "op": ..., "value": ...}]}.
+    The note is added if all conditions are met.
+
+    Raises ValueError if the rule is invalid.
+    """
+    name = rule.get("name")
+    note = rule.get("note")
+    if not isinstance(name, str) or not isinstance(note, str):
+        raise ValueError(f"Rule {name!r} needs a name and a note.")
+    # Notes are sorted by their severity symbol and their second word
+    if len(note.split()) < 2 or not any(symbol in note for symbol in severity_symbols):
+        raise ValueError(
+            f"Note of rule '{name}' needs a severity symbol ({' '.join(severity_symbols)}) and some text."
+        )
+    if not isinstance(rule.get("all"), list) or len(rule["all"]) == 0:
+        raise ValueError(f"Rule '{name}' needs a list of conditions in 'all'.")
+
+    conditions = []
+    for condition in rule["all"]:
+        if not isinstance(condition, dict):
+            raise ValueError(f"Rule '{name}' contains an invalid condition.")
+        field = condition.get("field", "")
+        operator = condition.get("op", "equals")
+        if not is_note_field(field):
+            raise ValueError(f"Rule '{name}' uses an unknown field: '{field}'")
+        if operator not in note_operators:
+            raise ValueError(f"Rule '{name}' uses an unknown operator: '{operator}'")
+        if "value" not in condition:
+            raise ValueError(f"Condition on '{field}' of rule '{name}' has no value.")
+        value = condition["value"]
+        try:
+            # Values have to be hashable, since equal conditions are only checked once
+            if operator == "in":
+                value = frozenset(value)
+            elif isinstance(value, list):
+                value = tuple(value)
+            hash(value)
+        except TypeError:
+            raise ValueError(
+                f"Condition on '{field}' of rule '{name}' has an invalid value."
+            )
+        conditions.append(NoteCondition(field, operator, value))
+    return NoteRule(name, note, conditions)
+
+
+@dataclass(slots=True)
+class NoteRuleCost:
+    name: str
+    conditions: int
+    seconds: float
+
+
+class NotePlan:
+    """
+    Note rules compiled into a flat list of fields and predicates.
+
+    Every field referenced by the rules is resolved once and every distinct condition is checked once,
+    regardless of how many rules share it. Plans are picklable, so they can be passed to worker processes.
+    """
+
+    def __init__(self, rules: Iterable[NoteRule]):
+        self.rules = list(rules)
+        self.fields: list[str] = []
+        self._predicates: list[tuple[int, str, Any]] = []
+        self._rule_predicates: list[tuple[int, ...]] = []
+
+        field_indexes: dict[str, int] = {}
+        predicate_indexes: dict[tuple[int, str, Any], int] = {}
+        for rule in self.rules:
+            predicate_ids = []
+            for condition in rule.conditions:
+                if condition.field not in field_indexes:
+                    field_indexes[condition.field] = len(self.fields)
+                    self.fields.append(condition.field)
+                predicate = (
+                    field_indexes[condition.field],
+                    condition.operator,
+                    condition.value,
+                )
+                if predicate not in predicate_indexes:
+                    predicate_indexes[predicate] = len(self._predicates)
+                    self._predicates.append(predicate)
+                predicate_ids.append(predicate_indexes[predicate])
+            self._rule_predicates.append(tuple(predicate_ids))
+
+    @classmethod
+    def from_data(cls, rules: Iterable[dict[str, Any]]) -> "NotePlan":
+        return cls(parse_note_rule(rule) for rule in rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def evaluate(self, resolve: Callable[[str], Any]) -> list[str]:
+        """
+        Returns the notes of all rules whose conditions are met, resolve maps a field name to its value.
+        """
+        values = [resolve(field) for field in self.fields]
+        results = [
+            note_operators[operator](values[field_index], operand)
+            for field_index, operator, operand in self._predicates
+        ]
+        return [
+            rule.note
+            for rule, predicate_ids in zip(self.rules, self._rule_predicates)
+            if all(results[predicate_id] for predicate_id in predicate_ids)
+        ]
+
+    def measure(
+        self, resolve: Callable[[str], Any], repeat: int = 1000
+    ) -> list[NoteRuleCost]:
+        """
+        Returns the time each rule takes to evaluate on its own, including resolving its fields, most expensive first.
+        """
+        costs = []
+        for rule in self.rules:
+            rule_plan = NotePlan([rule])
+            start_time = time.perf_counter()
+            for _ in range(repeat):
+                rule_plan.evaluate(resolve)
+            seconds = (time.perf_counter() - start_time) / repeat
+            costs.append(NoteRuleCost(rule.name, len(rule.conditions), seconds))
+        return sorted(costs, key=lambda cost: cost.seconds, reverse=True)
+
+
+def note_condition(field: str, value: Any, operator: str = "equals") -> dict[str, Any]:
+    return {"field": field, "op": operator, "value": value}
+
+
+default_note_rules: list[dict[str, Any]] = [
+    {
+        "name": "shader_cache_collision",
+        "note": "⚠️ Cache collision detected. Investigate possible shader cache issues",
+        "all": [note_condition("common_errors", "SHADER_CACHE_COLLISION", "contains")],
+    },
+    {
+        "name": "shader_cache_corruption",
+        "note": "⚠️ Cache corruption detected. Investigate possible shader cache issues",
+        "all": [note_condition("common_errors", "SHADER_CACHE_CORRUPTION", "contains")],
+    },
+    {
+        "name": "dump_hash",
+        "note": "⚠️ Dump error detected. Investigate possible bad game/firmware dump issues",
+        "all": [note_condition("common_errors", "DUMP_HASH", "contains")],
+    },
+    {
+        "name": "update_keys",
+        "note": "⚠️ Keys or firmware out of date, consider updating them",
+        "all": [note_condition("common_errors", "UPDATE_KEYS", "contains")],
+    },
+    {
+        "name": "file_permissions",
+        "note": "⚠️ File permission error. Consider deleting save directory and allowing Ryujinx to make a new one",
+        "all": [note_condition("common_errors", "FILE_PERMISSIONS", "contains")],
+    },
+    {
+        "name": "file_not_found",
+        "note": "⚠️ Save not found error. Consider starting game without a save file or using a new save file",
+        "all": [note_condition("common_errors", "FILE_NOT_FOUND", "contains")],
+    },
+    {
+        "name": "missing_services",
+        "note": "⚠️ Consider enabling `Ignore Missing Services` in Ryujinx settings",
+        "all": [
+            note_condition("common_errors", "MISSING_SERVICES", "contains"),
+            note_condition("log_values.IgnoreMissingServices", "False"),
+        ],
+    },
+    {
+        "name": "vulkan_out_of_memory",
+        "note": "⚠️ Consider enabling `Texture Recompression` in Ryujinx settings",
+        "all": [
+            note_condition("common_errors", "VULKAN_OUT_OF_MEMORY", "contains"),
+            note_condition("settings.texture_recompression", "Disabled"),
+        ],
+    },
+    {
+        "name": "default_user_profile",
+        "note": "⚠️ Default user profile in use, consider creating a custom one.",
+        "all": [note_condition("default_user_profile", True)],
+    },
+    {
+        "name": "intel_gpu_backend",
+        "note": "**⚠️ Intel iGPU users should consider using Vulkan graphics backend**",
+        "all": [
+            note_condition("hardware_info.os", "Windows", "contains"),
+            note_condition("settings.graphics_backend", "Vulkan", "not_equals"),
+            note_condition("hardware_info.gpu", "Intel", "contains"),
+        ],
+    },
+    {
+        "name": "amd_gpu_backend",
+        "note": "**⚠️ AMD GPU users should consider using Vulkan graphics backend**",
+        "all": [
+            note_condition("hardware_info.os", "Windows", "contains"),
+            note_condition("settings.graphics_backend", "Vulkan", "not_equals"),
+            note_condition("hardware_info.gpu", "AMD", "contains"),
+        ],
+    },
+    {
+        "name": "intel_mac",
+        "note": "**⚠️ Intel Macs are not supported.**",
+        "all": [
+            note_condition("hardware_info.os", "macOS", "contains"),
+            note_condition("hardware_info.cpu", "Intel", "contains"),
+        ],
+    },
+    {
+        "name": "rosetta",
+        "note": "🔴 **Rosetta should be disabled**",
+        "all": [note_condition("hardware_info.cpu", "VirtualApple", "contains")],
+    },
+    {
+        "name": "firmware_missing",
+        "note": "**❌ Nintendo Switch firmware not found**",
+        "all": [
+            note_condition("emu_info.ryu_firmware", "Unknown"),
+            note_condition("game_info.game_name", "Unknown", "not_equals"),
+        ],
+    },
+    {
+        "name": "dummy_audio",
+        "note": "⚠️ Dummy audio backend, consider changing to SDL2 or OpenAL",
+        "all": [note_condition("log_values.AudioBackend", "Dummy")],
+    },
+    {
+        "name": "pptc_disabled",
+        "note": "🔴 **PPTC cache should be enabled**",
+        "all": [note_condition("settings.pptc", "Disabled")],
+    },
+    {
+        "name": "shader_cache_disabled",
+        "note": "🔴 **Shader cache should be enabled**",
+        "all": [note_condition("settings.shader_cache", "Disabled")],
+    },
+    {
+        "name": "expand_ram",
+        "note": "⚠️ `Use alternative memory layout` should only be enabled for 4K mods",
+        "all": [note_condition("log_values.ExpandRam", "True")],
+    },
+    {
+        "name": "software_memory_manager",
+        "note": "🔴 **`Software` setting in Memory Manager Mode will give slower performance than the default setting of `Host unchecked`**",
+        "all": [note_condition("log_values.MemoryManagerMode", "SoftwarePageTable")],
+    },
+    {
+        "name": "ignore_missing_services",
+        "note": "⚠️ `Ignore Missing Services` being enabled can cause instability",
+        "all": [note_condition("log_values.IgnoreMissingServices", "True")],
+    },
+    {
+        "name": "vsync_disabled",
+        "note": "⚠️ V-Sync disabled can cause instability like games running faster than intended or longer load times",
+        "all": [note_condition("settings.vsync", "Disabled")],
+    },
+    {
+        "name": "fs_integrity_disabled",
+        "note": "⚠️ Disabling file integrity checks may cause corrupted dumps to not be detected",
+        "all": [note_condition("log_values.EnableFsIntegrityChecks", "False")],
+    },
+    {
+        "name": "backend_threading_off",
+        "note": "🔴 **Graphics Backend Multithreading should be set to `Auto`**",
+        "all": [note_condition("log_values.BackendThreading", "Off")],
+    },
+    {
+        "name": "custom_build",
+        "note": "**⚠️ Custom builds are not officially supported**",
+        "all": [note_condition("ryujinx_version", "CUSTOM")],
+    },
+]
+
+default_note_plan = NotePlan.from_data(default_note_rules)
+
+# A short log the rules are evaluated against to measure their cost
+note_sample_log = "\n".join(
+    (
+        "00:00:00.000 |N| Application Print: Ryujinx Version: 1.2.3",
+        "00:00:00.001 |N| Application Print: Operating System: Windows 10.0.22631 (X64)",
+        "00:00:00.002 |N| Application Print: CPU: AMD Ryzen 7 5800X3D 8-Core Processor (16 logical cores)",
+        "00:00:00.003 |N| Application Print: RAM: Total 31.91 GiB ; Available 20.11 GiB",
+        "00:00:00.010 |I| Configuration LogValueChange: GraphicsBackend set to: Vulkan",
+        "00:00:00.011 |I| Configuration LogValueChange: EnablePtc set to: True",
+        "00:00:00.012 |I| Configuration LogValueChange: AudioBackend set to: SDL2",
+        "00:00:01.000 |I| HLE.OsThread.1 ServiceFs Firmware Version: 17.0.0",
+        "00:00:01.500 |I| GUI.RenderLoop Gpu PrintGpuInformation: NVIDIA GeForce RTX 3070 (555.99)",
+        "00:00:06.000 |E| GPU.MainThread Gpu Vulkan: ErrorOutOfDeviceMemory while allocating",
+    )
+)
@@ -0,0 +1,131 @@
+import sys
+from dataclasses import asdict, dataclass
+from enum import StrEnum
+from typing import Any, Optional, Union
+
+unknown_value = "Unknown"
+
+
+class SettingValue(StrEnum):
+    """
+    The display values of the analysed settings.
+
+    Every analysis shares the same instances, so the results don't carry their own copies of these strings.
+    """
+
+    UNKNOWN = unknown_value
+    ENABLED = "Enabled"
+    DISABLED = "Disabled"
+    DOCKED = "Docked"
+    HANDHELD = "Handheld"
+    NOT_AVAILABLE = "N/A"
+    CUSTOM = "Custom"
+    AUTO = "Auto"
+    RESOLUTION_NATIVE = "Native (720p/1080p)"
+    RESOLUTION_2X = "2x (1440p/2160p)"
+    RESOLUTION_3X = "3x (2160p/3240p)"
+    RESOLUTION_4X = "4x (2880p/4320p)"
+    ANISOTROPIC_2X = "2x"
+    ANISOTROPIC_4X = "4x"
+    ANISOTROPIC_8X = "8x"
+    ANISOTROPIC_16X = "16x"
+    ASPECT_4_3 = "4:3"
+    ASPECT_16_9 = "16:9"
+    ASPECT_16_10 = "16:10"
+    ASPECT_21_9 = "21:9"
+    ASPECT_32_9 = "32:9"
+    ASPECT_STRETCHED = "Stretch to Fit Window"
+
+
+resolution_values = {
+    "-1": SettingValue.CUSTOM,
+    "1": SettingValue.RESOLUTION_NATIVE,
+    "2": SettingValue.RESOLUTION_2X,
+    "3": SettingValue.RESOLUTION_3X,
+    "4": SettingValue.RESOLUTION_4X,
+}
+anisotropic_values = {
+    "-1": SettingValue.AUTO,
+    "2": SettingValue.ANISOTROPIC_2X,
+    "4": SettingValue.ANISOTROPIC_4X,
+    "8": SettingValue.ANISOTROPIC_8X,
+    "16": SettingValue.ANISOTROPIC_16X,
+}
+aspect_ratio_values = {
+    "Fixed4x3": SettingValue.ASPECT_4_3,
+    "Fixed16x9": SettingValue.ASPECT_16_9,
+    "Fixed16x10": SettingValue.ASPECT_16_10,
+    "Fixed21x9": SettingValue.ASPECT_21_9,
+    "Fixed32x9": SettingValue.ASPECT_32_9,
+    "Stretched": SettingValue.ASPECT_STRETCHED,
+}
+
+# Settings which aren't mapped to a SettingValue keep the value from the log, e.g. "Vulkan" or "SDL2"
+Setting = Optional[Union[SettingValue, str]]
+
+
+def intern_setting(value: str) -> str:
+    """
+    Interns raw setting values, since the same few values show up in every log.
+    """
+    return sys.intern(value)
+
+
+@dataclass(slots=True)
+class HardwareInfo:
+    cpu: str = unknown_value
+    gpu: str = unknown_value
+    ram: str = unknown_value
+    os: str = unknown_value
+
+
+@dataclass(slots=True)
+class EmulatorInfo:
+    ryu_version: str = unknown_value
+    ryu_firmware: str = unknown_value
+    logs_enabled: Optional[str] = None
+
+
+@dataclass(slots=True)
+class GameInfo:
+    game_name: str = unknown_value
+    errors: str = "No errors found in log"
+    mods: str = "No mods found"
+    cheats: str = "No cheats found"
+    notes: str = "Nothing to note"
+    top_errors: Optional[str] = None
+
+
+@dataclass(slots=True)
+class SettingsInfo:
+    audio_backend: Setting = SettingValue.UNKNOWN
+    backend_threading: Setting = SettingValue.UNKNOWN
+    docked: Setting = SettingValue.UNKNOWN
+    expand_ram: Setting = SettingValue.UNKNOWN
+    fs_integrity: Setting = SettingValue.UNKNOWN
+    graphics_backend: Setting = SettingValue.UNKNOWN
+    ignore_missing_services: Setting = SettingValue.UNKNOWN
+    memory_manager: Setting = SettingValue.UNKNOWN
+    pptc: Setting = SettingValue.UNKNOWN
+    shader_cache: Setting = SettingValue.UNKNOWN
+    vsync: Setting = SettingValue.UNKNOWN
+    hypervisor: Setting = SettingValue.UNKNOWN
+    resolution_scale: Setting = SettingValue.UNKNOWN
+    anisotropic_filtering: Setting = SettingValue.UNKNOWN
+    aspect_ratio: Setting = SettingValue.UNKNOWN
+    texture_recompression: Setting = SettingValue.UNKNOWN
+
+
+@dataclass(slots=True)
+class LogAnalysis:
+    """
+    The analysis of a log as shown in the log embed. Picklable, so it can be returned by worker processes.
+    """
+
+    hardware_info: HardwareInfo
+    emu_info: EmulatorInfo
+    game_info: GameInfo
+    settings: SettingsInfo
+
+    def to_dict(self) -> dict[str, dict[str, Any]]:
+        return asdict(self)
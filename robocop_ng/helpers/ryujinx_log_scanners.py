@@ -0,0 +1,109 @@
+from typing import Iterator, Optional
+
+from robocop_ng.helpers.regex_registry import regex_registry
+
+# Caps for the file paths collected from a single log, which are only shown in analysis results.
+# Blocked path fragments are looked up in every path instead, so they can't be hidden behind other paths.
+max_filepaths = 1000
+max_filepath_length = 4096
+# Maximum number of non-empty lines read from an indented block, e.g. the build ids of an application
+max_block_lines = 64
+
+# Separators and path segments can't overlap, so possessive quantifiers don't change the matches,
+# but they make sure the regex never backtracks into a path it has already consumed.
+filepath_regex = regex_registry.compile(
+    "filepath", r"(?:[A-Za-z]:)?(?:[\\/]++[^\\/:\"\r\n]++)++"
+)
+homebrew_regex = regex_registry.compile(
+    "homebrew", r"Application: Loading as [Hh]omebrew"
+)
+build_ids_regex = regex_registry.compile(
+    "build_ids", r"Build ids found for (?:title|application) ([a-zA-Z0-9]*+):"
+)
+ro_section_marker = "PrintRoSectionInfo: main:"
+
+
+def iter_filepaths(text: str, start: int = 0) -> Iterator[str]:
+    """
+    Yields every file path found in text, including duplicates, without any length limit.
+    """
+    for filepath_match in filepath_regex.finditer(text, start):
+        yield filepath_match.group(0).rstrip("\u0000")
+
+
+def scan_filepaths(
+    text: str, max_count: int = max_filepaths, start: int = 0
+) -> dict[str, None]:
+    """
+    Returns up to max_count distinct file paths found in text, in the order they appear.
+    """
+    filepaths = {}
+    if max_count <= 0:
+        return filepaths
+    for filepath_match in filepath_regex.finditer(text, start):
+        filepath = filepath_match.group(0)[:max_filepath_length].rstrip("\u0000")
+        filepaths[filepath] = None
+        if len(filepaths) >= max_count:
+            break
+    return filepaths
+
+
+def contains_homebrew_marker(text: str) -> bool:
+    """
+    Checks for a line containing "Load" followed by "Application: Loading as homebrew".
+    """
+    for homebrew_match in homebrew_regex.finditer(text):
+        line_start = text.rfind("\n", 0, homebrew_match.start()) + 1
+        # If this check fails, the next match on the same line succeeds, since the marker itself contains "Load"
+        if text.find("Load", line_start, homebrew_match.start()) != -1:
+            return True
+    return False
+
+
+def scan_indented_block(
+    text: str, header_end: int, max_lines: int = max_block_lines
+) -> list[str]:
+    """
+    Returns the lines starting with whitespace which follow the line ending at header_end.
+    Empty lines are included, but don't count towards max_lines.
+    """
+    lines = []
+    line_count = 0
+    line_start = header_end
+    while line_start < len(text) and line_count < max_lines:
+        line_end = text.find("\n", line_start)
+        if line_end == -1:
+            line_end = len(text)
+        line = text[line_start:line_end]
+        if len(line) > 0 and not line[0].isspace():
+            break
+        lines.append(line)
+        if len(line.strip()) > 0:
+            line_count += 1
+        line_start = line_end + 1
+    return lines
+
+
+def scan_last_build_ids(text: str) -> Optional[tuple[str, list[str]]]:
+    """
+    Returns the application id of the last "Build ids found" header and the lines of its block.
+    """
+    last_match = None
+    for last_match in build_ids_regex.finditer(text):
+        pass
+    if last_match is None or not text.startswith("\n", last_match.end()):
+        return None
+    return last_match.group(1), scan_indented_block(text, last_match.end() + 1)
+
+
+def scan_last_ro_section(text: str) -> Optional[list[str]]:
+    """
+    Returns the lines of the last main RO section block.
+    """
+    marker_start = text.rfind(ro_section_marker)
+    while marker_start != -1:
+        header_end = marker_start + len(ro_section_marker)
+        if text.startswith("\n", header_end):
+            return scan_indented_block(text, header_end + 1)
+        marker_start = text.rfind(ro_section_marker, 0, marker_start)
+    return None
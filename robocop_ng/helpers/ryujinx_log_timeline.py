@@ -0,0 +1,166 @@
+from array import array
+from dataclasses import dataclass
+from itertools import compress, islice
+from typing import Optional
+
+from robocop_ng.helpers.ryujinx_log_tokenizer import LogEntry
+
+error_level = ord("E")
+ms_per_minute = 60 * 1000
+
+
+def pack_timestamp(timestamp: str) -> int:
+    """
+    Converts a "HH:MM:SS.mmm" log timestamp into the integer HHMMSSmmm, which is cheaper than computing milliseconds.
+    """
+    return int(timestamp.replace(":", "").replace(".", ""))
+
+
+def unpack_timestamp(packed_timestamp: int) -> int:
+    """
+    Converts a packed timestamp into milliseconds.
+    """
+    # The last five digits already are the seconds in milliseconds
+    return (
+        packed_timestamp // 10_000_000 * 3_600_000
+        + packed_timestamp // 100_000 % 100 * ms_per_minute
+        + packed_timestamp % 100_000
+    )
+
+
+def parse_timestamp(timestamp: str) -> int:
+    """
+    Converts a "HH:MM:SS.mmm" log timestamp into milliseconds.
+    """
+    return unpack_timestamp(pack_timestamp(timestamp))
+
+
+def format_timestamp(milliseconds: int) -> str:
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, ms_per_minute)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02}:{minutes:02}:{seconds:02}.{milliseconds:03}"
+
+
+@dataclass(slots=True)
+class TimelineGap:
+    start: int
+    duration: int
+
+
+@dataclass(slots=True)
+class TimelineBurst:
+    start: int
+    end: int
+    count: int
+
+
+class LogTimeline:
+    """
+    The timestamps, levels and sources of all entries of a log, stored in parallel arrays.
+
+    An entry takes up 9 bytes, so the timeline of a large log can be kept around and evaluated
+    without scanning the log text again. Timestamps are only converted to milliseconds once they are evaluated.
+    """
+
+    def __init__(self):
+        self.levels = array("B")
+        # Source names come from the log, so a crafted log can contain more than fit in an unsigned short
+        self.sources = array("I")
+        self.source_names: list[Optional[str]] = []
+        self._source_ids: dict[Optional[str], int] = {}
+        self._packed_timestamps = array("I")
+        self._timestamps = array("I")
+
+    def __len__(self) -> int:
+        return len(self._packed_timestamps)
+
+    @property
+    def timestamps(self) -> array:
+        """
+        The timestamps of the entries in milliseconds since the emulator was started.
+        """
+        if len(self._timestamps) < len(self._packed_timestamps):
+            self._timestamps.extend(
+                map(
+                    unpack_timestamp,
+                    islice(self._packed_timestamps, len(self._timestamps), None),
+                )
+            )
+        return self._timestamps
+
+    def add(self, entry: LogEntry):
+        source_id = self._source_ids.get(entry.source)
+        if source_id is None:
+            source_id = len(self.source_names)
+            self._source_ids[entry.source] = source_id
+            self.source_names.append(entry.source)
+        self._packed_timestamps.append(pack_timestamp(entry.timestamp))
+        self.levels.append(ord(entry.level))
+        self.sources.append(source_id)
+
+    def get_source_ids(self, source_filter: str) -> set[int]:
+        """
+        Returns the ids of all sources whose name contains source_filter.
+        """
+        return {
+            source_id
+            for source_id, name in enumerate(self.source_names)
+            if name is not None and source_filter in name
+        }
+
+    def elapsed(self) -> int:
+        """
+        Returns the timestamp of the last entry, i.e. how long the emulator had been running.
+        """
+        if len(self._packed_timestamps) == 0:
+            return 0
+        return unpack_timestamp(self._packed_timestamps[-1])
+
+    def errors_per_minute(self) -> array:
+        """
+        Returns the number of error entries logged in each minute since the emulator was started.
+        """
+        timestamps = self.timestamps
+        # Timestamps can go backwards, e.g. in concatenated logs, so the last entry isn't always the latest
+        counts = array(
+            "I", bytes(4 * (max(timestamps, default=0) // ms_per_minute + 1))
+        )
+        for timestamp in compress(timestamps, map(error_level.__eq__, self.levels)):
+            counts[timestamp // ms_per_minute] += 1
+        return counts
+
+    def gaps(self, min_duration: int) -> list[TimelineGap]:
+        """
+        Returns the periods of at least min_duration milliseconds without any entries, which can point to hangs.
+        """
+        return [
+            TimelineGap(previous, timestamp - previous)
+            for previous, timestamp in zip(
+                self.timestamps, islice(self.timestamps, 1, None)
+            )
+            if timestamp - previous >= min_duration
+        ]
+
+    def bursts(
+        self, source_ids: set[int], max_interval: int, min_count: int
+    ) -> list[TimelineBurst]:
+        """
+        Returns the runs of at least min_count entries from the given sources,
+        which are at most max_interval milliseconds apart from each other.
+        """
+        bursts = []
+        burst = None
+        for timestamp in compress(
+            self.timestamps, map(source_ids.__contains__, self.sources)
+        ):
+            if burst is not None and timestamp - burst.end <= max_interval:
+                burst.end = timestamp
+                burst.count += 1
+                continue
+            if burst is not None and burst.count >= min_count:
+                bursts.append(burst)
+            burst = TimelineBurst(timestamp, timestamp, 1)
+        if burst is not None and burst.count >= min_count:
+            bursts.append(burst)
+        return bursts
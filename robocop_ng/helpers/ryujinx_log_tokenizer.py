@@ -0,0 +1,139 @@
+from dataclasses import dataclass, field
+from mmap import mmap
+from typing import Iterable, Iterator, Optional, Union
+
+from robocop_ng.helpers.regex_registry import regex_registry
+
+# Ryujinx log lines look like this:
+#   00:00:01.234 |I| HLE.GuiThread Loader LoadNca: Application Loaded: ...
+# The thread name is omitted for entries logged from the main thread.
+log_entry_regex = regex_registry.compile(
+    "log_entry",
+    r"(\d{2}:\d{2}:\d{2}\.\d{3}) \|([A-Z])\| "
+    r"(?:(?:(?:([^\s:]+) )?([^\s:]+) )?([^\s:]+): )?",
+)
+# Used to find the line boundaries of entries in undecoded logs
+log_entry_bytes_regex = regex_registry.compile(
+    "log_entry_bytes", rb"\d{2}:\d{2}:\d{2}\.\d{3} \|[A-Z]\| "
+)
+
+
+@dataclass(slots=True)
+class LogEntry:
+    timestamp: str
+    level: str
+    thread: Optional[str]
+    source: Optional[str]
+    method: Optional[str]
+    line: str
+    message_start: int
+    continuation: list[str] = field(default_factory=list)
+
+    @property
+    def message(self) -> str:
+        return self.line[self.message_start :]
+
+    @property
+    def is_error(self) -> bool:
+        return self.level == "E"
+
+    def error_lines(self) -> list[str]:
+        return [self.line] + [line for line in self.continuation if line[0] == " "]
+
+
+def parse_log_line(line: str) -> Optional[LogEntry]:
+    match = log_entry_regex.match(line)
+    if match is None:
+        return None
+    return LogEntry(
+        timestamp=match.group(1),
+        level=match.group(2),
+        thread=match.group(3),
+        source=match.group(4),
+        method=match.group(5),
+        line=line,
+        message_start=match.end(),
+    )
+
+
+class LogTokenizer:
+    """
+    Groups raw log lines into structured entries.
+
+    Lines which don't start with a timestamp are attached to the preceding entry as continuation lines,
+    lines in front of the first entry (e.g. headers of partially downloaded files) are dropped.
+    An entry is only emitted once the next entry starts or the tokenizer is closed,
+    so text can be fed in arbitrary chunks.
+    """
+
+    # Longer lines are cut off, so a log without line breaks can't grow the buffer indefinitely
+    max_line_length = 64 * 1024
+
+    def __init__(self):
+        self._entry: Optional[LogEntry] = None
+        self._partial_line = ""
+
+    def feed_lines(self, lines: Iterable[str]) -> Iterator[LogEntry]:
+        for line in lines:
+            new_entry = parse_log_line(line)
+            if new_entry is not None:
+                if self._entry is not None:
+                    yield self._entry
+                self._entry = new_entry
+            elif self._entry is not None and len(line.strip()) > 0:
+                self._entry.continuation.append(line)
+
+    def feed(self, text: str) -> list[LogEntry]:
+        lines = (self._partial_line + text).split("\n")
+        self._partial_line = lines.pop()[: self.max_line_length]
+        return list(
+            self.feed_lines(line[: self.max_line_length].rstrip("\r") for line in lines)
+        )
+
+    def close(self) -> list[LogEntry]:
+        entries = list(self.feed_lines([self._partial_line.rstrip("\r")]))
+        self._partial_line = ""
+        if self._entry is not None:
+            entries.append(self._entry)
+            self._entry = None
+        return entries
+
+
+def tokenize_lines(lines: Iterable[str]) -> Iterator[LogEntry]:
+    tokenizer = LogTokenizer()
+    # Lines are cut off like in feed(), so the entries don't depend on how the log is read
+    yield from tokenizer.feed_lines(line[: tokenizer.max_line_length] for line in lines)
+    yield from tokenizer.close()
+
+
+def tokenize_log(log_text: str) -> Iterator[LogEntry]:
+    return tokenize_lines(log_text.splitlines())
+
+
+def iter_buffer_lines(
+    buffer: Union[bytes, mmap], encoding: str = "UTF-8"
+) -> Iterator[str]:
+    """
+    Decodes the lines of a bytes-like object (e.g. a mmap) one at a time, starting at the first timestamp.
+
+    Only a single line is copied and decoded at once, lines in front of the first entry and empty lines are skipped
+    without being decoded.
+    """
+    first_entry = log_entry_bytes_regex.search(buffer)
+    if first_entry is None:
+        return
+    position = first_entry.start()
+    size = len(buffer)
+    max_line_length = LogTokenizer.max_line_length
+    while position < size:
+        line_end = buffer.find(b"\n", position)
+        if line_end == -1:
+            line_end = size
+        if line_end > position:
+            line = buffer[position : min(line_end, position + max_line_length)]
+            yield line.decode(encoding, errors="replace").rstrip("\r")
+        position = line_end + 1
+
+
+def tokenize_buffer(buffer: Union[bytes, mmap]) -> Iterator[LogEntry]:
+    return tokenize_lines(iter_buffer_lines(buffer))
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from robocop_ng.helpers.data_loader import read_json
+
+# Number of bytes at the start of a log file which are hashed to recognise it
+fingerprint_size = 4096
+
+
+def get_upload_index_path(bot) -> str:
+    return os.path.join(bot.state_dir, "data/uploaded_logs.json")
+
+
+class UploadIndex:
+    """
+    Bounded index of analysed log uploads, which is used to recognise duplicate uploads.
+
+    Uploads are keyed by their author and a fingerprint of the file, so unrelated users uploading logs
+    with the same name don't collide. Entries are evicted once there are more than max_size entries
+    or they're older than ttl seconds. The index is saved to the state dir, so it survives restarts.
+    Changes are only written by flush(), so uploads don't each rewrite the file on the event loop.
+    """
+
+    def __init__(self, bot, max_size: int, ttl: float):
+        self.bot = bot
+        self.max_size = max_size
+        self.ttl = ttl
+        # Ordered by upload time, oldest first
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        uploads = read_json(bot, get_upload_index_path(bot)).get("uploads", {})
+        for key, entry in sorted(uploads.items(), key=lambda item: item[1]["time"]):
+            self._entries[key] = entry
+        # Set whenever the entries differ from the saved file
+        self.is_dirty = self.__evict()
+
+    @staticmethod
+    def get_key(author_id: int, size: int, partial_content: bytes) -> str:
+        """
+        Returns the key of an upload. partial_content should be the first fingerprint_size bytes of the file.
+        """
+        return f"{author_id}:{size}:{hashlib.sha256(partial_content).hexdigest()}"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __is_expired(self, entry: dict[str, Any]) -> bool:
+        return time.time() - entry["time"] > self.ttl
+
+    def __evict(self) -> bool:
+        evicted = False
+        while len(self._entries) > 0 and (
+            len(self._entries) > self.max_size
+            or self.__is_expired(next(iter(self._entries.values())))
+        ):
+            self._entries.popitem(last=False)
+            evicted = True
+        return evicted
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None and self.__is_expired(entry):
+            self.is_dirty = self.__evict() or self.is_dirty
+            return None
+        return entry
+
+    def put(self, key: str, filename: str, link: str):
+        self._entries.pop(key, None)
+        self._entries[key] = {"filename": filename, "link": link, "time": time.time()}
+        self.__evict()
+        self.is_dirty = True
+
+    def flush(self):
+        """
+        Saves the index if it changed since it was last saved.
+        """
+        if self.is_dirty:
+            self.save()
+
+    def save(self):
+        upload_index_path = get_upload_index_path(self.bot)
+        # Written to a temporary file first, so an interrupted write can't truncate the index
+        temp_path = f"{upload_index_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"uploads": self._entries}, f)
+        os.replace(temp_path, upload_index_path)
+        self.is_dirty = False
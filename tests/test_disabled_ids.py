@@ -0,0 +1,87 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from robocop_ng.helpers.disabled_ids import (
+    Blocklist,
+    add_disabled_app_id,
+    add_disabled_build_id,
+    add_disabled_ro_section,
+    get_blocklist,
+    is_app_id_disabled,
+    is_build_id_disabled,
+    is_ro_section_disabled,
+    remove_disable_id,
+    remove_disabled_ro_section,
+)
+
+build_id = "0123456789ABCDEF0123456789ABCDEF"
+ro_section = {"module": "Game.nss", "sdk_libraries": ["nnSdk-17_3_0-Release"]}
+
+
+@pytest.fixture
+def bot(tmp_path):
+    os.makedirs(tmp_path / "data")
+    return SimpleNamespace(state_dir=str(tmp_path))
+
+
+def test_blocklist_ids():
+    blocklist = Blocklist(
+        {
+            "game": {
+                "app_id": "0100f2c0115b6000",
+                "build_id": build_id.lower().ljust(64, "0"),
+                "ro_section": {},
+            }
+        }
+    )
+    assert blocklist.is_app_id_disabled("0100F2C0115B6000")
+    assert not blocklist.is_app_id_disabled("0100F2C0115B6001")
+    assert not blocklist.is_app_id_disabled(None)
+    # Build ids are compared padded to 64 characters
+    assert blocklist.is_build_id_disabled(build_id)
+    assert blocklist.is_build_id_disabled(build_id.ljust(64, "0"))
+    assert not blocklist.is_build_id_disabled(build_id[:-1] + "0")
+    assert not blocklist.is_build_id_disabled(None)
+
+
+def test_blocklist_ro_section_module():
+    blocklist = Blocklist(
+        {"game": {"app_id": "", "build_id": "", "ro_section": ro_section}}
+    )
+    assert blocklist.is_ro_section_disabled(
+        {"module": "GAME.NSS", "sdk_libraries": ro_section["sdk_libraries"]}
+    )
+    # Only the module name has to match
+    assert blocklist.is_ro_section_disabled(
+        {"module": "game.nss", "sdk_libraries": ["nnSdk-18_0_0-Release"]}
+    )
+    assert not blocklist.is_ro_section_disabled(
+        {"module": "other.nss", "sdk_libraries": ro_section["sdk_libraries"]}
+    )
+    assert not blocklist.is_ro_section_disabled({"sdk_libraries": []})
+
+
+def test_blocklist_is_rebuilt_after_changes(bot):
+    blocklist = get_blocklist(bot)
+    assert get_blocklist(bot) is blocklist
+    assert not is_app_id_disabled(bot, "0100F2C0115B6000")
+
+    assert add_disabled_app_id(bot, "Game", "0100F2C0115B6000")
+    assert get_blocklist(bot) is not blocklist
+    assert is_app_id_disabled(bot, "0100f2c0115b6000")
+    assert not add_disabled_app_id(bot, "other", "0100F2C0115B6000")
+
+    assert add_disabled_build_id(bot, "game", build_id)
+    assert is_build_id_disabled(bot, build_id)
+    assert add_disabled_ro_section(bot, "game", ro_section)
+    assert is_ro_section_disabled(bot, {"module": "game.NSS", "sdk_libraries": []})
+
+    assert remove_disabled_ro_section(bot, "game")
+    assert not is_ro_section_disabled(bot, ro_section)
+    assert is_app_id_disabled(bot, "0100F2C0115B6000")
+
+    assert remove_disable_id(bot, "game")
+    assert not is_app_id_disabled(bot, "0100F2C0115B6000")
+    assert not is_build_id_disabled(bot, build_id)
@@ -0,0 +1,99 @@
+import os
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from robocop_ng.helpers.disabled_paths import (
+    add_disabled_path,
+    find_disabled_filepath,
+    get_disabled_path_matcher,
+    remove_disabled_path,
+)
+from robocop_ng.helpers.fragment_matcher import FragmentMatcher
+from robocop_ng.helpers.log_analysis_service import scan_log_file
+
+
+def is_path_disabled(disabled_paths: list[str], path: str) -> bool:
+    """
+    The per-path check which was used before the matcher.
+    """
+    for disabled_path in disabled_paths:
+        if disabled_path in path.strip().lower():
+            return True
+    return False
+
+
+@pytest.fixture
+def bot(tmp_path):
+    os.makedirs(tmp_path / "data")
+    return SimpleNamespace(state_dir=str(tmp_path))
+
+
+def test_search_parity_with_per_path_check():
+    rng = random.Random(1)
+    for _ in range(3000):
+        fragments = [
+            "".join(rng.choice("ab/\\") for _ in range(rng.randint(1, 5)))
+            for _ in range(rng.randint(0, 6))
+        ]
+        path = "".join(rng.choice("abAB/\\ ") for _ in range(rng.randint(0, 30)))
+        matcher = FragmentMatcher(fragments)
+        found = matcher.search(path.strip().lower())
+        assert (found is not None) == is_path_disabled(fragments, path)
+        if found is not None:
+            assert found in path.strip().lower()
+
+
+def test_search_returns_earliest_end():
+    matcher = FragmentMatcher(["/roms/switch/", "/roms/", "witch"])
+    assert matcher.search("c:/roms/switch/game.nsp") == "/roms/"
+    assert matcher.search("c:/games/switch/") == "witch"
+    assert matcher.search("c:/games/") is None
+
+
+def test_empty_fragment_matches_everything():
+    assert FragmentMatcher([""]).search("") == ""
+    assert FragmentMatcher([]).search("c:/games/") is None
+
+
+def test_find_disabled_filepath_in_log(bot):
+    paths = [f"C:/Users/user/Games/Game{index}/game.nsp" for index in range(2000)]
+    log_text = "\n".join(
+        f"00:00:00.{index % 1000:03} |I| Loader LoadNca: Loading {path}"
+        for index, path in enumerate([*paths, "D:/Pirate/Games/game.xci"])
+    )
+    assert find_disabled_filepath(get_disabled_path_matcher(bot), log_text) is None
+    assert add_disabled_path(bot, " /pirate/ ")
+    assert (
+        find_disabled_filepath(get_disabled_path_matcher(bot), log_text)
+        == "D:/Pirate/Games/game.xci"
+    )
+    assert remove_disabled_path(bot, "/pirate/")
+    assert find_disabled_filepath(get_disabled_path_matcher(bot), log_text) is None
+
+
+def test_find_disabled_filepath_ignores_other_text():
+    matcher = FragmentMatcher(["pirate"])
+    log_text = (
+        "00:00:00.000 |I| Application Print: Pirate mode enabled\n"
+        "00:00:00.001 |I| Loader LoadNca: Loading C:/Games/game.nsp\n"
+    )
+    assert find_disabled_filepath(matcher, log_text) is None
+    assert (
+        find_disabled_filepath(matcher, log_text + "Opened D:/Pirate/game.xci\n")
+        == "D:/Pirate/game.xci"
+    )
+
+
+def test_find_disabled_filepath_in_long_path():
+    matcher = FragmentMatcher(["/pirate/"])
+    path = "C:" + "/padding" * 1000 + "/pirate/game.nsp"
+    assert find_disabled_filepath(matcher, f"Loading {path}\n") == path
+
+
+def test_scan_log_file_blocked_path():
+    log_text = "00:00:00.000 |I| Loader LoadNca: Loading D:/Pirate/Games/game.xci\n"
+    assert scan_log_file(log_text)["blocked_path"] is None
+    result = scan_log_file(log_text, FragmentMatcher(["/pirate/"]))
+    assert result["blocked_path"] == "D:/Pirate/Games/game.xci"
@@ -0,0 +1,58 @@
+import asyncio
+import multiprocessing
+import time
+
+import pytest
+
+from robocop_ng.helpers.log_analysis_service import LogAnalysisService
+
+
+def sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def get_child_pids() -> set[int]:
+    return {process.pid for process in multiprocessing.active_children()}
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="The process pool requires fork",
+)
+def test_timed_out_workers_are_terminated():
+    async def run():
+        service = LogAnalysisService(1, 0.5)
+        try:
+            assert await service.run(sleep, 0) == 0
+            worker_pids = get_child_pids()
+            assert len(worker_pids) == 1
+            with pytest.raises(asyncio.TimeoutError):
+                await service.run(sleep, 30)
+            await asyncio.sleep(0.2)
+            assert len(worker_pids & get_child_pids()) == 0
+            # The pool is replaced, so later jobs still run
+            assert await service.run(sleep, 0) == 0
+        finally:
+            service.shutdown()
+
+    asyncio.run(run())
+
+
+def test_thread_pool_fallback(monkeypatch):
+    monkeypatch.setattr(multiprocessing, "get_all_start_methods", lambda: ["spawn"])
+
+    async def run():
+        service = LogAnalysisService(2, 0.5)
+        try:
+            results = await asyncio.gather(
+                service.run(sleep, 2), service.run(sleep, 0), return_exceptions=True
+            )
+            assert isinstance(results[0], asyncio.TimeoutError)
+            assert results[1] == 0
+            # The timed out job still takes up one thread, the other one is free
+            assert await service.run(sleep, 0) == 0
+        finally:
+            service.shutdown()
+
+    asyncio.run(run())
@@ -0,0 +1,46 @@
+import os
+
+from robocop_ng.helpers.log_batch import BatchResultsCache, analyse_file
+from robocop_ng.helpers.ryujinx_log_analyser import LogAnalyser
+
+log_text = "00:00:00.000 |N| Application Print: Ryujinx Version: 1.2.3\n"
+
+
+def write_log(tmp_path, name: str = "Ryujinx.log") -> str:
+    log_file = tmp_path / name
+    log_file.write_text(log_text)
+    return str(log_file)
+
+
+def test_analyse_file_records_errors(tmp_path, monkeypatch):
+    def analyse(self):
+        raise IndexError("list index out of range")
+
+    monkeypatch.setattr(LogAnalyser, "analyse", analyse)
+    for use_mmap in (False, True):
+        result = analyse_file((write_log(tmp_path), None, use_mmap))
+        assert result["error"] == "IndexError: list index out of range"
+        assert "result" not in result
+
+
+def test_results_cache_round_trip(tmp_path):
+    log_file = write_log(tmp_path)
+    cache_path = str(tmp_path / "cache.json")
+    cache = BatchResultsCache(cache_path)
+    cache.put(log_file, "hash", {"size": 1})
+    cache.save()
+
+    assert sorted(os.listdir(tmp_path)) == ["Ryujinx.log", "cache.json"]
+    loaded_cache = BatchResultsCache(cache_path)
+    assert loaded_cache.get(log_file)["hash"] == "hash"
+    assert loaded_cache.is_unchanged(log_file)
+
+
+def test_results_cache_corrupt(tmp_path):
+    cache_path = tmp_path / "cache.json"
+    cache_path.write_text('{"/logs/Ryujinx.log": {"mtime_ns": 1')
+    cache = BatchResultsCache(str(cache_path))
+    assert cache.get("/logs/Ryujinx.log") is None
+
+    cache_path.write_text("[]")
+    assert BatchResultsCache(str(cache_path)).get("/logs/Ryujinx.log") is None
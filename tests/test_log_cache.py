@@ -0,0 +1,129 @@
+import asyncio
+import importlib
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from robocop_ng import config_template
+from robocop_ng.helpers import log_cache
+from robocop_ng.helpers.log_cache import AnalysedLogCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class Context:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content: str):
+        self.sent.append(content)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(log_cache.time, "monotonic", clock.monotonic)
+    return clock
+
+
+def test_hash_content():
+    assert AnalysedLogCache.hash_content(b"log") == AnalysedLogCache.hash_content(
+        b"log"
+    )
+    assert AnalysedLogCache.hash_content(b"log") != AnalysedLogCache.hash_content(
+        b"log\n"
+    )
+
+
+def test_lru_eviction(clock):
+    cache = AnalysedLogCache(2, 60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_expiry(clock):
+    cache = AnalysedLogCache(10, 60)
+    cache.put("a", 1)
+    clock.now += 60
+    assert cache.get("a") == 1
+    clock.now += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    # Putting an entry again resets its age
+    cache.put("a", 2)
+    clock.now += 30
+    assert cache.get("a") == 2
+
+
+def test_hit_and_miss_counters(clock):
+    cache = AnalysedLogCache(10, 60)
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("a") == 1
+    clock.now += 61
+    assert cache.get("a") is None
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_clear(clock):
+    cache = AnalysedLogCache(10, 60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get("a") is None
+
+
+@pytest.fixture
+def log_file_reader(tmp_path, monkeypatch):
+    # The cogs read the deployment's config module, which is created from the config template
+    monkeypatch.setitem(sys.modules, "config", config_template)
+    logfilereader = importlib.import_module("robocop_ng.cogs.logfilereader")
+    os.makedirs(tmp_path / "data")
+    config = SimpleNamespace(**vars(config_template))
+    # The template leaves the log channels to the deployment
+    config.bot_log_allowed_channels = {"pr-testing": 0}
+    bot = SimpleNamespace(config=config, state_dir=str(tmp_path))
+    return logfilereader.LogFileReader, bot
+
+
+@pytest.mark.parametrize(
+    "command, args, kwargs",
+    [
+        ("disable_path", ["/pirate/"], {}),
+        ("enable_path", ["/pirate/"], {}),
+        ("disable_log_id", ["game", "app_id"], {"block_id": "0100F2C0115B6000"}),
+        ("enable_log_id", ["game"], {}),
+    ],
+)
+def test_blocklist_changes_clear_cache(log_file_reader, command, args, kwargs):
+    log_file_reader_cls, bot = log_file_reader
+
+    async def run():
+        cog = log_file_reader_cls(bot)
+        try:
+            cog.log_cache.put(("hash", None), {"blocked_game": False})
+            await getattr(log_file_reader_cls, command).callback(
+                cog, Context(), *args, **kwargs
+            )
+            assert len(cog.log_cache) == 0
+        finally:
+            cog.cog_unload()
+
+    asyncio.run(run())
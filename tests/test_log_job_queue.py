@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from robocop_ng.helpers.log_job_queue import LogJobQueue, QueueFullError
+
+
+def test_round_robin_across_channels():
+    async def run():
+        queue = LogJobQueue(max_concurrent=1, max_size=10)
+        started = []
+
+        def make_job(name: str):
+            async def job():
+                started.append(name)
+                await asyncio.sleep(0)
+                return name
+
+            return job
+
+        jobs = {}
+        for name in ["a1", "a2", "a3", "a4", "a5", "b1", "b2", "c1"]:
+            jobs[name] = queue.submit(name, ord(name[0]), make_job(name))
+
+        expected_order = ["a1", "a2", "b1", "c1", "a3", "b2", "a4", "a5"]
+        # The positions predict the order in which the waiting jobs are started
+        assert [queue.get_position(jobs[name]) for name in expected_order] == list(
+            range(len(expected_order))
+        )
+        assert await asyncio.gather(*jobs.values()) == list(jobs.keys())
+        assert started == expected_order
+        assert queue.stats().completed == len(expected_order)
+
+    asyncio.run(run())
+
+
+def test_concurrency_limit():
+    async def run():
+        queue = LogJobQueue(max_concurrent=2, max_size=10)
+        running = 0
+        max_running = 0
+
+        async def job():
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await asyncio.gather(
+            *(queue.submit(index, index % 3, job) for index in range(10))
+        )
+        assert max_running == 2
+
+    asyncio.run(run())
+
+
+def test_deduplication_and_full_queue():
+    async def run():
+        queue = LogJobQueue(max_concurrent=1, max_size=1)
+        release = asyncio.Event()
+        calls = 0
+
+        async def job():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return calls
+
+        first_job = queue.submit("first", 1, job)
+        waiting_job = queue.submit("waiting", 1, job)
+        assert queue.submit("first", 2, job) is first_job
+        assert waiting_job.position == 1
+        with pytest.raises(QueueFullError):
+            queue.submit("rejected", 2, job)
+
+        release.set()
+        assert await first_job == 1
+        assert await waiting_job == 2
+        stats = queue.stats()
+        assert (stats.submitted, stats.deduplicated, stats.rejected) == (2, 1, 1)
+
+    asyncio.run(run())
+
+
+def test_failed_jobs():
+    async def run():
+        queue = LogJobQueue(max_concurrent=1, max_size=10)
+
+        async def job():
+            raise ValueError("invalid log")
+
+        with pytest.raises(ValueError):
+            await queue.submit("failing", 1, job)
+        assert queue.stats().failed == 1
+
+    asyncio.run(run())
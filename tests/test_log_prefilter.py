@@ -0,0 +1,49 @@
+from robocop_ng.helpers.log_prefilter import (
+    PrefilterStats,
+    has_log_markers,
+    log_prefilter_size,
+)
+
+log_head = b"00:00:00.000 |N| Application Print: Ryujinx Version: 1.2.3\n"
+
+
+def test_log_with_markers():
+    assert has_log_markers(log_head)
+    assert has_log_markers(b"Ryujinx Version: 1.2.3\n")
+    assert has_log_markers(b"Header\r\nApplication Loaded: Game\n")
+    # Timestamps only count at the start of a line
+    assert has_log_markers(b"Some header\n00:00:01.234 |I| Gpu Init: Starting\n")
+    assert not has_log_markers(b"Some header 00:00:01.234 |I| Gpu Init: Starting\n")
+
+
+def test_file_without_markers():
+    assert not has_log_markers(b"")
+    assert not has_log_markers(b"Just a long message\n" * 200)
+    assert not has_log_markers(b"12:34 |I| not a timestamp\n")
+
+
+def test_marker_past_head():
+    padding = b"x" * (log_prefilter_size - 10) + b"\n"
+    content = padding + log_head
+    assert has_log_markers(content)
+    # Only the head is checked, like the prefilter does with the first range of a download
+    assert not has_log_markers(content[:log_prefilter_size])
+    # A marker which ends exactly at the end of the head is still found
+    marker = b"Ryujinx Version:"
+    content = b"x" * (log_prefilter_size - len(marker)) + marker
+    assert has_log_markers(content[:log_prefilter_size])
+
+
+def test_prefilter_stats():
+    stats = PrefilterStats()
+    stats.record_skip(10_000, log_prefilter_size)
+    # The head is all there is to download
+    stats.record_skip(1000, 1000)
+    stats.record_pass(log_prefilter_size, is_complete=False)
+    stats.record_pass(2000, is_complete=True)
+
+    assert stats.checked == 4
+    assert stats.passed == 2
+    assert stats.complete == 1
+    assert stats.saved_analyser_calls == 2
+    assert stats.saved_bytes == 10_000 - log_prefilter_size - log_prefilter_size
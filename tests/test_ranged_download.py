@@ -0,0 +1,99 @@
+import pytest
+
+from robocop_ng.helpers.ranged_download import (
+    ByteRange,
+    RangedFile,
+    format_range,
+    parse_content_range,
+    parse_multipart_byteranges,
+)
+
+log_data = b"".join(
+    b"00:00:%02d.000 |I| Application Print: Line %d\r\n" % (index, index)
+    for index in range(60)
+)
+
+
+def make_multipart_body(boundary: str, ranges: list[tuple[int, int]]) -> bytes:
+    parts = []
+    for start, end in ranges:
+        parts.append(
+            b"--%s\r\nContent-Type: text/plain\r\nContent-Range: bytes %d-%d/%d\r\n\r\n%s\r\n"
+            % (boundary.encode(), start, end - 1, len(log_data), log_data[start:end])
+        )
+    return b"".join(parts) + b"--%s--\r\n" % boundary.encode()
+
+
+def test_parse_content_range():
+    assert parse_content_range("bytes 0-99/1000") == (0, 100, 1000)
+    assert parse_content_range(" bytes 100-199/*") == (100, 200, None)
+    with pytest.raises(ValueError):
+        parse_content_range("bytes */1000")
+
+
+def test_parse_multipart_byteranges():
+    ranges = [(0, 100), (len(log_data) - 60, len(log_data))]
+    byte_ranges, total_size = parse_multipart_byteranges(
+        make_multipart_body("3d6b6a416f9b5", ranges), "3d6b6a416f9b5"
+    )
+    assert total_size == len(log_data)
+    assert [(byte_range.start, byte_range.end) for byte_range in byte_ranges] == ranges
+    for byte_range in byte_ranges:
+        assert byte_range.data == log_data[byte_range.start : byte_range.end]
+
+
+def test_parse_multipart_byteranges_delimiter_in_data():
+    # The data of a part contains the delimiter, but its length is known from the Content-Range
+    data = b"--boundary\r\n" * 4
+    body = (
+        b"--boundary\r\nContent-Range: bytes 0-%d/%d\r\n\r\n%s\r\n--boundary--\r\n"
+        % (len(data) - 1, len(data), data)
+    )
+    byte_ranges, total_size = parse_multipart_byteranges(body, "boundary")
+    assert [byte_range.data for byte_range in byte_ranges] == [data]
+    assert total_size == len(data)
+
+
+def test_parse_multipart_byteranges_missing_content_range():
+    body = b"--boundary\r\nContent-Type: text/plain\r\n\r\ndata\r\n--boundary--\r\n"
+    with pytest.raises(ValueError):
+        parse_multipart_byteranges(body, "boundary")
+
+
+def test_from_response():
+    headers = {"Content-Type": 'multipart/byteranges; boundary="abc"'}
+    body = make_multipart_body("abc", [(0, 10), (20, 30)])
+    ranged_file = RangedFile.from_response(206, headers, body)
+    assert ranged_file.gaps() == [(10, 20), (30, len(log_data))]
+
+    ranged_file = RangedFile.from_response(
+        206, {"Content-Range": f"bytes 10-19/{len(log_data)}"}, log_data[10:20]
+    )
+    assert ranged_file.gaps() == [(0, 10), (20, len(log_data))]
+
+    ranged_file = RangedFile.from_response(200, {}, log_data)
+    assert ranged_file.is_complete()
+    assert ranged_file.to_bytes() == log_data
+
+
+def test_ranged_file_merges_ranges():
+    ranged_file = RangedFile(len(log_data))
+    ranged_file.add_all([ByteRange(50, log_data[50:100]), ByteRange(0, log_data[:60])])
+    ranged_file.add(ByteRange(100, log_data[100:]))
+    assert len(ranged_file.ranges) == 1
+    assert ranged_file.is_complete()
+    assert ranged_file.to_bytes() == log_data
+
+
+def test_to_bytes_skips_cut_lines():
+    ranged_file = RangedFile(len(log_data))
+    ranged_file.add_all([ByteRange(0, log_data[:100]), ByteRange(200, log_data[200:])])
+    lines = ranged_file.to_bytes().split(b"\r\n")
+    # Every line which is left is complete
+    assert all(line in log_data.split(b"\r\n") for line in lines)
+    assert lines[-2] == b"00:00:59.000 |I| Application Print: Line 59"
+
+
+def test_format_range():
+    assert format_range(0, 100) == "0-99"
+    assert format_range(100, None) == "100-"
@@ -0,0 +1,39 @@
+import pytest
+
+from robocop_ng.helpers.regex_registry import RegexRegistry
+
+
+@pytest.mark.parametrize("stats_enabled", [True, False])
+def test_keyword_arguments(stats_enabled):
+    registry = RegexRegistry()
+    registry.set_stats_enabled(stats_enabled)
+    pattern = registry.compile("digits", r"\d+")
+
+    assert pattern.sub("#", "1 2 3", count=1) == "# 2 3"
+    assert pattern.search("12 34", pos=2).group(0) == "34"
+    assert pattern.match("12 34", pos=3, endpos=4).group(0) == "3"
+    assert pattern.fullmatch("12", pos=0).group(0) == "12"
+    assert pattern.findall("1 2 3", endpos=3) == ["1", "2"]
+    assert [match.group(0) for match in pattern.finditer("1 2 3", pos=1)] == ["2", "3"]
+    assert registry.stats()[0].calls == (6 if stats_enabled else 0)
+
+
+def test_stats_disabled_by_default():
+    registry = RegexRegistry()
+    pattern = registry.compile("digits", r"\d+")
+    pattern.search("a1")
+    assert registry.stats()[0].calls == 0
+
+
+def test_collect_and_merge():
+    registry = RegexRegistry()
+    registry.set_stats_enabled(True)
+    pattern = registry.compile("digits", r"\d+")
+    pattern.search("a1")
+    list(pattern.finditer("1 2"))
+    counters = registry.collect()
+    assert counters["digits"][0] == 2
+    assert registry.collect() == {}
+
+    registry.merge(counters)
+    assert registry["digits"].calls == 2
@@ -0,0 +1,80 @@
+import json
+import os
+
+import pytest
+
+from benchmarks.log_generator import LogParameters, generate_log
+from robocop_ng.helpers.ryujinx_log_analyser import LogAnalyser
+
+# The notes the analyser produced for these logs before notes were evaluated from a note plan.
+# They're stored sorted, the old analyser kept notes in a set, so the order of notes with
+# the same severity and first word depended on the hash seed.
+baseline_notes_path = os.path.join(
+    os.path.dirname(__file__), "data/baseline_notes.json"
+)
+
+base_log = generate_log(LogParameters(size=30_000, seed=0, settings_churn=0.05))
+log_variants = {
+    "macos": [
+        ("Windows 10.0.22631 (X64)", "macOS 14.0 (Arm64)"),
+        ("AMD Ryzen 7 5800X3D 8-Core Processor", "Apple M1"),
+    ],
+    "rosetta": [("AMD Ryzen 7 5800X3D 8-Core Processor", "VirtualApple @ 2.50GHz")],
+    "linux_opengl": [
+        ("Windows 10.0.22631 (X64)", "Linux 6.5.0 (X64)"),
+        ("GraphicsBackend set to: Vulkan", "GraphicsBackend set to: OpenGl"),
+        ("NVIDIA GeForce RTX 3070", "Intel(R) UHD Graphics 620"),
+    ],
+    "custom_build": [("Ryujinx Version: 1.1.1376", "Ryujinx Version: 1.1.1376-custom")],
+    "low_memory": [
+        ("Total 31.91 GiB ; Available 20.11 GiB", "Total 7.91 GiB ; Available 1.11 GiB")
+    ],
+    "no_firmware": [("Firmware Version: 17.0.0", "Firmware Version: Unknown")],
+    "no_log_levels": [
+        ("Logs Enabled: Info, Warning, Error, Guest, Stub", "Logs Enabled: Info")
+    ],
+}
+
+
+def get_note_logs() -> dict[str, str]:
+    logs = {}
+    for seed in range(6):
+        logs[f"seed_{seed}"] = generate_log(
+            LogParameters(
+                size=30_000,
+                seed=seed,
+                error_density=0.01 * seed,
+                mods=seed % 3,
+                cheats=seed % 2,
+                settings_churn=0.05,
+            )
+        )
+    for name, replacements in log_variants.items():
+        log_text = base_log
+        for old, new in replacements:
+            assert old in log_text
+            log_text = log_text.replace(old, new)
+        logs[name] = log_text
+    return logs
+
+
+note_logs = get_note_logs()
+
+
+@pytest.fixture(scope="module")
+def baseline_notes() -> dict[str, list[str]]:
+    with open(baseline_notes_path, "r") as file:
+        return json.load(file)
+
+
+def get_sort_key(note: str) -> tuple[int, str]:
+    symbols = ["❌", "🔴", "⚠️", "ℹ", "✅"]
+    severity = next(i for i, symbol in enumerate(symbols) if symbol in note)
+    return severity, note.split()[1]
+
+
+@pytest.mark.parametrize("name", note_logs.keys())
+def test_notes_match_baseline(name, baseline_notes):
+    notes = LogAnalyser(note_logs[name]).analyse()["notes"]
+    assert sorted(notes) == baseline_notes[name]
+    assert notes == sorted(notes, key=get_sort_key)
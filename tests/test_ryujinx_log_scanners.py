@@ -0,0 +1,29 @@
+from robocop_ng.helpers.ryujinx_log_analyser import LogAnalyser
+from robocop_ng.helpers.ryujinx_log_scanners import max_filepaths, scan_filepaths
+
+padded_log = "\n".join(
+    [
+        "00:00:00.000 |N| Application Print: Ryujinx Version: 1.2.3",
+        *(
+            f"00:00:01.000 |I| Loader LoadNca: Loading C:/Games/Game{index}/game.nsp"
+            for index in range(max_filepaths + 10)
+        ),
+        "00:00:02.000 |I| Loader LoadNca: Loading D:/Pirate/game.xci",
+    ]
+)
+
+
+def test_scan_filepaths():
+    assert list(scan_filepaths('Opened "C:\\Games\\a.nsp" and /home/user/b.xci')) == [
+        "C:\\Games\\a.nsp",
+        "/home/user/b.xci",
+    ]
+    assert list(scan_filepaths("/a\n/b\n/c", 2)) == ["/a", "/b"]
+
+
+def test_filepaths_are_capped():
+    assert len(scan_filepaths(padded_log)) == max_filepaths
+    assert "D:/Pirate/game.xci" not in LogAnalyser(padded_log).analyse()["paths"]
+    analyser = LogAnalyser.incremental()
+    analyser.feed(padded_log)
+    assert len(analyser.get_log_filepaths()) == max_filepaths
@@ -0,0 +1,58 @@
+from robocop_ng.helpers.ryujinx_log_analyser import LogAnalyser
+from robocop_ng.helpers.ryujinx_log_timeline import LogTimeline, parse_timestamp
+from robocop_ng.helpers.ryujinx_log_tokenizer import parse_log_line
+
+# The timestamps go backwards after the error, like in logs of several runs pasted together
+non_monotonic_log = """\
+00:00:00.000 |N| Application Print: Ryujinx Version: 1.2.3
+00:00:10.000 |I| Gpu Init: Starting
+00:05:30.000 |E| Gpu Present: Device lost
+00:00:20.000 |I| Gpu Init: Starting
+00:01:00.000 |E| Gpu Present: Device lost
+"""
+
+
+def get_timeline(log_text: str) -> LogTimeline:
+    timeline = LogTimeline()
+    for line in log_text.splitlines():
+        timeline.add(parse_log_line(line))
+    return timeline
+
+
+def test_parse_timestamp():
+    assert parse_timestamp("00:00:00.000") == 0
+    assert parse_timestamp("01:02:03.456") == 3_723_456
+
+
+def test_errors_per_minute_non_monotonic():
+    timeline = get_timeline(non_monotonic_log)
+    assert timeline.elapsed() == parse_timestamp("00:01:00.000")
+    assert timeline.errors_per_minute().tolist() == [0, 1, 0, 0, 0, 1]
+
+
+def test_errors_per_minute_empty():
+    assert LogTimeline().errors_per_minute().tolist() == [0]
+
+
+def test_gaps_non_monotonic():
+    timeline = get_timeline(non_monotonic_log)
+    gaps = timeline.gaps(60_000)
+    assert [(gap.start, gap.duration) for gap in gaps] == [(10_000, 320_000)]
+
+
+def test_analyse_non_monotonic():
+    analysis = LogAnalyser(non_monotonic_log).analyse()
+    assert analysis["timeline"]["entries"] == 5
+    assert analysis["timeline"]["errors_per_minute"] == [0, 1, 0, 0, 0, 1]
+
+
+def test_more_sources_than_unsigned_short():
+    source_count = 70_000
+    log_text = "".join(
+        f"00:00:01.000 |I| Source{source} Method: Message\n"
+        for source in range(source_count)
+    )
+    timeline = get_timeline(log_text)
+    assert len(timeline) == source_count
+    assert timeline.sources[-1] == source_count - 1
+    assert timeline.get_source_ids("Source69999") == {source_count - 1}
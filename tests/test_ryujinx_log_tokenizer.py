@@ -0,0 +1,117 @@
+import mmap
+
+from robocop_ng.helpers.ryujinx_log_tokenizer import (
+    LogTokenizer,
+    parse_log_line,
+    tokenize_buffer,
+    tokenize_log,
+)
+
+log_text = """\
+Partial header of a log file
+00:00:00.000 |N| Application Print: Ryujinx Version: 1.2.3
+00:00:01.234 |I| HLE.GuiThread Loader LoadNca: Application Loaded: Game
+00:00:02.000 |E| GPU.MainThread Gpu Vulkan: Device lost
+    at Ryujinx.Graphics.Vulkan.Device.Present()
+
+   at Ryujinx.Graphics.Gpu.Window.Present()
+Inner exception: VkErrorDeviceLost
+00:00:03.000 |W| Gpu: Slow frame
+00:00:04.000 |I| No source or method here
+"""
+
+
+def test_optional_thread_source_and_method():
+    entry = parse_log_line("00:00:01.234 |I| HLE.GuiThread Loader LoadNca: Loaded")
+    assert (entry.timestamp, entry.level) == ("00:00:01.234", "I")
+    assert (entry.thread, entry.source, entry.method) == (
+        "HLE.GuiThread",
+        "Loader",
+        "LoadNca",
+    )
+    assert entry.message == "Loaded"
+
+    entry = parse_log_line("00:00:01.234 |N| Application Print: Ryujinx Version")
+    assert (entry.thread, entry.source, entry.method) == (None, "Application", "Print")
+
+    entry = parse_log_line("00:00:01.234 |W| Gpu: Slow frame")
+    assert (entry.thread, entry.source, entry.method) == (None, None, "Gpu")
+    assert entry.message == "Slow frame"
+
+    entry = parse_log_line("00:00:01.234 |I| No source or method here")
+    assert (entry.thread, entry.source, entry.method) == (None, None, None)
+    assert entry.message == "No source or method here"
+
+    assert parse_log_line("0:00:01.234 |I| Gpu: Slow frame") is None
+    assert parse_log_line("    at Ryujinx.Graphics.Vulkan.Device.Present()") is None
+
+
+def test_continuation_lines():
+    entries = list(tokenize_log(log_text))
+    # The header in front of the first entry is dropped
+    assert [entry.timestamp for entry in entries] == [
+        "00:00:00.000",
+        "00:00:01.234",
+        "00:00:02.000",
+        "00:00:03.000",
+        "00:00:04.000",
+    ]
+    error = entries[2]
+    assert error.is_error
+    # Empty lines aren't kept
+    assert error.continuation == [
+        "    at Ryujinx.Graphics.Vulkan.Device.Present()",
+        "   at Ryujinx.Graphics.Gpu.Window.Present()",
+        "Inner exception: VkErrorDeviceLost",
+    ]
+    # Only indented continuation lines are part of the error
+    assert error.error_lines() == [
+        "00:00:02.000 |E| GPU.MainThread Gpu Vulkan: Device lost",
+        "    at Ryujinx.Graphics.Vulkan.Device.Present()",
+        "   at Ryujinx.Graphics.Gpu.Window.Present()",
+    ]
+    assert all(len(entry.continuation) == 0 for entry in entries[3:])
+
+
+def test_max_line_length():
+    max_line_length = LogTokenizer.max_line_length
+    long_message = "x" * (2 * max_line_length)
+    tokenizer = LogTokenizer()
+    entries = tokenizer.feed(f"00:00:00.000 |I| Gpu: {long_message}\n  {long_message}")
+    entries += tokenizer.close()
+    assert len(entries) == 1
+    assert len(entries[0].line) == max_line_length
+    # The partial last line is cut off too, before the tokenizer is closed
+    assert len(entries[0].continuation[0]) == max_line_length
+
+    tokenizer = LogTokenizer()
+    for _ in range(4):
+        assert tokenizer.feed(long_message) == []
+    assert len(tokenizer._partial_line) == max_line_length
+
+
+def test_feed_across_chunk_boundaries():
+    expected_entries = list(tokenize_log(log_text))
+    crlf_log_text = log_text.replace("\n", "\r\n")
+    for chunk_size in range(1, 40):
+        tokenizer = LogTokenizer()
+        entries = []
+        for start in range(0, len(crlf_log_text), chunk_size):
+            entries += tokenizer.feed(crlf_log_text[start : start + chunk_size])
+        entries += tokenizer.close()
+        assert entries == expected_entries
+
+
+def test_mmap_parity(tmp_path):
+    long_line = "00:00:05.000 |I| Gpu: " + "y" * (LogTokenizer.max_line_length + 10)
+    text = (log_text + long_line + "\r\n00:00:06.000 |I| Gpu: Ünicode\n").replace(
+        "\n", "\r\n"
+    )
+    log_path = tmp_path / "Ryujinx.log"
+    log_path.write_bytes(text.encode("UTF-8"))
+
+    expected_entries = list(tokenize_log(text))
+    assert list(tokenize_buffer(text.encode("UTF-8"))) == expected_entries
+    with open(log_path, "rb") as log_file:
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            assert list(tokenize_buffer(buffer)) == expected_entries
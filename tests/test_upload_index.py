@@ -0,0 +1,107 @@
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from robocop_ng.helpers import upload_index
+from robocop_ng.helpers.upload_index import (
+    UploadIndex,
+    fingerprint_size,
+    get_upload_index_path,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def bot(tmp_path):
+    os.makedirs(tmp_path / "data")
+    return SimpleNamespace(state_dir=str(tmp_path))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(upload_index.time, "time", clock.time)
+    return clock
+
+
+def test_get_key():
+    content = b"00:00:00.000 |N| Application Print: Ryujinx Version: 1.2.3\n"
+    key = UploadIndex.get_key(1, 100, content[:fingerprint_size])
+    assert key == UploadIndex.get_key(1, 100, content[:fingerprint_size])
+    assert key.startswith("1:100:")
+    # Another author, size or content is another upload
+    assert key != UploadIndex.get_key(2, 100, content)
+    assert key != UploadIndex.get_key(1, 101, content)
+    assert key != UploadIndex.get_key(1, 100, content + b"\n")
+
+
+def test_ttl_expiry(bot, clock):
+    index = UploadIndex(bot, 10, 60)
+    index.put("a", "a.log", "link-a")
+    clock.now += 30
+    index.put("b", "b.log", "link-b")
+    assert index.get("a")["link"] == "link-a"
+
+    clock.now += 31
+    assert index.get("a") is None
+    assert index.get("b")["link"] == "link-b"
+    assert len(index) == 1
+
+
+def test_max_size_eviction(bot, clock):
+    index = UploadIndex(bot, 2, 60)
+    for key in ("a", "b", "c"):
+        index.put(key, f"{key}.log", f"link-{key}")
+        clock.now += 1
+    assert index.get("a") is None
+    assert len(index) == 2
+
+
+def test_writes_are_batched_until_flush(bot, clock):
+    index = UploadIndex(bot, 10, 60)
+    index.put("a", "a.log", "link-a")
+    index.put("b", "b.log", "link-b")
+    assert not os.path.exists(get_upload_index_path(bot))
+
+    index.flush()
+    with open(get_upload_index_path(bot), "r") as f:
+        assert list(json.load(f)["uploads"].keys()) == ["a", "b"]
+    assert not index.is_dirty
+
+
+def test_persistence_round_trip(bot, clock):
+    index = UploadIndex(bot, 10, 60)
+    index.put("b", "b.log", "link-b")
+    clock.now += 1
+    index.put("a", "a.log", "link-a")
+    index.flush()
+
+    loaded_index = UploadIndex(bot, 10, 60)
+    assert loaded_index.get("a") == index.get("a")
+    assert loaded_index.get("b") == index.get("b")
+    assert not loaded_index.is_dirty
+    # Entries are still evicted oldest first
+    loaded_index.put("c", "c.log", "link-c")
+    clock.now += 60
+    assert loaded_index.get("b") is None
+    assert loaded_index.get("a")["link"] == "link-a"
+
+
+def test_expired_entries_are_pruned_on_load(bot, clock):
+    index = UploadIndex(bot, 10, 60)
+    index.put("a", "a.log", "link-a")
+    index.flush()
+
+    clock.now += 61
+    loaded_index = UploadIndex(bot, 10, 60)
+    assert len(loaded_index) == 0
+    assert loaded_index.is_dirty